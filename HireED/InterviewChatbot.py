@@ -1,14 +1,13 @@
-from groq import Groq
 import pyttsx3
-import os
 from dotenv import load_dotenv
+from context_compaction import ContextCompactor
+from llm_gateway import gateway as client
 
 # Load environment variables
 load_dotenv()
-# Replace hardcoded API key with environment variable
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-# Initialize Groq client
-client = Groq(api_key=GROQ_API_KEY)
+
+# Keeps the prompt flat over a 15-question interview: recent turns verbatim, older ones summarised
+context_compactor = ContextCompactor()
 
 base_prompt = """
 Act as an interviewer for a {job_type} interview. Your job is to ask interview questions one by one related to the job type and evaluate the candidate's answers.
@@ -35,15 +34,17 @@ def text_to_speech(text):
     except Exception as e:
         print(f"Text-to-speech error: {e}")
 
-def interview_chatbot(job_type, conversation_history):
+def interview_chatbot(job_type, conversation_history, context_state=None):
+    """Next interviewer turn; context_state is the conversation's own compaction state, kept alongside its history"""
+    if context_state is None:
+        context_state = {}
     if not conversation_history:
         conversation_history.append({"role": "system", "content": base_prompt.format(job_type=job_type)})
     
     try:
         response = client.chat.completions.create(
-            # FIX: Updated the model to a supported version
-            model="llama-3.3-70b-versatile",
-            messages=conversation_history,
+            task='interview',
+            messages=context_compactor.compact(conversation_history, context_state),
             temperature=1,
             max_tokens=1024,
             top_p=1,
@@ -59,9 +60,10 @@ if __name__ == "__main__":
     print(f"\nPreparing for a {job_type} interview...\n")
     
     conversation_history = []
+    context_state = {}
 
     while True:
-        ai_response = interview_chatbot(job_type, conversation_history)
+        ai_response = interview_chatbot(job_type, conversation_history, context_state)
         print("Interviewer:", ai_response)
         text_to_speech(ai_response)
         
@@ -1,17 +1,10 @@
-from groq import Groq
 import pyttsx3
-import os
 from dotenv import load_dotenv
+from llm_gateway import gateway as client
 
 # Load environment variables
 load_dotenv()
 
-# Replace hardcoded API key with environment variable
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-# Initialize Groq client with your API key
-client = Groq(api_key=GROQ_API_KEY)
-
 # Interview Prompt Template
 base_prompt = """
 Act as an interviewer for a {job_type} interview. Your job is to ask interview questions one by one related to the job type and evaluate the candidate's answers.
@@ -57,7 +50,7 @@ def interview_chatbot(job_type, conversation_history):
     try:
         # Send the full conversation to Groq API
         response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
+            task='interview',
             messages=conversation_history,
             temperature=1,
             max_tokens=1024,
@@ -1,19 +1,19 @@
+import os
 import random
 import time
-from groq import Groq
-import os
 from dotenv import load_dotenv
 import json # Used for safer parsing
+from aptitude_generators import generate, supports
+from llm_gateway import gateway as client
+from question_bank import question_bank
 
 # Load environment variables
 load_dotenv()
 
-# Replace hardcoded API key with environment variable
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-# Initialize Groq client
-# Use os.getenv() to securely load the API key
-client = Groq(api_key=GROQ_API_KEY)
+# Seconds to wait on the LLM for a question before taking one from the local question bank
+LATENCY_BUDGET = float(os.getenv("APTITUDE_LATENCY_BUDGET", "8"))
+# Quantitative and logical questions come from aptitude_generators; set to 0 to ask the LLM for them too
+LOCAL_GENERATORS = os.getenv("APTITUDE_LOCAL_GENERATORS", "1") == "1"
 
 APTITUDE_CATEGORIES = {
     "quantitative": ["Percentage calculations", "Time and work problems", "Profit and loss", "Algebra", "Geometry"],
@@ -21,8 +21,19 @@ APTITUDE_CATEGORIES = {
     "verbal": ["Synonyms", "Antonyms", "Reading comprehension", "Sentence completion", "Error detection"]
 }
 
+def local_question(category: str):
+    """A templated question on a random subtopic of category, or None if it needs the LLM (verbal)"""
+    if not LOCAL_GENERATORS or not supports(category):
+        return None
+    return generate(category, random.choice(APTITUDE_CATEGORIES[category]))
+
+
 def generate_question(category: str) -> dict:
-    """Generate an aptitude question using Groq API"""
+    """Generate an aptitude question locally, or using Groq API for verbal ones"""
+    question_data = local_question(category)
+    if question_data is not None:
+        return question_data
+
     prompt = f"""
     Generate a challenging {category} aptitude question with:
     1. A clear question statement
@@ -35,9 +46,11 @@ def generate_question(category: str) -> dict:
     
     try:
         response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
+            task='aptitude_question',
             messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            deadline=LATENCY_BUDGET,
+            hedge=True
         )
         # Use json.loads() for safe parsing
         return json.loads(response.choices[0].message.content)
@@ -46,18 +59,11 @@ def generate_question(category: str) -> dict:
         # Print a clear error message including the exception type
         print(f"--- ERROR: Question Generation Failed for {category.upper()} ---")
         print(f"Details: {e}")
-        # Return a fallback question
-        return {
-            "question": f"Fallback {category} question: If 2x + 5 = 15, what is x?",
-            "options": {
-                "a": "2",
-                "b": "5",
-                "c": "10",
-                "d": "20"
-            },
-            "answer": "b",
-            "explanation": "This is a fallback. The correct answer is 5. (15 - 5) / 2 = 5"
-        }
+        # Serve a curated question with a real answer instead
+        question_data = question_bank.pick_one('aptitude', category)
+        if question_data is None:
+            raise RuntimeError(f"No {category} question available right now: {e}") from e
+        return question_data
 
 def aptitude_simulator():
     print("\n🧠 Aptitude Test Simulator for Interviews")
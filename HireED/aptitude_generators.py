@@ -0,0 +1,531 @@
+"""
+Quantitative and logical aptitude questions generated from templates instead of the LLM.
+
+    python aptitude_generators.py     # generate a batch per subtopic, check them and time it
+
+Every subtopic in aptitude.APTITUDE_CATEGORIES for these two categories has a
+generator that draws random parameters, computes the answer exactly (with
+Fractions), and builds three distractors from the mistakes students actually
+make (the wrong base for a percentage, averaging two rates, the additive
+reading of an analogy...). build_question() checks the options are four
+distinct values with the answer among them, so a question either comes out
+right or is drawn again. Verbal questions still come from the LLM.
+"""
+import math
+import random
+import time
+from fractions import Fraction
+
+OPTION_KEYS = ('a', 'b', 'c', 'd')
+MAX_ATTEMPTS = 20
+
+
+class Redraw(Exception):
+    """The drawn parameters don't give a clean question; draw again"""
+
+
+def number(value):
+    """12, 7.5, 33.33 or 2/3: the shortest exact-looking form of a Fraction or int"""
+    value = Fraction(value)
+    if value.denominator == 1:
+        return str(value.numerator)
+    if 100 % value.denominator == 0 or 1000 % value.denominator == 0:
+        return f"{float(value):.3f}".rstrip('0').rstrip('.')
+    return f"{value.numerator}/{value.denominator}"
+
+
+def build_question(question, answer, distractors, explanation, topic, rng):
+    """Shuffle the answer in among the first three distinct distractors; Redraw if there aren't three"""
+    options = [answer]
+    for distractor in distractors:
+        if distractor not in options:
+            options.append(distractor)
+        if len(options) == 4:
+            break
+    if len(options) < 4:
+        raise Redraw()
+    rng.shuffle(options)
+    return {
+        'question': question,
+        'options': dict(zip(OPTION_KEYS, options)),
+        'answer': OPTION_KEYS[options.index(answer)],
+        'explanation': explanation,
+        'topic': topic
+    }
+
+
+def numeric_distractors(answer, mistakes, rng, unit=lambda text: text):
+    """Formatted wrong answers: the given mistakes first, then near misses, never <= 0 or equal to the answer"""
+    candidates = [value for value in mistakes if value > 0 and value != answer]
+    step = max(1, round(answer / 10)) if answer >= 10 else Fraction(1, 2) if answer.denominator == 2 else 1
+    near = [answer + step, answer - step, answer + 2 * step, answer * 2, answer - 2 * step]
+    rng.shuffle(near)
+    candidates += [value for value in near if value > 0 and value != answer]
+    return [unit(number(value)) for value in candidates]
+
+
+# ---------------- Quantitative ----------------
+def rupees(text):
+    return f"Rs. {text}"
+
+
+def percentage_question(rng):
+    kind = rng.choice(['of', 'reverse', 'successive'])
+    if kind == 'of':
+        percent = rng.choice([5, 8, 12, 15, 16, 24, 35, 45, 60, 75])
+        whole = rng.randrange(4, 60) * 25
+        answer = Fraction(whole * percent, 100)
+        if answer.denominator != 1:
+            raise Redraw()
+        return build_question(
+            f"What is {percent}% of {whole}?",
+            number(answer),
+            numeric_distractors(answer, [Fraction(whole * (percent + 5), 100), Fraction(whole * percent, 10),
+                                         Fraction(whole * (100 - percent), 100)], rng),
+            f"{percent}% of {whole} = {whole} x {percent} / 100 = {number(answer)}.",
+            "Percentage calculations", rng)
+    if kind == 'reverse':
+        percent = rng.choice([10, 20, 25, 30, 40, 50])
+        original = rng.randrange(2, 40) * 20
+        increased = Fraction(original * (100 + percent), 100)
+        # The classic slip: taking percent% off the new value instead of dividing by 1 + percent%
+        return build_question(
+            f"After a {percent}% increase, a number becomes {number(increased)}. What was the original number?",
+            number(original),
+            numeric_distractors(Fraction(original), [increased * (100 - percent) / 100, increased - percent,
+                                                     Fraction(original * (100 - percent), 100)], rng),
+            f"The original x satisfies x x {100 + percent}/100 = {number(increased)}, "
+            f"so x = {number(increased)} x 100/{100 + percent} = {original}.",
+            "Percentage calculations", rng)
+    up, down = rng.choice([10, 20, 25, 30, 40, 50]), rng.choice([10, 20, 25, 30, 40, 50])
+    net = Fraction(up - down) - Fraction(up * down, 100)
+    if net == 0:
+        raise Redraw()
+
+    def change(value):
+        return f"{number(abs(value))}% {'increase' if value > 0 else 'decrease'}"
+    mistakes = [Fraction(up - down), net + Fraction(up * down, 50), -net, net + 5, net - 5]
+    return build_question(
+        f"A price is raised by {up}% and the new price is then cut by {down}%. What is the overall change in the price?",
+        change(net),
+        [change(value) for value in mistakes if value != 0 and value != net],
+        f"Overall factor = {number(Fraction(100 + up, 100))} x {number(Fraction(100 - down, 100))} = "
+        f"{number(1 + net / 100)}, i.e. a {change(net)}. (Net change = {up} - {down} - {up} x {down}/100.)",
+        "Percentage calculations", rng)
+
+
+# Pairs of days whose combined time comes out as a whole number or a short decimal
+WORK_PAIRS = [(a, b) for a in range(4, 31) for b in range(a + 1, 61)
+              if Fraction(a * b, a + b).denominator in (1, 2, 4, 5)]
+
+
+def time_and_work_question(rng):
+    a, b = rng.choice(WORK_PAIRS)
+    together = Fraction(a * b, a + b)
+
+    def days(text):
+        return f"{text} days"
+    if rng.random() < 0.5:
+        return build_question(
+            f"A can finish a piece of work in {a} days and B can finish it in {b} days. "
+            f"How many days will they take working together?",
+            days(number(together)),
+            numeric_distractors(together, [Fraction(a + b, 2), Fraction(b - a), together + 1], rng, days),
+            f"Together they do 1/{a} + 1/{b} = {number(Fraction(1, a) + Fraction(1, b))} of the work per day, "
+            f"so they need {number(together)} days.",
+            "Time and work problems", rng)
+    return build_question(
+        f"A and B together can finish a piece of work in {number(together)} days. A alone can finish it in {a} days. "
+        f"How many days will B take alone?",
+        days(number(b)),
+        numeric_distractors(Fraction(b), [Fraction(a) - together, Fraction(a) + together, 2 * together], rng, days),
+        f"B's share per day is 1/{number(together)} - 1/{a} = {number(Fraction(1, b))}, so B needs {b} days.",
+        "Time and work problems", rng)
+
+
+def profit_and_loss_question(rng):
+    cost = rng.randrange(4, 80) * 25
+    percent = rng.choice([5, 10, 12, 15, 20, 25, 30, 40])
+    gain = rng.random() < 0.65
+    word = 'profit' if gain else 'loss'
+    price = Fraction(cost * (100 + percent if gain else 100 - percent), 100)
+    if price.denominator != 1:
+        raise Redraw()
+    if rng.random() < 0.5:
+        # Another common mistake: working the percentage out on the selling price
+        on_price = Fraction(abs(price - cost) * 100, price)
+        return build_question(
+            f"An article bought for Rs. {cost} is sold for Rs. {number(price)}. What is the {word} percentage?",
+            f"{percent}%",
+            [f"{number(value)}%" for value in (on_price, Fraction(percent + 5), Fraction(percent * 2), Fraction(abs(percent - 5)))
+             if value > 0 and value.denominator in (1, 2, 4, 5)],
+            f"{word.capitalize()} = {number(abs(price - cost))}, and {number(abs(price - cost))}/{cost} x 100 = {percent}%.",
+            "Profit and loss", rng)
+    mistakes = [Fraction(cost * (100 - percent if gain else 100 + percent), 100), cost + Fraction(percent),
+                price * (100 + (percent if gain else -percent)) / 100]
+    return build_question(
+        f"An article costs Rs. {cost}. At what price must it be sold to make a {word} of {percent}%?",
+        rupees(number(price)),
+        numeric_distractors(price, mistakes, rng, rupees),
+        f"Selling price = {cost} x {100 + percent if gain else 100 - percent}/100 = Rs. {number(price)}.",
+        "Profit and loss", rng)
+
+
+def algebra_question(rng):
+    if rng.random() < 0.5:
+        x = rng.randrange(-12, 16)
+        a, c = rng.sample(range(2, 10), 2)
+        b = rng.randrange(-20, 21)
+        d = (a - c) * x + b
+
+        def side(coefficient, constant):
+            return f"{coefficient}x {'+' if constant >= 0 else '-'} {abs(constant)}"
+        mistakes = [Fraction(d + b, a - c), Fraction(d - b, a + c), Fraction(-x), Fraction(x + 1)]
+        wrong = [number(value) for value in mistakes if value != x] + [number(x - 2), number(x + 3)]
+        return build_question(
+            f"Solve for x: {side(a, b)} = {side(c, d)}",
+            number(x), wrong,
+            f"Collect the x terms on one side: ({a} - {c})x = {d} - ({b}), so {a - c}x = {d - b} and x = {x}.",
+            "Algebra", rng)
+    larger = rng.randrange(10, 90)
+    smaller = rng.randrange(2, larger)
+    total, difference = larger + smaller, larger - smaller
+    return build_question(
+        f"The sum of two numbers is {total} and their difference is {difference}. What is the larger number?",
+        str(larger),
+        [str(smaller), str(total - smaller // 2), str(larger + 1), str((total + difference + 2) // 2 + 1)],
+        f"Larger = (sum + difference) / 2 = ({total} + {difference}) / 2 = {larger}.",
+        "Algebra", rng)
+
+
+def geometry_question(rng):
+    kind = rng.choice(['circle', 'triangle', 'rectangle', 'angles'])
+    if kind == 'circle':
+        radius = 7 * rng.randrange(1, 6)
+        area = Fraction(22, 7) * radius * radius
+        circumference = Fraction(44, 7) * radius
+        return build_question(
+            f"What is the area of a circle of radius {radius} cm? (Take pi = 22/7)",
+            f"{number(area)} sq cm",
+            [f"{number(value)} sq cm" for value in (circumference, area * 2, area / 2, Fraction(22, 7) * radius * 2 * radius * 2)],
+            f"Area = pi r^2 = 22/7 x {radius} x {radius} = {number(area)} sq cm.",
+            "Geometry", rng)
+    if kind == 'triangle':
+        base_a, base_b, base_c = rng.choice([(3, 4, 5), (5, 12, 13), (8, 15, 17), (7, 24, 25)])
+        scale = rng.randrange(1, 5)
+        a, b, c = base_a * scale, base_b * scale, base_c * scale
+        return build_question(
+            f"The two shorter sides of a right-angled triangle are {a} cm and {b} cm. How long is the hypotenuse?",
+            f"{c} cm",
+            [f"{value} cm" for value in (a + b, c + scale, c - scale, b + 1) if value != c],
+            f"Hypotenuse = sqrt({a}^2 + {b}^2) = sqrt({a * a + b * b}) = {c} cm.",
+            "Geometry", rng)
+    if kind == 'rectangle':
+        width = rng.randrange(3, 25)
+        length = rng.randrange(width + 1, 40)
+        area = length * width
+        perimeter = 2 * (length + width)
+        return build_question(
+            f"A rectangle has an area of {area} sq m and a length of {length} m. What is its perimeter?",
+            f"{perimeter} m",
+            [f"{value} m" for value in (length + width, area // 2, perimeter + 2, 2 * length + width)],
+            f"Width = {area} / {length} = {width} m, so the perimeter is 2 x ({length} + {width}) = {perimeter} m.",
+            "Geometry", rng)
+    parts = sorted(rng.sample(range(1, 10), 3))
+    if 180 % sum(parts):
+        raise Redraw()
+    unit = 180 // sum(parts)
+    largest = parts[-1] * unit
+    return build_question(
+        f"The angles of a triangle are in the ratio {parts[0]} : {parts[1]} : {parts[2]}. What is the largest angle?",
+        f"{largest} degrees",
+        [f"{value} degrees" for value in (parts[1] * unit, largest + unit, 90 if largest != 90 else 100, parts[0] * unit)],
+        f"The angles add up to 180 degrees, so one part is 180 / {sum(parts)} = {unit} and the largest angle is "
+        f"{parts[-1]} x {unit} = {largest} degrees.",
+        "Geometry", rng)
+
+
+# ---------------- Logical ----------------
+def number_series_question(rng):
+    kind = rng.choice(['arithmetic', 'geometric', 'squares', 'products', 'second_difference'])
+    if kind == 'arithmetic':
+        start, step = rng.randrange(1, 40), rng.choice([-7, -5, -3, 3, 4, 6, 7, 9, 11, 13])
+        terms = [start + step * i for i in range(6)]
+        rule = f"Each term adds {step}" if step > 0 else f"Each term subtracts {-step}"
+    elif kind == 'geometric':
+        start, ratio = rng.randrange(1, 6), rng.choice([2, 3])
+        terms = [start * ratio ** i for i in range(6)]
+        rule = f"Each term is {ratio} times the previous one"
+    elif kind == 'squares':
+        offset, first = rng.randrange(-3, 6), rng.randrange(1, 8)
+        terms = [(first + i) ** 2 + offset for i in range(6)]
+        rule = f"The terms are the squares {first}^2, {first + 1}^2, ...{' plus ' + str(offset) if offset > 0 else ' minus ' + str(-offset) if offset else ''}"
+    elif kind == 'products':
+        first = rng.randrange(1, 7)
+        terms = [(first + i) * (first + i + 1) for i in range(6)]
+        rule = f"The terms are {first} x {first + 1}, {first + 1} x {first + 2}, and so on"
+    else:
+        start, difference, growth = rng.randrange(1, 20), rng.randrange(1, 6), rng.randrange(1, 4)
+        terms = [start]
+        for i in range(5):
+            terms.append(terms[-1] + difference + growth * i)
+        rule = f"The differences between terms go up by {growth} each time ({difference}, {difference + growth}, ...)"
+    shown, answer = terms[:5], terms[5]
+    last_gap = shown[-1] - shown[-2]
+    mistakes = [shown[-1] + last_gap, answer + 1, answer - 1, answer + last_gap, answer + 2]
+    return build_question(
+        f"What comes next in the series {', '.join(map(str, shown))}, ?",
+        str(answer),
+        [str(value) for value in mistakes],
+        f"{rule}, so the next term is {answer}.",
+        "Number series", rng)
+
+
+def letter_series_question(rng):
+    def letter(index):
+        return chr(ord('A') + index)
+    if rng.random() < 0.5:
+        step = rng.randrange(1, 5)
+        start = rng.randrange(0, 26 - 6 * step)
+        shown = [letter(start + step * i) for i in range(5)]
+        answer_index = start + 5 * step
+        wrong = [letter(answer_index + delta) for delta in (1, -1, 2, step) if 0 <= answer_index + delta < 26]
+        return build_question(
+            f"What comes next in the series {', '.join(shown)}, ?",
+            letter(answer_index), wrong,
+            f"Each letter moves {step} place{'s' if step > 1 else ''} forward, so after {shown[-1]} comes {letter(answer_index)}.",
+            "Letter series", rng)
+    step = rng.randrange(1, 3)
+    start = rng.randrange(0, 26 - 4 * step - 1)
+    pairs = [letter(start + step * i) + letter(25 - start - step * i) for i in range(4)]
+    answer = pairs[-1]
+    shown = pairs[:3]
+    first, second = start + 3 * step, 25 - start - 3 * step
+    wrong = [letter(first) + letter(second + 1), letter(first + 1) + letter(second),
+             letter(first) + letter(second - 1), letter(first - 1) + letter(second)]
+    return build_question(
+        f"What comes next in the series {', '.join(shown)}, ?",
+        answer, wrong,
+        f"The first letter moves {step} forward and the second moves {step} back each time, giving {answer}.",
+        "Letter series", rng)
+
+
+ANALOGY_RULES = [
+    ('square', lambda n: n * n, "is squared"),
+    ('cube', lambda n: n ** 3, "is cubed"),
+    ('square_plus_one', lambda n: n * n + 1, "is squared and 1 is added"),
+    ('double_plus_one', lambda n: 2 * n + 1, "is doubled and 1 is added"),
+    ('triangular', lambda n: n * (n + 1) // 2, "becomes 1 + 2 + ... + n"),
+    ('square_minus_self', lambda n: n * n - n, "becomes n^2 - n"),
+]
+
+
+def analogy_question(rng):
+    _, rule, description = rng.choice(ANALOGY_RULES)
+    first, second = rng.sample(range(2, 13), 2)
+    pair, answer = rule(first), rule(second)
+    # Other readings of the example pair must not be offered as options
+    other_readings = {second + (pair - first), Fraction(second * pair, first)}
+    if answer in other_readings:
+        raise Redraw()
+    candidates = [rule(second + 1), rule(second - 1), answer + second, answer - 1, answer + 2, answer * 2]
+    return build_question(
+        f"{first} is to {pair} as {second} is to ?",
+        str(answer),
+        [str(value) for value in candidates if value > 0 and value not in other_readings],
+        f"In the first pair the number {description} ({first} -> {pair}); doing the same to {second} gives {answer}.",
+        "Analogies", rng)
+
+
+# Relation of X to Y by (generations X is above Y, whether they're in different branches), per gender
+KINSHIP = {
+    (1, False): ('father', 'mother'),
+    (-1, False): ('son', 'daughter'),
+    (0, True): ('brother', 'sister'),
+    (2, False): ('grandfather', 'grandmother'),
+    (-2, False): ('grandson', 'granddaughter'),
+    (1, True): ('uncle', 'aunt'),
+    (-1, True): ('nephew', 'niece'),
+    (0, 'cousin'): ('cousin', 'cousin'),
+}
+RELATION_WORDS = {'male': ['father', 'son', 'brother', 'grandfather', 'grandson', 'uncle', 'nephew', 'cousin'],
+                  'female': ['mother', 'daughter', 'sister', 'grandmother', 'granddaughter', 'aunt', 'niece', 'cousin']}
+
+
+def blood_relation_question(rng):
+    # A small family: a grandparent, their two children, and a child under each of those
+    people = ['G', 'P1', 'P2', 'C1', 'C2']
+    parent = {'P1': 'G', 'P2': 'G', 'C1': 'P1', 'C2': 'P2'}
+    depth = {'G': 0, 'P1': 1, 'P2': 1, 'C1': 2, 'C2': 2}
+    gender = {person: rng.choice(['male', 'female']) for person in people}
+    names = dict(zip(people, rng.sample('ABCDEFKLMPQRST', len(people))))
+
+    def ancestors(person):
+        chain = [person]
+        while chain[-1] in parent:
+            chain.append(parent[chain[-1]])
+        return chain
+
+    def relation(x, y):
+        """(generations x is above y, branch flag) as used by KINSHIP"""
+        x_line, y_line = ancestors(x), ancestors(y)
+        common = next(person for person in x_line if person in y_line)
+        up_x, up_y = x_line.index(common), y_line.index(common)
+        if up_x == 0 or up_y == 0:
+            return (up_y - up_x, False)
+        if up_x == up_y == 2:
+            return (0, 'cousin')
+        return (up_y - up_x, True)
+
+    def neighbours(person):
+        found = [other for other in people if parent.get(other) == person]
+        if person in parent:
+            found.append(parent[person])
+            found += [other for other in people if other != person and parent.get(other) == parent[person]]
+        return found
+
+    start, end = rng.sample(people, 2)
+    # Walk the family one statement at a time, breadth first, for the shortest chain of statements
+    paths, visited = [[start]], {start}
+    path = None
+    while paths and path is None:
+        current = paths.pop(0)
+        for other in neighbours(current[-1]):
+            if other in visited:
+                continue
+            visited.add(other)
+            if other == end:
+                path = current + [other]
+                break
+            paths.append(current + [other])
+    if path is None or len(path) < 3:
+        raise Redraw()
+    statements = []
+    for x, y in zip(path, path[1:]):
+        male, female = KINSHIP[relation(x, y)]
+        statements.append(f"{names[x]} is the {male if gender[x] == 'male' else female} of {names[y]}.")
+    key = relation(start, end)
+    if key not in KINSHIP:
+        raise Redraw()
+    male, female = KINSHIP[key]
+    answer = male if gender[start] == 'male' else female
+    wrong = [word for word in RELATION_WORDS[gender[start]] if word != answer]
+    rng.shuffle(wrong)
+    return build_question(
+        f"{' '.join(statements)} How is {names[start]} related to {names[end]}?",
+        answer.capitalize(), [word.capitalize() for word in wrong],
+        f"Following the statements in order: {' '.join(statements)} So {names[start]} is {names[end]}'s {answer}.",
+        "Blood relations", rng)
+
+
+DIRECTIONS = ['north', 'east', 'south', 'west']
+STEPS = {'north': (0, 1), 'east': (1, 0), 'south': (0, -1), 'west': (-1, 0)}
+
+
+def compass(dx, dy):
+    vertical = 'north' if dy > 0 else 'south' if dy < 0 else ''
+    horizontal = 'east' if dx > 0 else 'west' if dx < 0 else ''
+    return f"{vertical}-{horizontal}" if vertical and horizontal else vertical or horizontal
+
+
+def direction_question(rng):
+    facing = rng.randrange(4)
+    legs = rng.randrange(2, 5)
+    x = y = 0
+    walked = []
+    text = [f"Ravi starts out facing {DIRECTIONS[facing]} and walks {{}} km."]
+    for leg in range(legs):
+        if leg:
+            turn = rng.choice(['left', 'right'])
+            facing = (facing + (1 if turn == 'right' else -1)) % 4
+            text.append(f"He turns {turn} and walks {{}} km.")
+        distance = rng.randrange(1, 13)
+        dx, dy = STEPS[DIRECTIONS[facing]]
+        x, y = x + dx * distance, y + dy * distance
+        walked.append(distance)
+    story = ' '.join(part.format(distance) for part, distance in zip(text, walked))
+    if rng.random() < 0.3:
+        answer = DIRECTIONS[facing].capitalize()
+        return build_question(
+            f"{story} Which direction is he facing now?",
+            answer, [direction.capitalize() for direction in DIRECTIONS],
+            f"Each right turn moves his facing a quarter turn clockwise and each left turn anticlockwise, "
+            f"which leaves him facing {DIRECTIONS[facing]}.",
+            "Direction sense", rng)
+    distance = math.isqrt(x * x + y * y)
+    if (x == 0 and y == 0) or distance * distance != x * x + y * y:
+        raise Redraw()
+    where = compass(x, y)
+    answer = f"{distance} km {where}"
+    opposite = compass(-x, -y)
+    wrong = [f"{distance} km {opposite}", f"{sum(walked)} km {where}", f"{abs(x) + abs(y)} km {where}",
+             f"{distance} km {compass(y, x) if compass(y, x) != where else compass(-y, x)}"]
+    return build_question(
+        f"{story} How far is he from his starting point, and in which direction?",
+        answer, wrong,
+        f"Adding up the legs, he ends {abs(x)} km {'east' if x >= 0 else 'west'} and {abs(y)} km "
+        f"{'north' if y >= 0 else 'south'} of where he started: {distance} km to the {where}.",
+        "Direction sense", rng)
+
+
+# Keyed by aptitude.APTITUDE_CATEGORIES' subtopic names
+GENERATORS = {
+    'quantitative': {
+        'Percentage calculations': percentage_question,
+        'Time and work problems': time_and_work_question,
+        'Profit and loss': profit_and_loss_question,
+        'Algebra': algebra_question,
+        'Geometry': geometry_question,
+    },
+    'logical': {
+        'Number series': number_series_question,
+        'Letter series': letter_series_question,
+        'Analogies': analogy_question,
+        'Blood relations': blood_relation_question,
+        'Direction sense': direction_question,
+    },
+}
+
+
+def supports(category):
+    return category in GENERATORS
+
+
+def generate(category, subtopic=None, rng=random):
+    """A fresh question for category (a random subtopic unless one is given)"""
+    generators = GENERATORS[category]
+    generator = generators[subtopic] if subtopic else rng.choice(list(generators.values()))
+    for _ in range(MAX_ATTEMPTS):
+        try:
+            return generator(rng)
+        except Redraw:
+            continue
+    raise RuntimeError(f"No clean {category} question after {MAX_ATTEMPTS} draws")
+
+
+def check(question):
+    """Problems with a generated question's structure, [] if none"""
+    problems = []
+    options = question['options']
+    if sorted(options) != list(OPTION_KEYS):
+        problems.append("options must be a, b, c and d")
+    if len(set(options.values())) != len(options):
+        problems.append("options repeat")
+    if question['answer'] not in options:
+        problems.append("answer is not an option")
+    return problems
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    for category, generators in GENERATORS.items():
+        for subtopic in generators:
+            started = time.perf_counter()
+            questions = [generate(category, subtopic, rng) for _ in range(1000)]
+            elapsed_us = (time.perf_counter() - started) * 1e6 / len(questions)
+            problems = [problem for question in questions for problem in check(question)]
+            print(f"{category:<13} {subtopic:<24} {elapsed_us:7.1f} us/question  "
+                  f"{len({q['question'] for q in questions}):4} distinct  {len(problems)} problems")
+            sample = questions[0]
+            print(f"    {sample['question']}")
+            print(f"    {sample['options']} -> {sample['answer']}")
@@ -0,0 +1,346 @@
+"""
+ASGI entry point: the LLM-bound routes as coroutines, everything else from the Flask app.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5001
+
+The interview, resume, coding, DSA, aptitude and MCQ routes below await Groq
+through the async gateway, so a request waiting on the LLM is a suspended
+coroutine instead of a pinned thread. They reuse app.py's request builders and
+response parsers, and share its scheduler, breaker, cache, question pool and
+interview sessions. Every other path is passed through to the Flask app on a
+small thread pool. `python app.py` still serves everything synchronously.
+"""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from functools import wraps
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+import app as wsgi
+from app import RequestError
+from generation_jobs import FINISHED
+from llm_cache import response_cache
+from llm_gateway import async_gateway as client
+from llm_scheduler import LLMOverloaded, aiterate_in_context, llm_context
+from streaming import JsonFieldStreamer, astream_text, sse_event
+
+
+async def request_json(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+def overloaded_response(error):
+    return JSONResponse({'error': 'The AI service is busy right now. Please try again shortly.',
+                         'retry_after': error.retry_after},
+                        status_code=503, headers={'Retry-After': str(error.retry_after)})
+
+
+def llm_priority(priority):
+    """
+    app.llm_priority for coroutine endpoints, which are called with the parsed
+    JSON body. Also turns RequestError and other exceptions into JSON errors,
+    as the Flask views do in their own try blocks.
+    """
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(request):
+            data = await request_json(request)
+            client_host = request.client.host if request.client else ''
+            student_id = str((data or {}).get('studentId') or client_host)
+            try:
+                with llm_context(priority, student_id):
+                    client.scheduler.admit(priority)
+                    return await endpoint(request, data)
+            except LLMOverloaded as e:
+                return overloaded_response(e)
+            except RequestError as e:
+                return JSONResponse({'error': str(e)}, status_code=e.status)
+            except Exception as e:
+                return JSONResponse({'error': str(e)}, status_code=500)
+        return wrapper
+    return decorator
+
+
+async def fan_out(func, items, max_in_flight):
+    """app.fan_out for coroutine functions; tasks inherit the request's LLM priority"""
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def run(item):
+        async with semaphore:
+            return await func(item)
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+def sse_response(events):
+    return StreamingResponse(aiterate_in_context(events), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+async def json_completion(completion_kwargs, **call_options):
+    response = await client.chat.completions.create(**completion_kwargs, **call_options)
+    return json.loads(response.choices[0].message.content)
+
+
+# ---------------- Interview ----------------
+@llm_priority('interactive')
+async def start_interview(request, data):
+    job_type, conversation_history = wsgi.interview_opening(data)
+    response = await client.chat.completions.create(**wsgi.interview_completion_kwargs(conversation_history))
+    ai_json_string = response.choices[0].message.content.strip()
+    # Session writes may go through to Mongo, so they stay off the event loop
+    payload = await run_in_threadpool(wsgi.finish_interview_opening, job_type, conversation_history, ai_json_string)
+    return JSONResponse(payload)
+
+
+def stream_interview_turn(prompt_messages, conversation_history, session_id):
+    async def generate():
+        try:
+            completion_stream = await client.chat.completions.create(
+                **wsgi.interview_completion_kwargs(prompt_messages, stream=True))
+            parts = []
+            streamer = JsonFieldStreamer(('feedback', 'next_question'))
+            async for text in astream_text(completion_stream):
+                parts.append(text)
+                for field, delta in streamer.feed(text):
+                    yield sse_event(field, {'delta': delta})
+            payload = await run_in_threadpool(
+                wsgi.finish_streamed_interview_turn, ''.join(parts), conversation_history, session_id)
+            yield sse_event('done', payload)
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+
+    return sse_response(generate())
+
+
+@llm_priority('interactive')
+async def interview_chatbot(request, data):
+    prompt_messages, conversation_history, session_id = await run_in_threadpool(wsgi.prepare_interview_turn, data)
+    if data.get('stream'):
+        return stream_interview_turn(prompt_messages, conversation_history, session_id)
+
+    response = await client.chat.completions.create(**wsgi.interview_completion_kwargs(prompt_messages))
+    ai_data, feedback, next_question = wsgi.parse_interview_reply(response.choices[0].message.content.strip())
+    payload = await run_in_threadpool(
+        wsgi.complete_interview_turn, conversation_history, session_id, ai_data, feedback, next_question)
+    return JSONResponse(payload)
+
+
+# ---------------- Resume ----------------
+def stream_resume(completion_kwargs):
+    async def generate():
+        try:
+            cached = response_cache.get(**completion_kwargs)
+            if cached is not None:
+                yield sse_event('delta', {'delta': cached})
+                yield sse_event('done', {'resume': cached})
+                return
+            parts = []
+            async for text in astream_text(await client.chat.completions.create(stream=True, **completion_kwargs)):
+                parts.append(text)
+                yield sse_event('delta', {'delta': text})
+            ai_response = ''.join(parts).strip()
+            response_cache.put(ai_response, **completion_kwargs)
+            yield sse_event('done', {'resume': ai_response})
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+
+    return sse_response(generate())
+
+
+@llm_priority('grading')
+async def generate_resume(request, data):
+    completion_kwargs = wsgi.resume_completion_kwargs(data)
+    if data.get('stream'):
+        return stream_resume(completion_kwargs)
+    ai_response = await response_cache.acompletion(client, **completion_kwargs)
+    return JSONResponse({'resume': ai_response})
+
+
+# ---------------- Coding and DSA challenges ----------------
+@llm_priority('bulk')
+async def start_coding_challenge(request, data):
+    if not data:
+        raise RequestError('No data received')
+    language = data.get('language', 'python')
+    difficulty = data.get('difficulty', 'easy')
+    student_id = wsgi.pool_student_id(data)
+
+    if wsgi.QUESTION_POOL_ENABLED:
+        pooled = wsgi.question_pool.take(('coding', language, difficulty), 1, student_id)
+        if pooled:
+            return JSONResponse({'question': pooled[0]})
+
+    try:
+        question_data = await json_completion(wsgi.coding_question_request(language, difficulty),
+                                              **wsgi.within_budget(wsgi.budget_ends_at('coding')))
+    except Exception as e:
+        print(f"coding question from the question bank: {e}")
+        question_data = wsgi.fallback_coding_question(language, difficulty, student_id)
+    wsgi.question_pool.mark_seen(student_id, [question_data])
+    return JSONResponse({'question': question_data})
+
+
+@llm_priority('bulk')
+async def start_dsa_challenge(request, data):
+    if not data:
+        raise RequestError('No data received')
+    language = data.get('language', 'python')
+    difficulty = data.get('difficulty', 'easy')
+    student_id = wsgi.pool_student_id(data)
+
+    if wsgi.QUESTION_POOL_ENABLED:
+        pooled = wsgi.question_pool.take(('dsa', language, difficulty), 1, student_id)
+        if pooled:
+            return JSONResponse({'problem': pooled[0]})
+
+    try:
+        problem_data = await json_completion(wsgi.dsa_problem_request(language, difficulty),
+                                             **wsgi.within_budget(wsgi.budget_ends_at('dsa')))
+    except Exception as e:
+        print(f"DSA problem from the question bank: {e}")
+        problem_data = wsgi.fallback_dsa_problem(language, difficulty, student_id)
+    wsgi.question_pool.mark_seen(student_id, [problem_data])
+    return JSONResponse({'problem': problem_data})
+
+
+# ---------------- Aptitude and MCQ tests ----------------
+async def generate_aptitude_question(question_category, index, student_id, ends_at):
+    try:
+        return await json_completion(wsgi.aptitude_question_request(question_category), **wsgi.within_budget(ends_at))
+    except Exception as e:
+        print(f"aptitude question {index + 1} from the question bank: {e}")
+        return wsgi.fallback_aptitude_question(question_category, student_id)
+
+
+@llm_priority('bulk')
+async def start_aptitude_test(request, data):
+    if not data:
+        raise RequestError('No data received')
+    category = data.get('category', 'quantitative')
+    student_id = wsgi.pool_student_id(data)
+    slots = wsgi.aptitude_slots(category)
+    questions = wsgi.ready_aptitude_questions(slots, student_id)
+
+    missing = [slot for slot in slots if questions[slot[1]] is None]
+    wsgi.admit_llm_calls(len(missing))
+    ends_at = wsgi.budget_ends_at('aptitude')
+    generated = await fan_out(lambda slot: generate_aptitude_question(*slot, student_id, ends_at), missing,
+                              wsgi.APTITUDE_MAX_IN_FLIGHT)
+    for (_, i), question_data in zip(missing, generated):
+        questions[i] = question_data
+    wsgi.question_pool.mark_seen(student_id, generated)
+    return JSONResponse({'questions': questions})
+
+
+async def generate_mcq_batch(domain, batch_size, batch_index, avoid=()):
+    try:
+        batch_data = await json_completion(wsgi.mcq_batch_request(domain, batch_size, batch_index, avoid))
+    except Exception as e:
+        print(f"mcq batch {batch_index} error: {e}")
+        return []
+    return wsgi.mcq_batch_questions(batch_data)
+
+
+@llm_priority('bulk')
+async def get_domain_mcq(request, data):
+    if not data:
+        raise RequestError('No data received')
+    domain = data.get('domain', '')
+    num_questions = int(data.get('num_questions', 20))
+    if not domain:
+        raise RequestError('Domain name is required')
+
+    student_id = wsgi.pool_student_id(data)
+    seen_index = wsgi.NearDuplicateIndex(threshold=wsgi.MCQ_DUPLICATE_THRESHOLD)
+    questions = wsgi.pooled_mcq_questions(domain, num_questions, student_id, seen_index)
+    calls = 0
+
+    while len(questions) < num_questions and calls < wsgi.MCQ_MAX_CALLS:
+        batch_indexes, avoid = wsgi.plan_mcq_round(questions, num_questions, calls)
+        wsgi.admit_llm_calls(len(batch_indexes))
+        calls += len(batch_indexes)
+        batches = await fan_out(
+            lambda batch_index: generate_mcq_batch(domain, wsgi.MCQ_BATCH_SIZE, batch_index, avoid),
+            batch_indexes,
+            wsgi.MCQ_MAX_IN_FLIGHT
+        )
+        wsgi.add_unique_questions(questions, batches, seen_index)
+
+    if len(questions) < num_questions:
+        return JSONResponse(wsgi.mcq_shortfall_error(questions, domain), status_code=400)
+    questions = questions[:num_questions]
+    wsgi.question_pool.mark_seen(student_id, questions)
+    return JSONResponse({'questions': questions})
+
+
+# ---------------- Generation jobs ----------------
+JOB_POLL_SECONDS = 0.25
+
+
+async def job_event_stream(request):
+    """app.job_event_stream without a thread per subscriber: the job is polled from the event loop"""
+    job = wsgi.generation_jobs.get(request.path_params['job_id'])
+    if job is None:
+        return JSONResponse({'error': 'Job not found or expired'}, status_code=404)
+    since = wsgi.job_since(request.query_params)
+
+    async def generate():
+        seen, idle = since, 0.0
+        while True:
+            snapshot = job.snapshot(seen)
+            for event in wsgi.job_events(snapshot, seen):
+                yield event
+            if snapshot['status'] in FINISHED:
+                return
+            if snapshot['next'] > seen:
+                idle = 0.0
+            elif idle >= wsgi.JOB_KEEPALIVE_SECONDS:
+                yield ': keepalive\n\n'
+                idle = 0.0
+            seen = max(seen, snapshot['next'])
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            idle += JOB_POLL_SECONDS
+
+    return sse_response(generate())
+
+
+@asynccontextmanager
+async def lifespan(_):
+    # Pre-start the sandbox workers so the first submission doesn't pay for interpreter startup
+    await run_in_threadpool(wsgi.execution_pool.start)
+    yield
+    await client.aclose()
+
+
+app = Starlette(
+    routes=[
+        Route('/start-interview', start_interview, methods=['POST']),
+        Route('/interview-chatbot', interview_chatbot, methods=['POST']),
+        Route('/generate-resume', generate_resume, methods=['POST']),
+        Route('/start-coding-challenge', start_coding_challenge, methods=['POST']),
+        Route('/start-dsa-challenge', start_dsa_challenge, methods=['POST']),
+        Route('/start-aptitude-test', start_aptitude_test, methods=['POST']),
+        Route('/get-domain-mcq', get_domain_mcq, methods=['POST']),
+        Route('/jobs/{job_id}/events', job_event_stream, methods=['GET']),
+        # Everything else, including static files, is the Flask app on a thread pool
+        Mount('/', WSGIMiddleware(wsgi.app, workers=int(os.getenv("ASGI_WSGI_THREADS", "20")))),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5001)
@@ -0,0 +1,249 @@
+"""
+Load test comparing the two serving modes on the same LLM-bound route.
+
+    python benchmark_serving.py --concurrency 50 200 500 --latency 1.0
+
+Starts a fake Groq endpoint that answers every chat completion after --latency
+seconds, then runs the Flask app (threaded server, as `python app.py`) and the
+ASGI app (uvicorn asgi:app) in turn against it, firing POSTs at
+/start-coding-challenge at each concurrency level. Reports throughput, p50/p99
+latency, errors and the server process's peak RSS and thread count (read from
+/proc, so Linux only). Needs httpx, starlette and uvicorn.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+QUESTION = json.dumps({
+    'question': 'Write a function that returns the sum of a list.',
+    'test_cases': [[[[1, 2, 3]], 6], [[[]], 0]],
+    'solution': 'def solution(nums):\n    return sum(nums)'
+})
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_upstream(port, latency):
+    """The fake Groq API: one JSON completion per request after `latency` seconds"""
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    async def completions(request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        return JSONResponse({
+            'id': 'chatcmpl-bench', 'object': 'chat.completion', 'created': int(time.time()),
+            'model': body.get('model', ''),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': QUESTION}}],
+            'usage': {'prompt_tokens': 50, 'completion_tokens': 60, 'total_tokens': 110}
+        })
+
+    app = Starlette(routes=[Route('/openai/v1/chat/completions', completions, methods=['POST'])])
+    uvicorn.run(app, host='127.0.0.1', port=port, log_level='warning', backlog=4096)
+
+
+def server_command(mode, port):
+    if mode == 'flask':
+        return [sys.executable, '-c',
+                f"import app; app.app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    return [sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', '127.0.0.1', '--port', str(port),
+            '--log-level', 'warning', '--backlog', '4096']
+
+
+def cpu_seconds(pid):
+    """User + system CPU time used so far by a process"""
+    try:
+        with open(f'/proc/{pid}/stat') as stat:
+            fields = stat.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except OSError:
+        return 0.0
+
+
+def read_proc(pid):
+    """(RSS in MB, thread count) of a process"""
+    rss, threads = 0.0, 0
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    rss = int(line.split()[1]) / 1024
+                elif line.startswith('Threads:'):
+                    threads = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, threads
+
+
+async def wait_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while time.monotonic() < deadline:
+            try:
+                if (await http.get(f'{base_url}/llm-gateway-stats')).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'Server at {base_url} did not start')
+
+
+async def load(base_url, pid, concurrency, total):
+    latencies, errors = [], 0
+    remaining = iter(range(total))
+    peak = [0.0, 0]
+    done = asyncio.Event()
+
+    async def sample():
+        while not done.is_set():
+            rss, threads = read_proc(pid)
+            peak[0], peak[1] = max(peak[0], rss), max(peak[1], threads)
+            await asyncio.sleep(0.1)
+
+    async def worker():
+        nonlocal errors
+        # One connection per simulated user; a shared pool of hundreds is slow to schedule in httpx itself
+        async with httpx.AsyncClient(timeout=120) as http:
+            await run_requests(http)
+
+    async def run_requests(http):
+        nonlocal errors
+        for i in remaining:
+            started = time.monotonic()
+            try:
+                response = await http.post(f'{base_url}/start-coding-challenge',
+                                           json={'language': 'python', 'difficulty': 'easy',
+                                                 'studentId': f'bench-{i % 50}'})
+                ok = response.status_code == 200 and 'question' in response.json()
+            except (httpx.HTTPError, ValueError):
+                ok = False
+            if ok:
+                latencies.append(time.monotonic() - started)
+            else:
+                errors += 1
+
+    sampler = asyncio.create_task(sample())
+    cpu_started = cpu_seconds(pid)
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+    cpu = cpu_seconds(pid) - cpu_started
+    done.set()
+    await sampler
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float('nan')
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(0.5),
+        'p99_ms': percentile(0.99),
+        'errors': errors,
+        # Server CPU per request: on a small box this, not concurrency, caps throughput
+        'cpu_ms_per_request': cpu * 1000 / total,
+        'peak_rss_mb': peak[0],
+        'peak_threads': peak[1]
+    }
+
+
+def benchmark_mode(mode, upstream_port, levels, requests_per_level):
+    port = free_port()
+    env = dict(
+        os.environ,
+        GROQ_BASE_URL=f'http://127.0.0.1:{upstream_port}',
+        GROQ_API_KEY='benchmark',
+        MONGO_URI='',
+        MONGO_HEALTH_INTERVAL='3600',
+        LLM_RATE_PER_MINUTE='0',
+        LLM_DEADLINE='120',
+        LLM_TIMEOUT='120',
+        QUESTION_POOL_ENABLED='0',
+        # Neither mode should be limited by its connection pool to the upstream
+        LLM_POOL_SIZE=str(max(levels)),
+        LLM_ASYNC_POOL_SIZE=str(max(levels)),
+        EXECUTION_POOL_SIZE='1'
+    )
+    server = subprocess.Popen(server_command(mode, port), cwd=HERE, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    results = []
+    try:
+        asyncio.run(wait_ready(base_url))
+        idle_rss, idle_threads = read_proc(server.pid)
+        print(f'{mode}: idle {idle_rss:.0f}MB, {idle_threads} threads')
+        for concurrency in levels:
+            total = requests_per_level or concurrency * 4
+            result = asyncio.run(load(base_url, server.pid, concurrency, total))
+            result['mode'] = mode
+            results.append(result)
+            print_result(result)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    return results
+
+
+def print_result(result):
+    print(f"{result['mode']:>6} c={result['concurrency']:<5} n={result['requests']:<6} "
+          f"{result['rps']:8.1f} req/s  p50 {result['p50_ms']:8.0f}ms  p99 {result['p99_ms']:8.0f}ms  "
+          f"errors {result['errors']:<5} cpu {result['cpu_ms_per_request']:5.1f}ms/req  peak {result['peak_rss_mb']:6.0f}MB {result['peak_threads']:5} threads",
+          flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--requests', type=int, default=0, help='per level; default 4x the concurrency')
+    parser.add_argument('--latency', type=float, default=1.0, help='seconds the fake Groq takes per call')
+    parser.add_argument('--modes', nargs='+', default=['flask', 'asgi'], choices=['flask', 'asgi'])
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    upstream_port = free_port()
+    upstream = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--upstream', str(upstream_port),
+                                 str(args.latency)])
+    try:
+        time.sleep(1.5)
+        results = []
+        for mode in args.modes:
+            results += benchmark_mode(mode, upstream_port, args.concurrency, args.requests)
+    finally:
+        upstream.terminate()
+        upstream.wait()
+
+    print('\nmode    concurrency    req/s    p50 ms    p99 ms  errors  cpu ms/req  peak MB  threads')
+    for result in results:
+        print(f"{result['mode']:<7} {result['concurrency']:>11} {result['rps']:8.1f} {result['p50_ms']:9.0f} "
+              f"{result['p99_ms']:9.0f} {result['errors']:7} {result['cpu_ms_per_request']:11.1f} {result['peak_rss_mb']:8.0f} {result['peak_threads']:8}")
+    if args.json:
+        with open(args.json, 'w') as out:
+            json.dump(results, out, indent=2)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--upstream':
+        run_upstream(int(sys.argv[2]), float(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,176 @@
+import base64
+import json
+import zlib
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+# Newest-first history per student, with or without a feature filter; _id breaks createdAt ties
+CHAT_HISTORY_INDEXES = [
+    [('studentId', 1), ('feature', 1), ('createdAt', -1), ('_id', -1)],
+    [('studentId', 1), ('createdAt', -1), ('_id', -1)],
+    [('createdAt', 1), ('_id', 1)],  # Exports across all students by date range
+]
+
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+HISTORY_FIELDS = ('studentId', 'studentName', 'feature', 'role', 'message', 'message_text', 'sessionId', 'createdAt')
+
+
+def ensure_chat_indexes(collection):
+    try:
+        for keys in CHAT_HISTORY_INDEXES:
+            collection.create_index(keys)
+    except Exception as e:
+        print(f"Chat history index error: {e}")
+
+
+def encode_cursor(doc):
+    """Opaque page token for a message: its createdAt (ms) and _id"""
+    millis = int(doc['createdAt'].replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return base64.urlsafe_b64encode(f"{millis}:{doc['_id']}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """(createdAt, _id) from encode_cursor; raises ValueError for a malformed token"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        millis, object_id = raw.split(':', 1)
+        created_at = datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc).replace(tzinfo=None)
+        return created_at, ObjectId(object_id)
+    except (ValueError, InvalidId, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid page cursor: {token}") from e
+
+
+def serialize_message(doc):
+    created_at = doc.get('createdAt')
+    item = {
+        'id': str(doc.get('_id')),
+        'studentId': doc.get('studentId'),
+        'studentName': doc.get('studentName', ''),
+        'feature': doc.get('feature', ''),
+        'role': doc.get('role', ''),
+        'message': doc.get('message', ''),
+        'message_text': doc.get('message_text', ''),
+        'sessionId': doc.get('sessionId', ''),
+        'createdAt': created_at.isoformat() + 'Z' if isinstance(created_at, datetime) else None
+    }
+    if 'metadata' in doc:
+        item['metadata'] = doc['metadata']
+    return item
+
+
+def fetch_history_page(collection, query, limit, before=None, after=None, include_metadata=False):
+    """
+    One page of chat history in chronological order, by keyset pagination on (createdAt, _id).
+
+    With no cursor it's the newest `limit` messages; before=token gives the ones just
+    older than that message, after=token the ones just newer. Every page costs one
+    index range scan of limit + 1 entries, however deep into the history it is.
+    The returned 'before' token is None once there's nothing older; 'after' is always
+    set, for polling new messages.
+    """
+    newest_first = after is None
+    if before or after:
+        created_at, object_id = decode_cursor(before or after)
+        op = '$lt' if newest_first else '$gt'
+        query = dict(query, **{'$or': [
+            {'createdAt': {op: created_at}},
+            {'createdAt': created_at, '_id': {op: object_id}}
+        ]})
+
+    projection = {field: 1 for field in HISTORY_FIELDS}
+    if include_metadata:
+        projection['metadata'] = 1
+    direction = -1 if newest_first else 1
+    docs = list(collection.find(query, projection)
+                .sort([('createdAt', direction), ('_id', direction)])
+                .limit(limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    if newest_first:
+        docs.reverse()
+
+    older = has_more if newest_first else True
+    return {
+        'items': [serialize_message(doc) for doc in docs],
+        'before': encode_cursor(docs[0]) if docs and older else None,
+        'after': encode_cursor(docs[-1]) if docs else after,
+        'has_more': has_more
+    }
+
+
+def parse_timestamp(value):
+    """ISO 8601 date or datetime as a naive UTC datetime, the way createdAt is stored"""
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError as e:
+        raise ValueError(f"Invalid date: {value}") from e
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def export_query(student_id='', feature='', session_id='', since='', until=''):
+    """Filter for an export; since is inclusive, until exclusive"""
+    query = {}
+    if student_id:
+        query['studentId'] = student_id
+    if feature:
+        query['feature'] = feature
+    if session_id:
+        query['sessionId'] = session_id
+    created_at = {}
+    if since:
+        created_at['$gte'] = parse_timestamp(since)
+    if until:
+        created_at['$lt'] = parse_timestamp(until)
+    if created_at:
+        query['createdAt'] = created_at
+    return query
+
+
+def export_document(doc):
+    doc['_id'] = str(doc['_id'])
+    created_at = doc.get('createdAt')
+    if isinstance(created_at, datetime):
+        doc['createdAt'] = created_at.isoformat() + 'Z'
+    return json.dumps(doc, default=str, ensure_ascii=False)
+
+
+def export_ndjson(collection, query, batch_size=1000):
+    """
+    Every matching message as NDJSON in createdAt order, read straight off the
+    cursor and yielded in ~64KB chunks, so memory stays flat however many match.
+    """
+    cursor = (collection.find(query)
+              .sort([('createdAt', 1), ('_id', 1)])
+              .batch_size(batch_size))
+    chunk, size = [], 0
+    try:
+        for doc in cursor:
+            line = export_document(doc) + '\n'
+            chunk.append(line)
+            size += len(line)
+            if size >= EXPORT_CHUNK_BYTES:
+                yield ''.join(chunk).encode('utf-8')
+                chunk, size = [], 0
+        if chunk:
+            yield ''.join(chunk).encode('utf-8')
+    finally:
+        cursor.close()
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a byte stream on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    finally:
+        # Pass a client disconnect on, so the export closes its Mongo cursor
+        chunks.close()
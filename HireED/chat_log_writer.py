@@ -0,0 +1,258 @@
+import atexit
+import fcntl
+import os
+import threading
+import time
+from collections import deque
+
+import bson
+from bson import json_util
+from bson.errors import InvalidDocument
+from pymongo.errors import BulkWriteError, PyMongoError
+
+# What BSON encoding raises for a document that can never be written (e.g. an int past 64 bits)
+UNENCODABLE = (InvalidDocument, OverflowError, TypeError, ValueError)
+
+
+class BufferedLogWriter:
+    """
+    Write-behind buffer for chat log documents.
+
+    append() only puts the document on an in-memory queue; a background thread
+    writes queued documents with insert_many(ordered=False) once batch_size have
+    piled up or every flush_interval seconds. If Mongo is unreachable the thread
+    moves everything queued to a JSON-lines spill file (capped at max_spill_bytes)
+    and backs off; once a write succeeds again the spill file is replayed first.
+    Documents keep the _id pymongo gives them on the first attempt, so a batch that
+    did reach Mongo before the error is skipped as a duplicate on replay. A
+    document that can't be encoded at all is dropped and counted as rejected.
+
+    get_collection is called before every flush and may reconnect; it returns the
+    collection or None.
+    """
+
+    def __init__(self, get_collection, batch_size=100, flush_interval=0.5, max_buffer=10000,
+                 spill_path=None, max_spill_bytes=50 * 1024 * 1024, max_backoff=30.0):
+        self.get_collection = get_collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.spill_path = spill_path
+        self.max_spill_bytes = max_spill_bytes
+        self.max_backoff = max_backoff
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopped = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self._stats = {'written': 0, 'spilled': 0, 'replayed': 0, 'dropped': 0, 'rejected': 0,
+                       'flushes': 0, 'failed_flushes': 0, 'last_flush_ms': None, 'last_error': ''}
+        atexit.register(self.close)
+
+    def append(self, document):
+        """Queue a document for writing; False if the buffer is full and it was dropped"""
+        self._ensure_thread()
+        if len(self._buffer) >= self.max_buffer:
+            self._count('dropped')
+            return False
+        self._buffer.append(document)
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _ensure_thread(self):
+        # Started lazily, and again in a forked worker, which doesn't inherit threads
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._thread = threading.Thread(target=self._run, name='chat-log-writer', daemon=True)
+                    self._thread.start()
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Nothing restarts this thread short of a fork, so it must outlive any failure
+                self._backoff(f"{type(e).__name__}: {e}")
+
+    def _take(self, limit):
+        batch = []
+        while self._buffer and len(batch) < limit:
+            batch.append(self._buffer.popleft())
+        return batch
+
+    def flush(self):
+        """Write (or, while Mongo is down, spill) everything queued so far"""
+        if time.monotonic() < self._retry_at:
+            self._spill(self._take(len(self._buffer)))
+            return
+        collection = self._collection()
+        if collection is None:
+            self._backoff("MongoDB connection not available")
+            self._spill(self._take(len(self._buffer)))
+            return
+        try:
+            self._replay(collection)
+            while self._buffer:
+                batch = self._take(self.batch_size)
+                try:
+                    self._insert(collection, batch)
+                except Exception:
+                    self._spill(batch)
+                    raise
+        except PyMongoError as e:
+            self._backoff(str(e))
+            self._spill(self._take(len(self._buffer)))
+            return
+        self._failures = 0
+
+    def _collection(self):
+        try:
+            return self.get_collection()
+        except Exception as e:
+            print(f"Chat log writer couldn't get a collection: {e}")
+            return None
+
+    def _insert(self, collection, batch):
+        """insert_many that only raises for errors worth retrying"""
+        if not batch:
+            return
+        started = time.monotonic()
+        try:
+            try:
+                collection.insert_many(batch, ordered=False)
+            except UNENCODABLE:
+                # Nothing was sent; find the documents that can't be encoded and write the rest
+                batch = self._encodable(batch)
+                if batch:
+                    collection.insert_many(batch, ordered=False)
+            written = len(batch)
+        except BulkWriteError as e:
+            # With ordered=False everything else in the batch went in. Duplicates were
+            # already written by an earlier attempt; anything else would fail again.
+            errors = e.details.get('writeErrors', [])
+            rejected = sum(1 for error in errors if error.get('code') != 11000)
+            written = len(batch) - len(errors)
+            if rejected:
+                print(f"Chat log writer: {rejected} documents rejected by MongoDB")
+                self._count('rejected', rejected)
+        with self._lock:
+            self._stats['written'] += written
+            self._stats['flushes'] += 1
+            self._stats['last_flush_ms'] = round((time.monotonic() - started) * 1000, 2)
+
+    def _encodable(self, batch):
+        usable = []
+        for document in batch:
+            try:
+                bson.encode(document)
+            except UNENCODABLE as e:
+                print(f"Chat log writer: dropping a document that can't be stored: {e}")
+                self._count('rejected')
+                continue
+            usable.append(document)
+        return usable
+
+    def _backoff(self, error):
+        self._failures += 1
+        delay = min(self.max_backoff, self.flush_interval * 2 ** self._failures)
+        self._retry_at = time.monotonic() + delay
+        with self._lock:
+            self._stats['failed_flushes'] += 1
+            self._stats['last_error'] = error
+        print(f"Chat log flush failed ({error}), retrying in {delay:.1f}s")
+
+    def _spill_lock(self):
+        # Worker processes may share the spill file, so appends and replays take a file lock
+        handle = open(self.spill_path + '.lock', 'a')
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _spill(self, batch):
+        if not batch:
+            return
+        if not self.spill_path:
+            self._count('dropped', len(batch))
+            return
+        with self._spill_lock():
+            size = os.path.getsize(self.spill_path) if os.path.exists(self.spill_path) else 0
+            lines = []
+            unencodable = 0
+            for document in batch:
+                try:
+                    line = json_util.dumps(document) + '\n'
+                except UNENCODABLE:
+                    unencodable += 1
+                    continue
+                if size + len(line) > self.max_spill_bytes:
+                    break
+                size += len(line)
+                lines.append(line)
+            with open(self.spill_path, 'a', encoding='utf-8') as spill:
+                spill.writelines(lines)
+        self._count('spilled', len(lines))
+        if unencodable:
+            self._count('rejected', unencodable)
+        if len(lines) + unencodable < len(batch):
+            print(f"Chat log spill file is full, dropped {len(batch) - len(lines) - unencodable} documents")
+            self._count('dropped', len(batch) - len(lines) - unencodable)
+
+    def _replay(self, collection):
+        """Write the spill file back in batches; whatever isn't written stays in the file"""
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        with self._spill_lock():
+            if not os.path.exists(self.spill_path):
+                return
+            with open(self.spill_path, encoding='utf-8') as spill:
+                lines = [line for line in spill if line.strip()]
+            done = 0
+            try:
+                while done < len(lines):
+                    chunk = lines[done:done + self.batch_size]
+                    documents = []
+                    for line in chunk:
+                        try:
+                            documents.append(json_util.loads(line))
+                        except ValueError:
+                            self._count('rejected')
+                    self._insert(collection, documents)
+                    done += len(chunk)
+            finally:
+                if done == len(lines):
+                    os.remove(self.spill_path)
+                else:
+                    remaining = self.spill_path + '.tmp'
+                    with open(remaining, 'w', encoding='utf-8') as spill:
+                        spill.writelines(lines[done:])
+                    os.replace(remaining, self.spill_path)
+                self._count('replayed', done)
+
+    def close(self):
+        """Stop the background thread and write (or spill) what's left"""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=5)
+        self._retry_at = 0.0
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            summary = dict(self._stats)
+        summary['buffered'] = len(self._buffer)
+        summary['spill_bytes'] = (os.path.getsize(self.spill_path)
+                                  if self.spill_path and os.path.exists(self.spill_path) else 0)
+        summary['backing_off'] = time.monotonic() < self._retry_at
+        return summary
@@ -1,17 +1,14 @@
-import random
 import time
 import sys
-import os
-from groq import Groq
 from dotenv import load_dotenv
+from compiled_runner import CompiledRunner
+from llm_gateway import gateway as client
 
 # Load environment variables
 load_dotenv()
-# Replace hardcoded API key with environment variable
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-# Initialize Groq client
-client = Groq(api_key=GROQ_API_KEY)
+# Compiles and runs the non-Python languages; builds are cached by source hash
+compiled_runner = CompiledRunner()
 
 
 # New languages: Java, C++, Go added
@@ -53,13 +50,12 @@ def generate_question(language: str, difficulty: str) -> dict:
     Format as JSON with keys: question, test_cases, solution
     """
     
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[{"role": "user", "content": prompt}],
-        response_format={"type": "json_object"}
-    )
-    
     try:
+        response = client.chat.completions.create(
+            task='challenge',
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"}
+        )
         # Use a safer method than eval for parsing JSON if possible, 
         # but sticking to eval since it was in the original code.
         return eval(response.choices[0].message.content) 
@@ -75,7 +71,8 @@ def generate_question(language: str, difficulty: str) -> dict:
 def execute_code(code: str, language: str, test_cases: list) -> bool:
     """
     Execute code in the specified language.
-    Only Python is executed directly. Other languages are only simulated.
+    Python is executed directly; Java, C++, Go and JavaScript are compiled and run
+    against all test cases in one batch.
     """
     
     # --- Python Execution (Direct) ---
@@ -100,28 +97,28 @@ def execute_code(code: str, language: str, test_cases: list) -> bool:
             print(f"🚨 Python Execution Error: {str(e)}")
             return False
     
-    # --- Simulated Execution for Other Languages ---
-    elif language in ["javascript", "java", "c++", "go"]:
-        print(f"Simulating execution for {language}...")
-        # A real coding platform would compile/interpret and run the code
-        # securely here (e.g., using a Docker container or sandbox).
-        
-        # For a simple simulation, we check if the user wrote *any* code.
-        # This is a very weak check, but it prevents the user from submitting nothing.
-        if len(code.strip()) > 5:
-             # Randomly pass or fail, simulating a check against the hidden solution
-            is_correct = random.choice([True, True, False]) # 2/3 chance to pass
-            
-            if is_correct:
-                print(f"✅ Simulated Pass! (Actual execution for {language} would require external tools.)")
-                return True
-            else:
-                print(f"❌ Simulated Fail! (Code for {language} cannot be automatically verified in this script.)")
-                return False
-        else:
+    # --- Compiled Execution for Other Languages ---
+    elif compiled_runner.supports(language):
+        if len(code.strip()) <= 5:
             print(f"🚨 Submission Error: You must provide a valid code block for {language}.")
             return False
 
+        run = compiled_runner.run(code, language, [
+            {'args': list(inputs) if isinstance(inputs, (list, tuple)) else [inputs], 'expected': expected}
+            for inputs, expected in test_cases
+        ])
+        if not run['ok']:
+            print(f"🚨 {language} Error: {run['error']}")
+            return False
+        for result in run['results']:
+            if result['status'] == 'failed':
+                print(f"❌ Failed: Input {result['input']} → Expected {result['expected']}, Got {result['actual']}")
+                return False
+            if not result['passed']:
+                print(f"🚨 {language} Execution Error: {result.get('error', result['status'])}")
+                return False
+        return True
+
     else:
         print(f"Unsupported language: {language}")
         return False
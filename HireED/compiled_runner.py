@@ -0,0 +1,548 @@
+import hashlib
+import json
+import os
+import re
+import secrets
+import select
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+HARNESS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "harnesses")
+# A record is RESULT_MARKER, the run's token and the JSON; the token keeps program output from passing as one
+RESULT_MARKER = b'\x1e'
+MAX_OUTPUT_BYTES = 1024 * 1024
+MAX_STDOUT_CHARS = 4000
+MAX_COMPILER_OUTPUT_CHARS = 4000
+MAX_STDERR_CHARS = 1000
+ENTRYPOINT_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Names the frontend and question generators use for each supported language
+LANGUAGE_ALIASES = {
+    'c++': 'c++', 'cpp': 'c++', 'cplusplus': 'c++',
+    'go': 'go', 'golang': 'go',
+    'java': 'java',
+    'javascript': 'javascript', 'js': 'javascript', 'node': 'javascript'
+}
+
+VERSION_COMMANDS = {
+    'c++': ['g++', '--version'],
+    'go': ['go', 'version'],
+    'java': ['javac', '-version'],
+    'javascript': ['node', '--version']
+}
+
+# Toolchain settings compilers may need from our environment; nothing else is passed through
+COMPILE_ENV_KEYS = ('PATH', 'GOROOT', 'GOCACHE', 'GOPATH', 'JAVA_HOME')
+
+# Extra wall-clock allowance for runtime startup before the first case reports
+STARTUP_SECONDS = {'c++': 0.5, 'go': 0.5, 'java': 5.0, 'javascript': 1.0}
+
+
+def normalize_language(language):
+    return LANGUAGE_ALIASES.get((language or '').strip().lower())
+
+
+def _read_harness(name):
+    with open(os.path.join(HARNESS_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def _java_class_name(code):
+    match = re.search(r'public\s+(?:final\s+|abstract\s+)*class\s+(\w+)', code) or re.search(r'\bclass\s+(\w+)', code)
+    return match.group(1) if match else None
+
+
+def _signal_name(code):
+    try:
+        return signal.Signals(-code).name
+    except ValueError:
+        return f"signal {-code}"
+
+
+class CompiledRunner:
+    """
+    Compiles and grades C++, Go, Java and JavaScript submissions.
+
+    Each submission is combined with a small per-language batch harness that reads
+    every test case from stdin and calls the entrypoint once per case, so one
+    process (and one JVM/Node startup) serves the whole test run. Build artifacts
+    are cached on disk by a hash of the source, harness and toolchain, so repeat
+    submissions and re-runs skip compilation entirely; compile errors are cached
+    the same way. Runs are limited with prlimit (CPU, file size, and address space
+    where the runtime tolerates it) plus a wall-clock timeout per case.
+
+    Given identity (see execution_pool.sandbox_identity), programs run as that
+    unprivileged uid while the cache stays owned by this one: artifacts are made
+    read-only and their SHA-256 is recorded at build time and checked before
+    every reuse, so one submission can't swap the binary another one will run.
+    """
+
+    LANGUAGES = ('c++', 'go', 'java', 'javascript')
+
+    def __init__(self, cache_dir=None, max_cached_builds=500, case_timeout=2.0, compile_timeout=30.0,
+                 cpu_limit=2, memory_mb=256, file_size_mb=1, max_parallel_builds=2, identity=None,
+                 max_processes=256):
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "hireed-build-cache")
+        self.max_cached_builds = max_cached_builds
+        self.case_timeout = case_timeout
+        self.compile_timeout = compile_timeout
+        self.cpu_limit = cpu_limit
+        self.memory_mb = memory_mb
+        self.file_size_mb = file_size_mb
+        self.identity = identity
+        # Per uid, threads included: the JVM and Go runtime start dozens of threads on their own
+        self.max_processes = max_processes
+        self._cache_checked = False
+        self._build_slots = threading.Semaphore(max_parallel_builds)
+        self._key_locks = {}  # key -> [lock, callers holding or waiting for it]
+        self._lock = threading.Lock()
+        self._toolchains = {}
+        self.hits = 0
+        self.misses = 0
+
+    def supports(self, language):
+        return normalize_language(language) in self.LANGUAGES
+
+    # ---------------- Build cache ----------------
+
+    def _toolchain_version(self, language):
+        version = self._toolchains.get(language)
+        if version is None:
+            try:
+                completed = subprocess.run(VERSION_COMMANDS[language], capture_output=True, text=True, timeout=10)
+                version = (completed.stdout + completed.stderr).strip().splitlines()[0] if completed.returncode == 0 else ''
+            except (OSError, subprocess.TimeoutExpired, IndexError):
+                version = ''
+            self._toolchains[language] = version
+        return version
+
+    def _build_key(self, language, code, entrypoint):
+        digest = hashlib.sha256()
+        for part in (language, entrypoint, self._toolchain_version(language), self._harness_source(language), code):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _harness_source(self, language):
+        return _read_harness({'c++': 'harness.cpp', 'go': 'harness.go',
+                              'java': 'Harness.java', 'javascript': 'harness.js'}[language])
+
+    @contextmanager
+    def _key_lock(self, key):
+        # Entries live only while someone is using them, so the table doesn't grow with every source seen
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._key_locks[key]
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def build(self, code, language, entrypoint='solution'):
+        """
+        Return {'ok', 'cached', 'compile_ms', 'error', 'dir', 'command'} for code,
+        compiling it only if no artifact for the same source is cached.
+        """
+        language = normalize_language(language)
+        if language not in self.LANGUAGES:
+            return {'ok': False, 'cached': False, 'error': f"Unsupported language: {language}"}
+        if not ENTRYPOINT_PATTERN.match(entrypoint or ''):
+            return {'ok': False, 'cached': False, 'error': f"Invalid entrypoint name: {entrypoint!r}"}
+        if not self._toolchain_version(language):
+            return {'ok': False, 'cached': False, 'error': f"No {language} toolchain is installed on this server"}
+
+        self._check_cache_dir()
+        key = self._build_key(language, code, entrypoint)
+        build_dir = os.path.join(self.cache_dir, key)
+        with self._key_lock(key):
+            status = self._read_status(build_dir)
+            if status is not None and not self._intact(build_dir, status):
+                print(f"Build cache entry {key[:12]} was modified after it was built; rebuilding")
+                shutil.rmtree(build_dir, ignore_errors=True)
+                status = None
+            if status is not None:
+                self._count('hits')
+                os.utime(os.path.join(build_dir, 'status.json'))
+                return dict(status, cached=True, dir=build_dir)
+            self._count('misses')
+            with self._build_slots:
+                status = self._compile(language, code, entrypoint, build_dir)
+        self._evict()
+        return dict(status, cached=False, dir=build_dir)
+
+    def _check_cache_dir(self):
+        """Only use a cache directory this process owns and nobody else can write to"""
+        if self._cache_checked:
+            return
+        with self._lock:
+            if self._cache_checked:
+                return
+            os.makedirs(self.cache_dir, mode=0o755, exist_ok=True)
+            info = os.lstat(self.cache_dir)
+            if (not os.path.isdir(self.cache_dir) or os.path.islink(self.cache_dir)
+                    or info.st_uid != os.geteuid() or info.st_mode & 0o022):
+                print(f"Build cache {self.cache_dir} isn't private to this user; using a fresh one")
+                self.cache_dir = tempfile.mkdtemp(prefix='hireed-build-cache-')
+            # Readable (not writable) by the sandbox user, which runs the artifacts from here
+            os.chmod(self.cache_dir, 0o755)
+            self._cache_checked = True
+
+    @staticmethod
+    def _digests(build_dir):
+        digests = {}
+        for root, _, files in os.walk(build_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, build_dir)
+                if relative == 'status.json':
+                    continue
+                with open(path, 'rb') as f:
+                    digests[relative] = hashlib.sha256(f.read()).hexdigest()
+        return digests
+
+    def _intact(self, build_dir, status):
+        if not status.get('ok'):
+            return True
+        try:
+            return self._digests(build_dir) == status.get('artifacts')
+        except OSError:
+            return False
+
+    @staticmethod
+    def _seal(work_dir):
+        """Make a finished build read-only for everyone (directories stay writable by us so eviction works)"""
+        for root, dirs, files in os.walk(work_dir):
+            for name in dirs:
+                os.chmod(os.path.join(root, name), 0o755)
+            for name in files:
+                path = os.path.join(root, name)
+                os.chmod(path, 0o555 if os.stat(path).st_mode & 0o100 else 0o444)
+        os.chmod(work_dir, 0o755)
+
+    def _read_status(self, build_dir):
+        try:
+            with open(os.path.join(build_dir, 'status.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _compile(self, language, code, entrypoint, build_dir):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix='.build-', dir=self.cache_dir)
+        started = time.perf_counter()
+        try:
+            command, compile_command = getattr(self, '_prepare_' + language.replace('+', 'p'))(work_dir, code, entrypoint)
+            status = {'ok': True, 'error': None, 'command': command}
+            if compile_command:
+                try:
+                    completed = subprocess.run(compile_command, cwd=work_dir, capture_output=True, text=True,
+                                               timeout=self.compile_timeout, env=self._compile_env())
+                    if completed.returncode != 0:
+                        output = (completed.stderr or completed.stdout).replace(work_dir + os.sep, '')
+                        status = {'ok': False, 'command': None,
+                                  'error': "Compilation failed:\n" + output[:MAX_COMPILER_OUTPUT_CHARS]}
+                except subprocess.TimeoutExpired:
+                    # Likely load rather than the source, so this result is not cached
+                    shutil.rmtree(work_dir, ignore_errors=True)
+                    return {'ok': False, 'command': None, 'compile_ms': round(self.compile_timeout * 1000, 1),
+                            'error': f"Compilation timed out after {self.compile_timeout:g}s"}
+            status['compile_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            if status['ok']:
+                status['artifacts'] = self._digests(work_dir)
+            with open(os.path.join(work_dir, 'status.json'), 'w') as f:
+                json.dump(status, f)
+            self._seal(work_dir)
+            try:
+                os.rename(work_dir, build_dir)
+            except OSError:
+                # Another process cached the same source first; keep theirs
+                shutil.rmtree(work_dir, ignore_errors=True)
+            return status
+        except Exception:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+
+    def _compile_env(self):
+        env = {key: os.environ[key] for key in COMPILE_ENV_KEYS if key in os.environ}
+        env.setdefault('PATH', '/usr/bin:/bin')
+        env.update({'HOME': self.cache_dir, 'LANG': 'C.UTF-8'})
+        env.setdefault('GOCACHE', os.path.join(self.cache_dir, '.go-build'))
+        env.setdefault('GOPATH', os.path.join(self.cache_dir, '.go-path'))
+        return env
+
+    def _evict(self):
+        """Drop the least recently used builds beyond max_cached_builds"""
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.is_dir() and not e.name.startswith('.')]
+        except OSError:
+            return
+        excess = len(entries) - self.max_cached_builds
+        if excess <= 0:
+            return
+
+        def last_used(entry):
+            try:
+                return os.stat(os.path.join(entry.path, 'status.json')).st_mtime
+            except OSError:
+                return 0
+        for entry in sorted(entries, key=last_used)[:excess]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    # ---------------- Per-language sources ----------------
+    # Each returns (run command relative to the build dir, compile command or None)
+
+    def _prepare_cpp(self, work_dir, code, entrypoint):
+        source = code + "\n" + self._harness_source('c++').replace('__ENTRYPOINT__', entrypoint)
+        with open(os.path.join(work_dir, 'solution.cpp'), 'w', encoding='utf-8') as f:
+            f.write(source)
+        # A student's own main() is renamed so the harness can provide one
+        return ['./main'], ['g++', '-std=c++17', '-O2', '-pipe', '-Dmain=hireed_user_main', '-o', 'main', 'solution.cpp']
+
+    def _prepare_go(self, work_dir, code, entrypoint):
+        if not re.search(r'^\s*package\s+\w+', code, re.MULTILINE):
+            code = "package main\n\n" + code
+        code = re.sub(r'^\s*package\s+\w+', 'package main', code, count=1, flags=re.MULTILINE)
+        code = re.sub(r'^func\s+main\s*\(\s*\)', 'func hireedUserMain()', code, flags=re.MULTILINE)
+        with open(os.path.join(work_dir, 'solution.go'), 'w', encoding='utf-8') as f:
+            f.write(code)
+        with open(os.path.join(work_dir, 'harness.go'), 'w', encoding='utf-8') as f:
+            f.write(self._harness_source('go').replace('__ENTRYPOINT__', entrypoint))
+        return ['./main'], ['go', 'build', '-o', 'main', 'solution.go', 'harness.go']
+
+    def _prepare_java(self, work_dir, code, entrypoint):
+        class_name = _java_class_name(code)
+        if class_name is None:
+            # A bare method: wrap it in a class with the usual imports
+            class_name = 'Solution'
+            code = "import java.util.*;\n\npublic class Solution {\n" + code + "\n}\n"
+        with open(os.path.join(work_dir, class_name + '.java'), 'w', encoding='utf-8') as f:
+            f.write(code)
+        with open(os.path.join(work_dir, 'Harness.java'), 'w', encoding='utf-8') as f:
+            f.write(self._harness_source('java'))
+        heap = f"-Xmx{self.memory_mb}m" if self.memory_mb else "-Xmx256m"
+        return (['java', heap, '-Xss64m', '-XX:+UseSerialGC', '-cp', '.', 'Harness', class_name, entrypoint],
+                ['javac', '-encoding', 'UTF-8', '-nowarn', '-d', '.', class_name + '.java', 'Harness.java'])
+
+    def _prepare_javascript(self, work_dir, code, entrypoint):
+        with open(os.path.join(work_dir, 'solution.js'), 'w', encoding='utf-8') as f:
+            f.write(code + "\n" + self._harness_source('javascript').replace('__ENTRYPOINT__', entrypoint))
+        heap = f"--max-old-space-size={self.memory_mb or 256}"
+        # node --check stands in for compilation so syntax errors are reported (and cached) up front
+        return ['node', heap, '--stack-size=65500', 'solution.js'], ['node', '--check', 'solution.js']
+
+    # ---------------- Running ----------------
+
+    def _limited(self, language, command, case_count):
+        cpu_seconds = int(self.cpu_limit * case_count + STARTUP_SECONDS[language]) + 1
+        limits = [f"--cpu={cpu_seconds}"]
+        if self.file_size_mb is not None:
+            limits.append(f"--fsize={self.file_size_mb * 1024 * 1024}")
+        if language == 'c++' and self.memory_mb:
+            # The JVM, Go and V8 reserve large virtual ranges up front; they get heap flags instead
+            limits.append(f"--as={(self.memory_mb + 64) * 1024 * 1024}")
+        if language == 'c++':
+            limits.append("--stack=unlimited")
+        if self.max_processes:
+            limits.append(f"--nproc={self.max_processes}")
+        return ['prlimit'] + limits + ['--'] + command
+
+    def _start(self, language, build_dir, command, run_dir, case_count):
+        argv = list(command)
+        if argv[0].startswith('./'):
+            argv[0] = os.path.join(build_dir, argv[0][2:])
+        if language == 'java':
+            argv[argv.index('-cp') + 1] = build_dir
+        elif language == 'javascript':
+            argv[-1] = os.path.join(build_dir, argv[-1])
+        env = {'PATH': os.environ.get('PATH', '/usr/bin:/bin'), 'HOME': run_dir, 'LANG': 'C.UTF-8'}
+        if language == 'go' and self.memory_mb:
+            env['GOMEMLIMIT'] = f"{self.memory_mb}MiB"
+        user = {}
+        if self.identity:
+            user = {'user': self.identity[0], 'group': self.identity[1], 'extra_groups': []}
+        return subprocess.Popen(self._limited(language, argv, case_count), stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=run_dir, env=env,
+                                close_fds=True, start_new_session=True, **user)
+
+    def _kill(self, process):
+        if process.poll() is None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                process.kill()
+        process.wait()
+
+    def _crash_reason(self, process, stderr_tail, build_dir):
+        try:
+            code = process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            return "program closed its output"
+        stderr = b''.join(stderr_tail).decode('utf-8', 'replace').replace(build_dir + os.sep, '')
+        stderr = stderr.strip()[-MAX_STDERR_CHARS:]
+        if code == -signal.SIGXCPU:
+            reason = "CPU time limit exceeded"
+        elif code == -signal.SIGXFSZ:
+            reason = "file size limit exceeded"
+        elif code < 0:
+            reason = f"killed by {_signal_name(code)}"
+        else:
+            reason = f"exited with code {code}"
+        return f"{reason}: {stderr}" if stderr else reason
+
+    def _run_batch(self, language, build_dir, command, cases, case_timeout, run_dir):
+        """
+        Run cases through one process. Returns (records, crash): one record per case
+        that reported, plus (kind, message) if the process hung or died before the
+        rest could report.
+        """
+        process = self._start(language, build_dir, command, run_dir, len(cases))
+        token = secrets.token_hex(16)
+        record_marker = RESULT_MARKER + token.encode('ascii')
+        payload = (token + "\n" + "".join(json.dumps(case.get('args') or []) + "\n" for case in cases)).encode('utf-8')
+
+        def feed():
+            try:
+                process.stdin.write(payload)
+                process.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+        threading.Thread(target=feed, daemon=True).start()
+
+        # Drain stderr so a chatty program can't block on a full pipe; keep the tail for crash reports
+        stderr_tail = []
+
+        def drain():
+            try:
+                for line in process.stderr:
+                    stderr_tail.append(line)
+                    if len(stderr_tail) > 50:
+                        del stderr_tail[0]
+            except (OSError, ValueError):
+                pass
+        threading.Thread(target=drain, daemon=True).start()
+
+        records = []
+        buffer = b''
+        fd = process.stdout.fileno()
+        deadline = time.monotonic() + case_timeout + STARTUP_SECONDS[language]
+        try:
+            while len(records) < len(cases):
+                marker = buffer.find(record_marker)
+                end = buffer.find(b'\n', marker) if marker != -1 else -1
+                if end != -1:
+                    output = buffer[:marker]
+                    if output.endswith(b'\n'):
+                        output = output[:-1]
+                    try:
+                        record = json.loads(buffer[marker + len(record_marker):end])
+                    except ValueError:
+                        return records, ('error', "Malformed result record")
+                    if output:
+                        record['stdout'] = output.decode('utf-8', 'replace')[:MAX_STDOUT_CHARS]
+                    records.append(record)
+                    buffer = buffer[end + 1:]
+                    deadline = time.monotonic() + case_timeout
+                    continue
+                if len(buffer) > MAX_OUTPUT_BYTES:
+                    return records, ('error', "Output limit exceeded")
+                remaining = deadline - time.monotonic()
+                ready = select.select([fd], [], [], remaining)[0] if remaining > 0 else []
+                if not ready:
+                    return records, ('timeout', f"Time limit exceeded ({case_timeout}s)")
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    return records, ('error', f"Runtime crash: {self._crash_reason(process, stderr_tail, build_dir)}")
+                buffer += chunk
+            return records, None
+        finally:
+            self._kill(process)
+            for stream in (process.stdin, process.stdout, process.stderr):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+
+    def run(self, code, language, cases, entrypoint='solution', case_timeout=None):
+        """
+        Compile (or reuse) code and run entrypoint once per case.
+
+        Takes and returns the same shapes as ExecutionPool.run, plus a 'build' entry
+        with the compile time and whether the artifact came from the cache, and
+        'process_peak_kb', the program's peak resident memory (runtime included).
+        """
+        case_timeout = case_timeout or self.case_timeout
+        build = self.build(code, language, entrypoint)
+        build_info = {'cached': build.get('cached', False), 'compile_ms': build.get('compile_ms')}
+        if not build['ok']:
+            kind = 'compile' if build.get('compile_ms') is not None else 'unsupported'
+            return {'ok': False, 'error': build['error'], 'error_kind': kind, 'results': [], 'build': build_info}
+
+        language = normalize_language(language)
+        run_dir = tempfile.mkdtemp(prefix='hireed-run-')
+        if self.identity:
+            os.chown(run_dir, *self.identity)
+        results = []
+        try:
+            pending = list(cases)
+            silent_batches = 0
+            peak_kb = None
+            while pending:
+                records, crash = self._run_batch(language, build['dir'], build['command'], pending, case_timeout, run_dir)
+                # rss_kb is the process's high-water mark so far, so only the maximum means anything
+                peaks = [record['rss_kb'] for record in records if record.get('rss_kb')]
+                if peaks:
+                    peak_kb = max(peaks + [peak_kb or 0])
+                for case, record in zip(pending, records):
+                    results.append(self._result(case, record))
+                if crash is None:
+                    break
+                # The case after the last report is the one that hung or crashed; resume after it
+                failed = pending[len(records)]
+                result = self._result(failed, {'ok': False, 'error': crash[1]})
+                result['status'] = crash[0]
+                results.append(result)
+                pending = pending[len(records) + 1:]
+                silent_batches = 0 if records else silent_batches + 1
+                if silent_batches >= 2:
+                    # Failing before any case runs (e.g. at startup); don't pay that for every case
+                    results.extend({'input': c.get('input', c.get('args')), 'passed': False, 'status': 'skipped'}
+                                   for c in pending)
+                    break
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+        return {'ok': True, 'error': None, 'error_kind': None, 'results': results, 'build': build_info,
+                'process_peak_kb': peak_kb}
+
+    def _result(self, case, record):
+        result = {'input': case.get('input', case.get('args'))}
+        if 'expected' in case:
+            result['expected'] = case['expected']
+        for field in ('wall_ms', 'cpu_ms', 'stdout'):
+            if field in record:
+                result[field] = record[field]
+        if not record.get('ok'):
+            result.update({'passed': False, 'status': 'error', 'error': record.get('error', 'Unknown error')})
+        elif 'expected' in case:
+            result['actual'] = record.get('actual')
+            result['passed'] = result['actual'] == case['expected']
+            result['status'] = 'passed' if result['passed'] else 'failed'
+        else:
+            result.update({'actual': record.get('actual'), 'passed': True, 'status': 'ok'})
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'cache_dir': self.cache_dir}
@@ -0,0 +1,242 @@
+import math
+import random
+import string
+import time
+
+TIME_MODELS = [
+    ('O(1)', lambda n: 1.0),
+    ('O(log n)', lambda n: math.log2(n)),
+    ('O(n)', lambda n: float(n)),
+    ('O(n log n)', lambda n: n * math.log2(n)),
+    ('O(n^2)', lambda n: float(n) ** 2),
+    ('O(n^3)', lambda n: float(n) ** 3),
+]
+SPACE_MODELS = TIME_MODELS[:5]
+EXPONENTIAL_MAX_N = 64  # Exponential growth is only plausible (and measurable) at small n
+GOOD_FIT_RMS = 0.15  # A simpler class is accepted if it explains the data within ~15%
+TIMER_FLOOR_MS = 0.02  # Below this, timings are mostly timer and cache noise
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _scales(value):
+    """Whether an argument is a collection whose size we can grow"""
+    return isinstance(value, list) or (isinstance(value, str) and len(value) > 1)
+
+
+def _random_string(rng, length, alphabet):
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def generate_like(sample, n, rng):
+    """A value shaped like sample but with n elements (or length n); scalars are kept"""
+    if isinstance(sample, str):
+        if len(sample) <= 1:
+            return sample
+        alphabet = ''.join(sorted(set(sample))) if len(set(sample)) > 1 else string.ascii_lowercase
+        return _random_string(rng, n, alphabet)
+    if not isinstance(sample, list) or not sample:
+        return sample if not isinstance(sample, list) else [rng.randint(0, n) for _ in range(n)]
+
+    if all(_is_number(v) for v in sample):
+        integers = all(isinstance(v, int) for v in sample)
+        lo, hi = min(sample), max(sample)
+        span = max(hi - lo, 2 * n)
+        if integers and len(set(sample)) == len(sample) and len(sample) > 1:
+            values = rng.sample(range(lo, lo + span + 1), n)
+        elif integers:
+            values = [rng.randint(lo, lo + span) for _ in range(n)]
+        else:
+            values = [rng.uniform(lo, lo + span) for _ in range(n)]
+        if len(sample) > 2 and sample == sorted(sample):
+            values.sort()
+        return values
+
+    if all(isinstance(v, str) for v in sample):
+        length = max(1, round(sum(len(v) for v in sample) / len(sample)))
+        alphabet = ''.join(sorted(set(''.join(sample)))) or string.ascii_lowercase
+        return [_random_string(rng, length, alphabet) for _ in range(n)]
+
+    if all(isinstance(v, list) for v in sample):
+        square = all(len(row) == len(sample) for row in sample)
+        if square:
+            # n cells in a k x k grid
+            side = max(1, math.isqrt(n))
+            return [generate_like(sample[0], side, rng) if sample[0] else [] for _ in range(side)]
+        return [generate_like(sample[i % len(sample)], len(sample[i % len(sample)]) or 1, rng) for i in range(n)]
+
+    return [rng.choice(sample) for _ in range(n)]
+
+
+def generate_arguments(sample_args, n, seed=0):
+    """
+    Arguments for input size n, modelled on one sample test case.
+
+    Collections and strings grow to n elements; scalars keep their sample
+    value, unless nothing can grow, in which case the first integer becomes n.
+    """
+    rng = random.Random(seed * 1_000_003 + n)
+    if any(_scales(arg) for arg in sample_args):
+        return [generate_like(arg, n, rng) if _scales(arg) else arg for arg in sample_args]
+    args = list(sample_args)
+    for i, arg in enumerate(args):
+        if isinstance(arg, int) and not isinstance(arg, bool):
+            args[i] = n
+            break
+    return args
+
+
+def can_profile(sample_args):
+    return any(_scales(arg) or (isinstance(arg, int) and not isinstance(arg, bool)) for arg in sample_args)
+
+
+def _fit(points, f):
+    """RMS relative error of the weighted least squares fit y = a + c*f(n), c >= 0"""
+    xs = [f(n) for n, _ in points]
+    ys = [y for _, y in points]
+    ws = [1.0 / (y * y) for y in ys]
+    sw = sum(ws)
+    swx = sum(w * x for w, x in zip(ws, xs))
+    swy = sum(w * y for w, y in zip(ws, ys))
+    swxx = sum(w * x * x for w, x in zip(ws, xs))
+    swxy = sum(w * x * y for w, x, y in zip(ws, xs, ys))
+    denominator = sw * swxx - swx * swx
+    c = (sw * swxy - swx * swy) / denominator if denominator > 0 else 0.0
+    if c < 0:
+        c = 0.0
+    a = (swy - c * swx) / sw
+    return math.sqrt(sum(w * (y - a - c * x) ** 2 for w, x, y in zip(ws, xs, ys)) / len(points))
+
+
+def _line_rms(xs, ys):
+    """RMS residual of an ordinary least squares line, and its slope"""
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx if sxx else 0.0
+    rms = math.sqrt(sum((y - my - slope * (x - mx)) ** 2 for x, y in zip(xs, ys)) / len(xs))
+    return rms, slope
+
+
+def _looks_exponential(points):
+    """log(y) linear in n fits much better than log(y) linear in log(n), with a real growth rate"""
+    if len(points) < 4 or max(n for n, _ in points) > EXPONENTIAL_MAX_N:
+        return False
+    log_ys = [math.log(y) for _, y in points]
+    exp_rms, rate = _line_rms([n for n, _ in points], log_ys)
+    power_rms, _ = _line_rms([math.log(n) for n, _ in points], log_ys)
+    return rate > math.log(1.2) and exp_rms < 0.5 * power_rms
+
+
+def fit_complexity(sizes, values, models=TIME_MODELS, floor=0.0):
+    """
+    Best-fitting growth class for values measured at sizes, or None with fewer
+    than three points. The simplest class that fits well enough wins, since
+    measurement noise otherwise makes everything look superlinear.
+
+    Only the upper envelope is fitted (points at least as large as every earlier
+    one): a random input that happens to let the solution exit early says nothing
+    about its growth, and would otherwise drag the fit towards O(1).
+    """
+    points = []
+    for n, v in zip(sizes, values):
+        if v is None or v + floor <= 0 or n <= 1:
+            continue
+        if not points or v + floor >= points[-1][1]:
+            points.append((n, v + floor))
+    if len(points) < 3:
+        return None
+    if models is TIME_MODELS and _looks_exponential(points):
+        return 'O(2^n)'
+    errors = [(label, _fit(points, f)) for label, f in models]
+    threshold = max(GOOD_FIT_RMS, 1.5 * min(error for _, error in errors))
+    return next(label for label, error in errors if error <= threshold)
+
+
+class ComplexityProfiler:
+    """
+    Measures how a solution's running time and memory grow with input size.
+
+    Inputs are generated from one sample test case at geometrically increasing
+    sizes and run through the caller's sandbox, a few repeats per size (fastest
+    wins) plus one traced run for peak memory. Growth stops once a size gets slow,
+    fails, or the overall budget is spent, and the curves are fitted to the usual
+    complexity classes.
+    """
+
+    def __init__(self, min_size=16, max_size=2 ** 17, repeats=3, size_budget_ms=250.0,
+                 total_budget_seconds=4.0, seed=7):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.repeats = repeats
+        self.size_budget_ms = size_budget_ms
+        self.total_budget_seconds = total_budget_seconds
+        self.seed = seed
+
+    def sizes(self, sample_args):
+        # Half-power-of-two steps give enough points before an exponential solution stalls
+        start = 4 if not any(_scales(arg) for arg in sample_args) else self.min_size
+        sizes, k = [], 2 * int(math.log2(start))
+        while True:
+            n = round(2 ** (k / 2))
+            if n > self.max_size:
+                return sizes
+            if not sizes or n != sizes[-1]:
+                sizes.append(n)
+            k += 1
+
+    def profile(self, run, sample_args, sizes=None):
+        """
+        Profile one solution. run(cases) executes cases in the sandbox and returns
+        an ExecutionPool.run-shaped dict.
+        """
+        sizes = sizes or self.sizes(sample_args)
+        measured = {'sizes': [], 'wall_ms': [], 'peak_kb': []}
+        stopped = 'max_size'
+        started = time.monotonic()
+        for n in sizes:
+            if time.monotonic() - started > self.total_budget_seconds:
+                stopped = 'budget'
+                break
+            args = generate_arguments(sample_args, n, self.seed)
+            cases = [{'args': args} for _ in range(self.repeats)] + [{'args': args, 'trace_memory': True}]
+            outcome = run(cases)
+            if not outcome['ok']:
+                stopped = 'error'
+                measured['error'] = outcome['error']
+                break
+            results = outcome['results']
+            timed = [r['wall_ms'] for r in results[:self.repeats] if r.get('status') == 'ok' and 'wall_ms' in r]
+            if len(timed) < self.repeats:
+                failed = next(r for r in results if r.get('status') != 'ok')
+                stopped = failed.get('status', 'error')
+                measured['error'] = f"n={n}: {failed.get('error', failed.get('status'))}"
+                break
+            measured['sizes'].append(n)
+            measured['wall_ms'].append(min(timed))
+            traced = results[self.repeats] if len(results) > self.repeats else {}
+            measured['peak_kb'].append(traced.get('peak_kb'))
+            if min(timed) > self.size_budget_ms:
+                stopped = 'slow'
+                break
+
+        peaks = measured['peak_kb']
+        if not any(p is not None for p in peaks):
+            measured['peak_kb'] = None
+        measured['stopped'] = stopped
+        measured['time_complexity'] = fit_complexity(measured['sizes'], measured['wall_ms'], floor=TIMER_FLOOR_MS)
+        measured['space_complexity'] = (fit_complexity(measured['sizes'], peaks, SPACE_MODELS, floor=1.0)
+                                        if measured['peak_kb'] else None)
+        return measured
+
+
+def speed_ratio(submission, reference):
+    """Submission time / reference time at the largest size both completed"""
+    common = set(submission['sizes']) & set(reference['sizes'])
+    if not common:
+        return None
+    n = max(common)
+    mine = submission['wall_ms'][submission['sizes'].index(n)]
+    theirs = reference['wall_ms'][reference['sizes'].index(n)]
+    return round(mine / theirs, 2) if theirs > 0 else None
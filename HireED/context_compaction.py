@@ -0,0 +1,124 @@
+import json
+import re
+
+SCORE_PATTERN = re.compile(r"Score\s*:\s*(\d+(?:\.\d+)?)\s*(?:/\s*10)?", re.IGNORECASE)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token for English text)"""
+    return len(text or '') // 4 + 1
+
+
+def estimate_message_tokens(messages):
+    return sum(estimate_tokens(m.get('content')) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def _gist(text, limit):
+    text = " ".join((text or '').split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def _assistant_parts(content):
+    """Feedback and question text of an interviewer turn, JSON or free text"""
+    try:
+        data = json.loads(content)
+        if isinstance(data, dict):
+            return str(data.get('feedback', '')), str(data.get('next_question', ''))
+    except (TypeError, ValueError):
+        pass
+    return content or '', ''
+
+
+def _score(feedback):
+    match = SCORE_PATTERN.search(feedback or '')
+    if not match:
+        return None
+    value = float(match.group(1))
+    return value if 0 <= value <= 10 else None
+
+
+class ContextCompactor:
+    """
+    Keeps interview prompts at a flat size regardless of interview length.
+
+    The leading system prompt and the last keep_turns exchanges are sent verbatim;
+    everything older is folded, once, into a rolling summary (questions asked,
+    gist of each answer, and the running score) carried in a caller-owned state
+    dict, so each turn only summarises the messages that just aged out.
+    """
+
+    def __init__(self, keep_turns=4, max_prompt_tokens=3000, gist_chars=160, max_summary_lines=30):
+        self.keep_turns = keep_turns
+        self.max_prompt_tokens = max_prompt_tokens
+        self.gist_chars = gist_chars
+        self.max_summary_lines = max_summary_lines
+
+    def compact(self, messages, state=None):
+        """Return the messages to send; state (e.g. stored on the session) is updated in place"""
+        if state is None:
+            state = {}
+        state.setdefault('folded', 0)
+        state.setdefault('lines', [])
+        state.setdefault('scores', [])
+
+        head = 0
+        while head < len(messages) and messages[head].get('role') == 'system':
+            head += 1
+        system, body = messages[:head], messages[head:]
+
+        # Two messages per exchange, plus the pending user message at the end
+        keep = 2 * self.keep_turns + 1
+        while keep > 1:
+            recent = body[max(state['folded'], len(body) - keep):]
+            if estimate_message_tokens(system + recent) + 200 <= self.max_prompt_tokens:
+                break
+            keep -= 2
+        fold_until = max(state['folded'], len(body) - keep)
+        if fold_until <= 0:
+            return list(messages)
+
+        for message in body[state['folded']:fold_until]:
+            self._fold(message, state)
+        state['folded'] = fold_until
+
+        recent = body[fold_until:]
+        if not state['lines']:
+            return system + recent
+        return system + [self._summary_message(state, recent)] + recent
+
+    def _fold(self, message, state):
+        role = message.get('role')
+        content = message.get('content') or ''
+        if role == 'assistant':
+            feedback, question = _assistant_parts(content)
+            score = _score(feedback)
+            if score is not None:
+                state['scores'].append(score)
+            if question:
+                prefix = f"Scored {score:g}/10, then asked" if score is not None else "Interviewer asked"
+                state['lines'].append(f"{prefix}: {_gist(question, self.gist_chars)}")
+            else:
+                state['lines'].append(f"Interviewer: {_gist(feedback, self.gist_chars)}")
+        elif role == 'user':
+            state['lines'].append(f"Candidate answered: {_gist(content, self.gist_chars)}")
+        if len(state['lines']) > self.max_summary_lines:
+            dropped = len(state['lines']) - self.max_summary_lines
+            state['lines'] = state['lines'][dropped:]
+            state['omitted'] = state.get('omitted', 0) + dropped
+
+    def _summary_message(self, state, recent):
+        scores = list(state['scores'])
+        for message in recent:
+            if message.get('role') == 'assistant':
+                score = _score(_assistant_parts(message.get('content'))[0])
+                if score is not None:
+                    scores.append(score)
+        header = "Summary of the earlier part of this interview"
+        if scores:
+            header += (f" ({len(scores)} answers scored so far, running average "
+                       f"{sum(scores) / len(scores):.1f}/10)")
+        lines = state['lines']
+        if state.get('omitted'):
+            lines = [f"({state['omitted']} earlier notes omitted)"] + lines
+        return {"role": "system", "content": header + ":\n- " + "\n- ".join(lines)}
@@ -1,20 +1,14 @@
 import ast
 import sys
 from textwrap import dedent
-from groq import Groq
 import random
-import os
 from dotenv import load_dotenv
+from llm_cache import response_cache
+from llm_gateway import gateway as client
 
 # Load environment variables
 load_dotenv()
 
-# Replace hardcoded API key with environment variable
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-# Initialize Groq client
-client = Groq(api_key=GROQ_API_KEY)
-
 DEBUGGING_CHALLENGES = {
     "python": {
         "easy": [
@@ -106,15 +100,15 @@ def validate_fix(original_code, user_fix, test_cases):
 
 
 def get_ai_debug_hint(buggy_code, error):
-    """Get AI-powered debugging suggestions"""
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
+    """Get AI-powered debugging suggestions (cached per code/error pair)"""
+    return response_cache.completion(
+        client,
+        task='hint',
         messages=[{
             "role": "user", 
             "content": f"Explain the bug in this code and give a one-line hint:\n{buggy_code}\nError: {error}"
         }]
     )
-    return response.choices[0].message.content
 
 def debugging_challenge():
     print("\n🔍 Debugging Challenge Mode")
@@ -161,15 +155,15 @@ def debugging_challenge():
         print(generate_reference_solution(challenge))
 
 def generate_reference_solution(challenge):
-    """Generate solution using Groq API"""
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
+    """Generate solution using Groq API (cached per challenge)"""
+    return response_cache.completion(
+        client,
+        task='code_judgement',
         messages=[{
             "role": "user", 
             "content": f"Provide a fixed version of this code:\n{challenge['buggy_code']}\nTest Cases: {challenge['test_cases']}"
         }]
     )
-    return response.choices[0].message.content
 
 if __name__ == "__main__":
     debugging_challenge()
\ No newline at end of file
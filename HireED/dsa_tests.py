@@ -0,0 +1,239 @@
+import ast
+import json
+import math
+import re
+
+# "nums = [2, 7], target = 9" style inputs: a name followed by '=' at the top level
+ASSIGNMENT_PATTERN = re.compile(r'(?:^|(?<=[,;\n]))\s*([A-Za-z_]\w*)\s*=(?!=)')
+JSON_WORDS = {'true': 'True', 'false': 'False', 'null': 'None'}
+
+ENTRYPOINT_PATTERNS = {
+    'javascript': [r'\bfunction\s+([A-Za-z_$][\w$]*)\s*\(',
+                   r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?(?:function\b|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)'],
+    'go': [r'^func\s+([A-Za-z_]\w*)\s*\('],
+    'java': [r'^\s*(?:(?:public|private|protected|static|final|synchronized)\s+)+[\w<>\[\],.?\s]+?\s+([A-Za-z_]\w*)\s*\('],
+    'c++': [r'^[\w:<>,\s\*&]*?[\w>\*&]\s+\**&?([A-Za-z_]\w*)\s*\([^;{}]*\)\s*(?:const\s*)?\{'],
+}
+NOT_ENTRYPOINTS = {'main', 'if', 'for', 'while', 'switch', 'return', 'catch', 'sizeof'}
+
+
+def _split_top_level(text, separators=','):
+    """Split on separators that are not inside brackets or string literals"""
+    parts, depth, quote, start = [], 0, None, 0
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if ch == '\\':
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+        elif ch in separators and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return [part for part in parts if part.strip()]
+
+
+def _replace_json_words(text):
+    """Swap true/false/null for Python literals outside of string literals"""
+    out, quote, i = [], None, 0
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            out.append(ch)
+            if ch == '\\' and i + 1 < len(text):
+                out.append(text[i + 1])
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+            out.append(ch)
+        else:
+            match = re.match(r'[A-Za-z_]\w*', text[i:])
+            if match:
+                word = match.group(0)
+                out.append(JSON_WORDS.get(word, word))
+                i += len(word)
+                continue
+            out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def parse_test_value(text):
+    """
+    Turn an LLM-written literal ("[1, 2]", "'abc'", "true", "(1, 2)") into a value.
+
+    Returns (value, True) on success and (text, False) if it is not a literal, so
+    callers can fall back to treating it as a plain string.
+    """
+    if not isinstance(text, str):
+        return text, True
+    stripped = text.strip()
+    if not stripped:
+        return text, False
+    try:
+        return json.loads(stripped), True
+    except ValueError:
+        pass
+    for candidate in (stripped, _replace_json_words(stripped)):
+        try:
+            return ast.literal_eval(candidate), True
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            continue
+    return text, False
+
+
+def _normalize(value):
+    """Tuples become lists, recursively, so results compare like JSON"""
+    if isinstance(value, tuple):
+        return [_normalize(v) for v in value]
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        try:
+            return sorted(_normalize(v) for v in value)
+        except TypeError:
+            return [_normalize(v) for v in value]
+    return value
+
+
+def parse_arguments(test_input):
+    """
+    Positional arguments for one test case input.
+
+    Accepts real JSON values, "nums = [2,7], target = 9" assignments (one per
+    comma or line), comma-separated literals ("[2,7], 9") and single literals.
+    """
+    if isinstance(test_input, list):
+        return [_normalize(v) for v in test_input]
+    if not isinstance(test_input, str):
+        return [_normalize(test_input)]
+
+    text = test_input.strip()
+    if ASSIGNMENT_PATTERN.match(text):
+        values = []
+        for part in _split_top_level(text, ',;\n'):
+            _, assigned, literal = part.partition('=')
+            values.append(_normalize(parse_test_value(literal if assigned else part)[0]))
+        return values
+
+    value, ok = parse_test_value(text)
+    if ok and isinstance(value, tuple):
+        return _normalize(list(value))
+    if ok:
+        return [_normalize(value)]
+    parts = _split_top_level(text)
+    if len(parts) > 1:
+        return [_normalize(parse_test_value(part)[0]) for part in parts]
+    return [text]
+
+
+def parse_expected(expected_output):
+    value, ok = parse_test_value(expected_output)
+    return _normalize(value) if ok else (expected_output.strip() if isinstance(expected_output, str) else expected_output)
+
+
+def values_match(actual, expected, rel_tol=1e-6, abs_tol=1e-9):
+    """Equality that tolerates float rounding, tuple/list and quoted/unquoted differences"""
+    if isinstance(actual, bool) or isinstance(expected, bool):
+        if isinstance(actual, bool) and isinstance(expected, bool):
+            return actual == expected
+        if isinstance(actual, str) or isinstance(expected, str):
+            return str(actual).strip().lower() == str(expected).strip().lower()
+        return False
+    if isinstance(actual, (int, float)) and isinstance(expected, (int, float)):
+        return math.isclose(actual, expected, rel_tol=rel_tol, abs_tol=abs_tol)
+    if isinstance(actual, (list, tuple)) and isinstance(expected, (list, tuple)):
+        return len(actual) == len(expected) and all(values_match(a, e, rel_tol, abs_tol) for a, e in zip(actual, expected))
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        return actual.keys() == expected.keys() and all(values_match(actual[k], expected[k], rel_tol, abs_tol) for k in actual)
+    if isinstance(actual, str) and isinstance(expected, str):
+        return actual.strip() == expected.strip()
+    if isinstance(expected, str) and not isinstance(actual, str):
+        parsed, ok = parse_test_value(expected)
+        return ok and not isinstance(parsed, str) and values_match(actual, parsed, rel_tol, abs_tol)
+    if isinstance(actual, str) and not isinstance(expected, str):
+        parsed, ok = parse_test_value(actual)
+        return ok and not isinstance(parsed, str) and values_match(parsed, expected, rel_tol, abs_tol)
+    return actual == expected
+
+
+def find_entrypoint(code, language):
+    """
+    Name of the function to call: 'solution' if defined, otherwise the first
+    top-level function that no other function calls (so helpers are skipped).
+    """
+    if language == 'python':
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return 'solution'
+        functions = [node for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        names = [node.name for node in functions]
+        if 'solution' in names:
+            return 'solution'
+        called = set()
+        for node in functions:
+            called.update(call.func.id for call in ast.walk(node) if isinstance(call, ast.Call)
+                          and isinstance(call.func, ast.Name) and call.func.id != node.name)
+        public = [name for name in names if not name.startswith('_') and name != 'main']
+        uncalled = [name for name in public if name not in called]
+        return (uncalled or public or ['solution'])[0]
+
+    if re.search(r'\bsolution\s*\(', code):
+        return 'solution'
+    names = []
+    for pattern in ENTRYPOINT_PATTERNS.get(language, []):
+        names.extend(match.group(1) for match in re.finditer(pattern, code, re.MULTILINE)
+                     if match.group(1) not in NOT_ENTRYPOINTS and match.group(1) not in names)
+    # A name that appears only at its definition isn't called by anything else
+    uncalled = [name for name in names if len(re.findall(r'\b' + re.escape(name) + r'\s*\(', code)) == 1]
+    return (uncalled or names or ['solution'])[0]
+
+
+def python_class_entrypoint(code):
+    """
+    For LeetCode-style submissions (a Solution class and no top-level function),
+    return code with a module-level wrapper around the first public method and
+    the wrapper's name; otherwise (code, None).
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code, None
+    if any(isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) for node in tree.body):
+        return code, None
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == 'Solution':
+            methods = [item.name for item in node.body
+                       if isinstance(item, ast.FunctionDef) and not item.name.startswith('_')]
+            if methods:
+                wrapper = f"\n\ndef __hireed_entry(*args):\n    return Solution().{methods[0]}(*args)\n"
+                return code + wrapper, '__hireed_entry'
+    return code, None
+
+
+def build_cases(test_cases):
+    """Runner cases (args plus the original input) and parsed expected values for DSA test cases"""
+    cases, expected = [], []
+    for test_case in test_cases:
+        if isinstance(test_case, dict):
+            test_input = test_case.get('input')
+            expected_output = test_case.get('expected_output', test_case.get('output'))
+        else:
+            test_input, expected_output = test_case[0], test_case[1]
+        cases.append({'args': parse_arguments(test_input), 'input': test_input})
+        expected.append(parse_expected(expected_output))
+    return cases, expected
@@ -0,0 +1,28 @@
+// Shared submission helpers for the coding and DSA practice pages
+// Opt-in control for the slow extras (stress testing, profiling); a plain submission only runs the test cases
+function createAnalysisToggle(description) {
+  const label = document.createElement('label');
+  label.className = 'analysis-toggle';
+  const checkbox = document.createElement('input');
+  checkbox.type = 'checkbox';
+  label.append(checkbox, ` Deep analysis: ${description} (takes a few seconds longer)`);
+  return { element: label, enabled: () => checkbox.checked };
+}
+
+// One-line summary of an evaluation's resources report (see resource_report.py)
+function formatResources(resources) {
+  const peak = resources.peak_kb ?? resources.process_peak_kb;
+  let text = `📊 Resources: ${resources.total_cpu_ms.toFixed(2)} ms CPU, ${resources.total_wall_ms.toFixed(2)} ms wall`;
+  if (peak !== null && peak !== undefined) {
+    text += `, peak memory ${peak} KB`;
+  }
+  if (resources.slowest_case) {
+    text += ` (slowest: test case ${resources.slowest_case})`;
+  }
+  if (resources.hot_functions && resources.hot_functions.length) {
+    text += '<br>Hot functions:<br>' + resources.hot_functions
+      .map(row => `${row.function} (line ${row.line}): ${row.self_ms} ms self, ${row.calls} calls`)
+      .join('<br>');
+  }
+  return text;
+}
@@ -0,0 +1,270 @@
+import json
+import os
+import pwd
+import queue
+import secrets
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_worker.py")
+
+
+class WorkerTimeout(Exception):
+    pass
+
+
+class WorkerDied(Exception):
+    pass
+
+
+def sandbox_identity(user):
+    """
+    (uid, gid) of the account untrusted code runs as, or None if it can't be used.
+
+    Only a root server can switch to it; otherwise untrusted code runs as the
+    server's own user and can read everything the server can.
+    """
+    if not user:
+        return None
+    try:
+        account = pwd.getpwnam(user)
+    except KeyError:
+        print(f"Sandbox user {user!r} doesn't exist; untrusted code runs as the server's user")
+        return None
+    if os.geteuid() != 0:
+        print(f"Not running as root, so can't switch to sandbox user {user!r}; "
+              f"untrusted code runs as the server's user")
+        return None
+    return account.pw_uid, account.pw_gid
+
+
+def sandbox_env():
+    """The worker's environment: nothing inherited from ours (isolation itself comes from the sandbox user)"""
+    return {'PATH': os.environ.get('PATH', '/usr/local/bin:/usr/bin:/bin'), 'LANG': 'C.UTF-8'}
+
+
+def json_value(value):
+    """value as it would come back through the worker's JSON protocol"""
+    try:
+        return json.loads(json.dumps(value))
+    except (TypeError, ValueError):
+        return value
+
+
+class SandboxWorker:
+    """One isolated interpreter running sandbox_worker.py, driven over its stdin/stdout"""
+
+    def __init__(self, memory_mb, file_size_mb, identity=None, max_processes=None, start_timeout=10.0):
+        self.jobs = 0
+        self._buffer = b''
+        self.process = subprocess.Popen(
+            [sys.executable, '-I', WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd='/tmp',
+            env=sandbox_env(),
+            close_fds=True,
+            start_new_session=True
+        )
+        uid, gid = identity or (None, None)
+        self._send({'memory_mb': memory_mb, 'file_size_mb': file_size_mb, 'uid': uid, 'gid': gid,
+                    'max_processes': max_processes})
+        self._receive(start_timeout)
+
+    @property
+    def alive(self):
+        return self.process.poll() is None
+
+    def request(self, message, timeout):
+        """Send one message and return its reply; WorkerDied if the reply isn't the worker's own answer to it"""
+        nonce = secrets.token_hex(16)
+        self._send(dict(message, nonce=nonce))
+        reply = self._receive(timeout)
+        # Anything but exactly our reply means the submission wrote to the protocol fd itself
+        if not isinstance(reply, dict) or reply.pop('nonce', None) != nonce or self._buffer:
+            raise WorkerDied("unexpected output on the worker's result channel")
+        return reply
+
+    def kill(self):
+        if self.alive:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def _send(self, message):
+        try:
+            self.process.stdin.write(json.dumps(message).encode('utf-8') + b'\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerDied(str(e))
+
+    def _receive(self, timeout):
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+        while b'\n' not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WorkerTimeout()
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                raise WorkerTimeout()
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise WorkerDied(self._exit_reason())
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        try:
+            return json.loads(line)
+        except ValueError:
+            raise WorkerDied("unexpected output on the worker's result channel")
+
+    def _exit_reason(self):
+        try:
+            code = self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            return "worker closed its output"
+        if code == -signal.SIGXCPU:
+            return "CPU time limit exceeded"
+        if code == -signal.SIGKILL:
+            return "killed (likely out of memory)"
+        if code == -signal.SIGXFSZ:
+            return "file size limit exceeded"
+        return f"worker exited with code {code}"
+
+
+class ExecutionPool:
+    """
+    Pool of pre-started, pre-warmed sandbox processes for grading untrusted Python.
+
+    Each submission runs in its own interpreter under RLIMIT_AS/RLIMIT_FSIZE/
+    RLIMIT_NPROC and a per-case RLIMIT_CPU budget, with a wall-clock timeout
+    enforced from here. Given identity (see sandbox_identity), workers switch to
+    that unprivileged uid before loading any submission, so student code can't
+    read the app's files, other processes' /proc entries or signal the server. A
+    worker that hangs or crashes is killed and replaced, and every worker is
+    recycled after max_jobs_per_worker submissions, so a bad submission costs at
+    most one case timeout and never blocks the web process.
+    """
+
+    def __init__(self, size=None, max_jobs_per_worker=50, case_timeout=2.0, cpu_limit=2,
+                 memory_mb=256, file_size_mb=1, acquire_timeout=30.0, identity=None, max_processes=None):
+        self.size = size or max(2, os.cpu_count() or 2)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.case_timeout = case_timeout
+        self.cpu_limit = cpu_limit
+        self.memory_mb = memory_mb
+        self.file_size_mb = file_size_mb
+        self.acquire_timeout = acquire_timeout
+        self.identity = identity
+        # RLIMIT_NPROC counts every process and thread of the sandbox uid, so it has to cover the whole pool
+        self.max_processes = max_processes or self.size * 4
+        self._idle = queue.Queue()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        return SandboxWorker(self.memory_mb, self.file_size_mb, self.identity, self.max_processes)
+
+    def _acquire(self):
+        self.start()
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise RuntimeError("All code runners are busy, please retry shortly")
+
+    def _release(self, worker):
+        worker.jobs += 1
+        if worker.alive and worker.jobs < self.max_jobs_per_worker:
+            self._idle.put(worker)
+            return
+        # Recycle off the request path so the caller doesn't pay for interpreter startup
+        def replace():
+            worker.kill()
+            self._idle.put(self._spawn())
+        threading.Thread(target=replace, daemon=True).start()
+
+    def _load(self, worker, code, entrypoint, timeout):
+        return worker.request({'op': 'load', 'code': code, 'entrypoint': entrypoint,
+                               'cpu_limit': self.cpu_limit}, timeout)
+
+    def run(self, code, cases, entrypoint='solution', case_timeout=None):
+        """
+        Run entrypoint from code once per case and return structured results.
+
+        cases is a list of dicts with 'args' (positional arguments), an optional
+        'expected' value, an optional 'input' echoed back in the result, an
+        optional 'trace_memory' flag that adds the call's peak_kb and an optional
+        'profile_top' count that adds the call's hottest functions. Returns
+        {'ok': bool, 'error': str|None, 'error_kind': str|None, 'results': [...]},
+        where each result has status passed/failed/ok/error/timeout. Expected
+        values never reach the sandbox; the comparison is made here.
+        """
+        case_timeout = case_timeout or self.case_timeout
+        worker = self._acquire()
+        try:
+            try:
+                loaded = self._load(worker, code, entrypoint, case_timeout)
+            except WorkerTimeout:
+                worker.kill()
+                return {'ok': False, 'error_kind': 'timeout', 'results': [],
+                        'error': f"Code did not finish loading within {case_timeout}s"}
+            except WorkerDied as e:
+                return {'ok': False, 'error_kind': 'crash', 'results': [], 'error': f"Code crashed while loading: {e}"}
+            if not loaded.get('ok'):
+                return {'ok': False, 'error_kind': loaded.get('kind'), 'error': loaded.get('error'), 'results': []}
+
+            results = []
+            for index, case in enumerate(cases):
+                result = {'input': case.get('input', case.get('args'))}
+                if 'expected' in case:
+                    result['expected'] = case['expected']
+                message = {'op': 'call', 'args': case.get('args') or [], 'cpu_limit': self.cpu_limit,
+                           'trace_memory': bool(case.get('trace_memory')),
+                           'profile_top': case.get('profile_top') or 0}
+                try:
+                    result.update(worker.request(message, case_timeout))
+                    if result.get('status') == 'ok' and 'expected' in case:
+                        result['passed'] = result.get('actual') == json_value(case['expected'])
+                        result['status'] = 'passed' if result['passed'] else 'failed'
+                except (WorkerTimeout, WorkerDied) as e:
+                    timed_out = isinstance(e, WorkerTimeout) or 'CPU time' in str(e)
+                    result.update({
+                        'passed': False,
+                        'status': 'timeout' if timed_out else 'error',
+                        'error': f"Time limit exceeded ({case_timeout}s)" if timed_out else f"Runtime crash: {e}"
+                    })
+                    # The worker is wedged or gone; continue the remaining cases on a fresh one
+                    worker.kill()
+                    worker = self._spawn()
+                    try:
+                        self._load(worker, code, entrypoint, case_timeout)
+                    except (WorkerTimeout, WorkerDied):
+                        worker.kill()
+                        results.append(result)
+                        results.extend({'input': c.get('input', c.get('args')), 'passed': False, 'status': 'skipped'}
+                                       for c in cases[index + 1:])
+                        break
+                results.append(result)
+            return {'ok': True, 'error': None, 'error_kind': None, 'results': results}
+        finally:
+            self._release(worker)
@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from llm_scheduler import LLMOverloaded, current_context, llm_context
+
+FINISHED = ('done', 'failed', 'cancelled')
+
+
+class JobFailed(Exception):
+    """Raised by a runner to fail its job with a message for the client"""
+
+
+class Job:
+    """One background generation; its results are appended to items as they're produced"""
+
+    def __init__(self, kind, params, key, total, context):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.key = key
+        self.total = total
+        self.context = context
+        self.status = 'queued'
+        self.items = []
+        self.error = ''
+        self.created = time.time()
+        self.finished_at = None
+        self._changed = threading.Condition()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    def emit(self, item):
+        """Publish one result; False once the job is cancelled, so the runner can stop early"""
+        with self._changed:
+            if self.cancelled:
+                return False
+            self.items.append(item)
+            self._changed.notify_all()
+        return True
+
+    def _set_status(self, status, error=''):
+        with self._changed:
+            self.status = status
+            self.error = error
+            if status in FINISHED:
+                self.finished_at = time.monotonic()
+            self._changed.notify_all()
+
+    def wait(self, seen, timeout):
+        """Block until there are more than `seen` items or the job finishes, at most timeout seconds"""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.items) > seen or self.finished, timeout)
+
+    def snapshot(self, since=0):
+        with self._changed:
+            return {
+                'job_id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'total': self.total,
+                'ready': len(self.items),
+                'items': self.items[since:],
+                'next': len(self.items),
+                'error': self.error
+            }
+
+
+class JobQueue:
+    """
+    Runs long generations (a whole MCQ or aptitude test) on a bounded pool of
+    worker threads, so the request that submits one returns at once.
+
+    Runners are registered per kind and called as runner(job, params) under
+    the submitting request's LLM priority; they publish each result with
+    job.emit() as soon as it's ready and should stop when emit() returns False
+    (the job was cancelled). Clients poll snapshot(since) or wait() for new
+    items. A submit with the same reuse key as a job that's still running, or
+    finished successfully within result_ttl seconds, gets that job back instead
+    of starting another. Finished jobs are forgotten after result_ttl, and the
+    oldest finished ones early if more than max_jobs are held.
+    """
+
+    def __init__(self, workers=4, max_pending=50, result_ttl=900, max_jobs=1000):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self._runners = {}
+        self._jobs = OrderedDict()  # id -> Job, oldest first
+        self._by_key = {}
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._pid = None
+        self._durations = deque(maxlen=50)
+        self._stats = {'submitted': 0, 'reused': 0, 'rejected': 0, 'done': 0, 'failed': 0, 'cancelled': 0}
+
+    def register(self, kind, runner):
+        self._runners[kind] = runner
+
+    def submit(self, kind, params, key=None, total=None):
+        """(job, created) for kind; raises LLMOverloaded when too many jobs are already waiting"""
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        self._ensure_workers()
+        with self._condition:
+            self._prune()
+            existing = self._jobs.get(self._by_key.get(key)) if key is not None else None
+            if existing is not None and existing.status not in ('failed', 'cancelled'):
+                self._stats['reused'] += 1
+                return existing, False
+            if len(self._pending) >= self.max_pending:
+                self._stats['rejected'] += 1
+                raise LLMOverloaded("Too many generation jobs queued", retry_after=self._estimate_wait())
+            job = Job(kind, params, key, total, current_context())
+            self._jobs[job.id] = job
+            if key is not None:
+                self._by_key[key] = job.id
+            self._pending.append(job)
+            self._stats['submitted'] += 1
+            self._condition.notify()
+        return job, True
+
+    def get(self, job_id):
+        with self._condition:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Stop a job: dropped if still queued, otherwise its runner stops at its next emit"""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job._cancelled.set()
+            if job in self._pending:
+                self._pending.remove(job)
+                self._finish(job, 'cancelled')
+        return job
+
+    def _estimate_wait(self):
+        average = sum(self._durations) / len(self._durations) if self._durations else 10.0
+        return len(self._pending) * average / max(1, self.workers)
+
+    def _ensure_workers(self):
+        # Started lazily, and again in a forked worker, which doesn't inherit threads
+        if self._pid != os.getpid():
+            with self._condition:
+                if self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    for i in range(self.workers):
+                        threading.Thread(target=self._work, name=f'generation-job-{i}', daemon=True).start()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                job = self._pending.popleft()
+                job._set_status('running')
+            started = time.monotonic()
+            status, error = 'done', ''
+            try:
+                with llm_context(*job.context):
+                    self._runners[job.kind](job, job.params)
+            except JobFailed as e:
+                status, error = 'failed', str(e)
+            except Exception as e:
+                print(f"Generation job {job.kind} {job.id} error: {e}")
+                status, error = 'failed', str(e)
+            if job.cancelled:
+                status, error = 'cancelled', ''
+            with self._condition:
+                self._durations.append(time.monotonic() - started)
+                self._finish(job, status, error)
+
+    def _finish(self, job, status, error=''):
+        """Call with the condition held"""
+        job._set_status(status, error)
+        self._stats[status] += 1
+        if status != 'done' and self._by_key.get(job.key) == job.id:
+            del self._by_key[job.key]
+
+    def _prune(self):
+        """Forget expired finished jobs; call with the condition held"""
+        now = time.monotonic()
+        finished = [job for job in self._jobs.values() if job.finished]
+        excess = len(self._jobs) - self.max_jobs
+        for job in finished:
+            if now - job.finished_at < self.result_ttl and excess <= 0:
+                continue
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) == job.id:
+                del self._by_key[job.key]
+            excess -= 1
+
+    def stats(self):
+        with self._condition:
+            self._prune()
+            states = {}
+            for job in self._jobs.values():
+                states[job.status] = states.get(job.status, 0) + 1
+            return dict(self._stats, workers=self.workers, pending=len(self._pending), jobs=states,
+                        estimated_wait_s=round(self._estimate_wait(), 1))
@@ -0,0 +1,343 @@
+// ---------------- HireED batch harness (compiled alongside the submission) ----------------
+// Usage: java Harness <SubmissionClass> <entrypoint>. Reads the run's record token and
+// then one JSON argument array per line from stdin, converts each argument to the
+// method's parameter type via reflection and writes one token-prefixed result record per case.
+import java.io.BufferedReader;
+import java.io.InputStreamReader;
+import java.lang.management.ManagementFactory;
+import java.lang.management.ThreadMXBean;
+import java.lang.reflect.Array;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.lang.reflect.Modifier;
+import java.lang.reflect.ParameterizedType;
+import java.lang.reflect.Type;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Paths;
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+
+public class Harness {
+
+    static final class Parser {
+        private final String s;
+        private int pos = 0;
+
+        Parser(String source) {
+            this.s = source;
+        }
+
+        Object parse() {
+            Object value = parseValue();
+            skipSpace();
+            if (pos != s.length()) throw new IllegalArgumentException("Trailing characters in test input");
+            return value;
+        }
+
+        private void skipSpace() {
+            while (pos < s.length() && Character.isWhitespace(s.charAt(pos))) pos++;
+        }
+
+        private char peek() {
+            skipSpace();
+            if (pos >= s.length()) throw new IllegalArgumentException("Unexpected end of test input");
+            return s.charAt(pos);
+        }
+
+        private void expect(String word) {
+            if (!s.startsWith(word, pos)) throw new IllegalArgumentException("Malformed test input");
+            pos += word.length();
+        }
+
+        private Object parseValue() {
+            char c = peek();
+            if (c == '{') {
+                pos++;
+                Map<String, Object> map = new LinkedHashMap<>();
+                if (peek() == '}') {
+                    pos++;
+                    return map;
+                }
+                while (true) {
+                    if (peek() != '"') throw new IllegalArgumentException("Malformed test input");
+                    String key = parseString();
+                    if (peek() != ':') throw new IllegalArgumentException("Malformed test input");
+                    pos++;
+                    map.put(key, parseValue());
+                    char next = peek();
+                    pos++;
+                    if (next == '}') return map;
+                    if (next != ',') throw new IllegalArgumentException("Malformed test input");
+                }
+            }
+            if (c == '[') {
+                pos++;
+                List<Object> list = new ArrayList<>();
+                if (peek() == ']') {
+                    pos++;
+                    return list;
+                }
+                while (true) {
+                    list.add(parseValue());
+                    char next = peek();
+                    pos++;
+                    if (next == ']') return list;
+                    if (next != ',') throw new IllegalArgumentException("Malformed test input");
+                }
+            }
+            if (c == '"') return parseString();
+            if (c == 't') {
+                expect("true");
+                return Boolean.TRUE;
+            }
+            if (c == 'f') {
+                expect("false");
+                return Boolean.FALSE;
+            }
+            if (c == 'n') {
+                expect("null");
+                return null;
+            }
+            int start = pos;
+            while (pos < s.length() && "+-0123456789.eE".indexOf(s.charAt(pos)) >= 0) pos++;
+            String number = s.substring(start, pos);
+            if (number.isEmpty()) throw new IllegalArgumentException("Malformed test input");
+            if (number.contains(".") || number.contains("e") || number.contains("E")) return Double.parseDouble(number);
+            return Long.parseLong(number);
+        }
+
+        private String parseString() {
+            StringBuilder out = new StringBuilder();
+            pos++;  // Opening quote
+            while (pos < s.length() && s.charAt(pos) != '"') {
+                char c = s.charAt(pos++);
+                if (c != '\\') {
+                    out.append(c);
+                    continue;
+                }
+                char e = s.charAt(pos++);
+                switch (e) {
+                    case 'n': out.append('\n'); break;
+                    case 't': out.append('\t'); break;
+                    case 'r': out.append('\r'); break;
+                    case 'b': out.append('\b'); break;
+                    case 'f': out.append('\f'); break;
+                    case 'u':
+                        out.append((char) Integer.parseInt(s.substring(pos, pos + 4), 16));
+                        pos += 4;
+                        break;
+                    default: out.append(e);
+                }
+            }
+            pos++;  // Closing quote
+            return out.toString();
+        }
+    }
+
+    static Object convert(Object value, Type type) {
+        if (type instanceof ParameterizedType) {
+            ParameterizedType parameterized = (ParameterizedType) type;
+            Class<?> raw = (Class<?>) parameterized.getRawType();
+            Type[] typeArgs = parameterized.getActualTypeArguments();
+            if (Map.class.isAssignableFrom(raw)) {
+                Map<Object, Object> map = new LinkedHashMap<>();
+                for (Map.Entry<?, ?> entry : ((Map<?, ?>) value).entrySet()) {
+                    map.put(convert(entry.getKey(), typeArgs[0]), convert(entry.getValue(), typeArgs[1]));
+                }
+                return map;
+            }
+            if (Collection.class.isAssignableFrom(raw)) {
+                Collection<Object> items = Set.class.isAssignableFrom(raw) ? new HashSet<Object>() : new ArrayList<Object>();
+                for (Object item : (List<?>) value) items.add(convert(item, typeArgs[0]));
+                return items;
+            }
+            return convert(value, raw);
+        }
+        if (!(type instanceof Class)) return value;
+        Class<?> target = (Class<?>) type;
+        if (value == null) {
+            if (target.isPrimitive()) throw new IllegalArgumentException("null passed for a " + target.getName() + " parameter");
+            return null;
+        }
+        if (target == int.class || target == Integer.class) return ((Number) value).intValue();
+        if (target == long.class || target == Long.class) return ((Number) value).longValue();
+        if (target == double.class || target == Double.class) return ((Number) value).doubleValue();
+        if (target == float.class || target == Float.class) return ((Number) value).floatValue();
+        if (target == short.class || target == Short.class) return ((Number) value).shortValue();
+        if (target == byte.class || target == Byte.class) return ((Number) value).byteValue();
+        if (target == boolean.class || target == Boolean.class) return (Boolean) value;
+        if (target == char.class || target == Character.class) {
+            String text = (String) value;
+            if (text.length() != 1) throw new IllegalArgumentException("Expected a single character argument");
+            return text.charAt(0);
+        }
+        if (target == String.class) return (String) value;
+        if (target.isArray()) {
+            List<?> items = (List<?>) value;
+            Object array = Array.newInstance(target.getComponentType(), items.size());
+            for (int i = 0; i < items.size(); i++) Array.set(array, i, convert(items.get(i), target.getComponentType()));
+            return array;
+        }
+        if (Collection.class.isAssignableFrom(target) && value instanceof List) {
+            return Set.class.isAssignableFrom(target) ? new HashSet<Object>((List<?>) value) : new ArrayList<Object>((List<?>) value);
+        }
+        return value;
+    }
+
+    static void dump(StringBuilder out, Object value) {
+        if (value == null) {
+            out.append("null");
+        } else if (value instanceof Boolean || value instanceof Integer || value instanceof Long
+                || value instanceof Short || value instanceof Byte) {
+            out.append(value);
+        } else if (value instanceof Number) {
+            double number = ((Number) value).doubleValue();
+            if (Double.isNaN(number) || Double.isInfinite(number)) dumpString(out, String.valueOf(number));
+            else out.append(number);
+        } else if (value instanceof Character || value instanceof CharSequence) {
+            dumpString(out, value.toString());
+        } else if (value.getClass().isArray()) {
+            out.append('[');
+            for (int i = 0; i < Array.getLength(value); i++) {
+                if (i > 0) out.append(',');
+                dump(out, Array.get(value, i));
+            }
+            out.append(']');
+        } else if (value instanceof Iterable) {
+            out.append('[');
+            boolean first = true;
+            for (Object item : (Iterable<?>) value) {
+                if (!first) out.append(',');
+                first = false;
+                dump(out, item);
+            }
+            out.append(']');
+        } else if (value instanceof Map) {
+            out.append('{');
+            boolean first = true;
+            for (Map.Entry<?, ?> entry : ((Map<?, ?>) value).entrySet()) {
+                if (!first) out.append(',');
+                first = false;
+                dumpString(out, String.valueOf(entry.getKey()));
+                out.append(':');
+                dump(out, entry.getValue());
+            }
+            out.append('}');
+        } else {
+            dumpString(out, value.toString());
+        }
+    }
+
+    static void dumpString(StringBuilder out, String value) {
+        out.append('"');
+        for (int i = 0; i < value.length(); i++) {
+            char c = value.charAt(i);
+            switch (c) {
+                case '"': out.append("\\\""); break;
+                case '\\': out.append("\\\\"); break;
+                case '\n': out.append("\\n"); break;
+                case '\t': out.append("\\t"); break;
+                case '\r': out.append("\\r"); break;
+                default:
+                    if (c < 0x20) out.append(String.format("\\u%04x", (int) c));
+                    else out.append(c);
+            }
+        }
+        out.append('"');
+    }
+
+    static String errorText(Throwable error) {
+        String message = error.getMessage();
+        String name = error.getClass().getSimpleName();
+        return message == null || message.isEmpty() ? name : name + ": " + message;
+    }
+
+    static final ThreadMXBean THREADS = ManagementFactory.getThreadMXBean();
+
+    /** VmHWM: the process's peak resident memory so far, in KB (0 if unavailable). */
+    static long peakRssKb() {
+        try {
+            for (String line : Files.readAllLines(Paths.get("/proc/self/status"))) {
+                if (line.startsWith("VmHWM:")) return Long.parseLong(line.replaceAll("[^0-9]", ""));
+            }
+        } catch (Exception ignored) {
+            // Not on Linux; leave the field out
+        }
+        return 0;
+    }
+
+    static String runCase(Method method, Object instance, String line) {
+        StringBuilder record = new StringBuilder();
+        long started = System.nanoTime();
+        long cpuStarted = THREADS.getCurrentThreadCpuTime();
+        try {
+            Object parsed = new Parser(line).parse();
+            if (!(parsed instanceof List) || ((List<?>) parsed).size() != method.getParameterCount()) {
+                throw new IllegalArgumentException("Expected " + method.getParameterCount() + " argument(s)");
+            }
+            List<?> raw = (List<?>) parsed;
+            Type[] types = method.getGenericParameterTypes();
+            Object[] args = new Object[raw.size()];
+            for (int i = 0; i < args.length; i++) args[i] = convert(raw.get(i), types[i]);
+            started = System.nanoTime();
+            cpuStarted = THREADS.getCurrentThreadCpuTime();
+            Object actual = method.invoke(instance, args);
+            record.append("{\"ok\":true,\"wall_ms\":").append((System.nanoTime() - started) / 1e6)
+                    .append(",\"cpu_ms\":").append((THREADS.getCurrentThreadCpuTime() - cpuStarted) / 1e6)
+                    .append(",\"actual\":");
+            dump(record, actual);
+            record.append('}');
+        } catch (Throwable error) {
+            Throwable cause = error instanceof InvocationTargetException ? error.getCause() : error;
+            record.setLength(0);
+            record.append("{\"ok\":false,\"wall_ms\":").append((System.nanoTime() - started) / 1e6)
+                    .append(",\"cpu_ms\":").append((THREADS.getCurrentThreadCpuTime() - cpuStarted) / 1e6)
+                    .append(",\"error\":");
+            dumpString(record, errorText(cause));
+            record.append('}');
+        }
+        return record.toString();
+    }
+
+    public static void main(String[] argv) throws Exception {
+        BufferedReader reader = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        List<String> lines = new ArrayList<>();
+        for (String line = reader.readLine(); line != null; line = reader.readLine()) {
+            if (!line.trim().isEmpty()) lines.add(line);
+        }
+
+        Method method = null;
+        for (Method candidate : Class.forName(argv[0]).getDeclaredMethods()) {
+            if (candidate.getName().equals(argv[1]) && (method == null || Modifier.isStatic(candidate.getModifiers()))) {
+                method = candidate;
+            }
+        }
+        Object instance = null;
+        if (method != null) {
+            method.setAccessible(true);
+            if (!Modifier.isStatic(method.getModifiers())) {
+                java.lang.reflect.Constructor<?> constructor = method.getDeclaringClass().getDeclaredConstructor();
+                constructor.setAccessible(true);
+                instance = constructor.newInstance();
+            }
+        }
+
+        if (lines.isEmpty()) return;
+        String token = lines.remove(0);
+        for (String line : lines) {
+            String record = method == null
+                    ? "{\"ok\":false,\"error\":\"Your code must define a '" + argv[1] + "' method\"}"
+                    : runCase(method, instance, line);
+            record = record.substring(0, record.length() - 1) + ",\"rss_kb\":" + peakRssKb() + "}";
+            System.out.flush();
+            System.out.print("\n\u001e" + token + record + "\n");
+            System.out.flush();
+        }
+    }
+}
@@ -0,0 +1,361 @@
+
+// ---------------- HireED batch harness (appended after the submission) ----------------
+// Reads the run's record token and then one JSON argument array per line from stdin,
+// calls the entrypoint with the arguments converted to its parameter types, and writes
+// one token-prefixed result record per case.
+#undef main
+#include <cctype>
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <ctime>
+#include <cstdlib>
+#include <exception>
+#include <fstream>
+#include <iostream>
+#include <map>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <tuple>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+namespace hireed_harness {
+
+struct Json {
+    enum Kind { Null, Bool, Number, String, Array, Object };
+    Kind kind = Null;
+    bool boolean = false;
+    std::string text;  // Raw digits for numbers, decoded text for strings
+    std::vector<Json> items;
+    std::vector<std::pair<std::string, Json>> fields;
+};
+
+class Parser {
+public:
+    explicit Parser(const std::string& source) : s(source) {}
+
+    Json parse() {
+        Json value = parse_value();
+        skip_space();
+        if (pos != s.size()) throw std::runtime_error("Trailing characters in test input");
+        return value;
+    }
+
+private:
+    const std::string& s;
+    std::size_t pos = 0;
+
+    void skip_space() {
+        while (pos < s.size() && std::isspace(static_cast<unsigned char>(s[pos]))) pos++;
+    }
+
+    char peek() {
+        skip_space();
+        if (pos >= s.size()) throw std::runtime_error("Unexpected end of test input");
+        return s[pos];
+    }
+
+    void expect(const char* word) {
+        for (const char* c = word; *c; c++, pos++) {
+            if (pos >= s.size() || s[pos] != *c) throw std::runtime_error("Malformed test input");
+        }
+    }
+
+    Json parse_value() {
+        Json value;
+        char c = peek();
+        if (c == '{') {
+            value.kind = Json::Object;
+            pos++;
+            if (peek() == '}') { pos++; return value; }
+            while (true) {
+                if (peek() != '"') throw std::runtime_error("Malformed test input");
+                std::string key = parse_string();
+                if (peek() != ':') throw std::runtime_error("Malformed test input");
+                pos++;
+                value.fields.emplace_back(key, parse_value());
+                char next = peek();
+                pos++;
+                if (next == '}') break;
+                if (next != ',') throw std::runtime_error("Malformed test input");
+            }
+        } else if (c == '[') {
+            value.kind = Json::Array;
+            pos++;
+            if (peek() == ']') { pos++; return value; }
+            while (true) {
+                value.items.push_back(parse_value());
+                char next = peek();
+                pos++;
+                if (next == ']') break;
+                if (next != ',') throw std::runtime_error("Malformed test input");
+            }
+        } else if (c == '"') {
+            value.kind = Json::String;
+            value.text = parse_string();
+        } else if (c == 't') {
+            expect("true");
+            value.kind = Json::Bool;
+            value.boolean = true;
+        } else if (c == 'f') {
+            expect("false");
+            value.kind = Json::Bool;
+        } else if (c == 'n') {
+            expect("null");
+        } else {
+            value.kind = Json::Number;
+            std::size_t start = pos;
+            while (pos < s.size() && std::string("+-0123456789.eE").find(s[pos]) != std::string::npos) pos++;
+            if (start == pos) throw std::runtime_error("Malformed test input");
+            value.text = s.substr(start, pos - start);
+        }
+        return value;
+    }
+
+    static void append_utf8(std::string& out, unsigned code) {
+        if (code < 0x80) {
+            out += static_cast<char>(code);
+        } else if (code < 0x800) {
+            out += static_cast<char>(0xC0 | (code >> 6));
+            out += static_cast<char>(0x80 | (code & 0x3F));
+        } else {
+            out += static_cast<char>(0xE0 | (code >> 12));
+            out += static_cast<char>(0x80 | ((code >> 6) & 0x3F));
+            out += static_cast<char>(0x80 | (code & 0x3F));
+        }
+    }
+
+    std::string parse_string() {
+        std::string out;
+        pos++;  // Opening quote
+        while (pos < s.size() && s[pos] != '"') {
+            char c = s[pos++];
+            if (c != '\\') { out += c; continue; }
+            if (pos >= s.size()) break;
+            char e = s[pos++];
+            switch (e) {
+                case 'n': out += '\n'; break;
+                case 't': out += '\t'; break;
+                case 'r': out += '\r'; break;
+                case 'b': out += '\b'; break;
+                case 'f': out += '\f'; break;
+                case 'u':
+                    append_utf8(out, static_cast<unsigned>(std::strtoul(s.substr(pos, 4).c_str(), nullptr, 16)));
+                    pos += 4;
+                    break;
+                default: out += e;
+            }
+        }
+        pos++;  // Closing quote
+        return out;
+    }
+};
+
+void dump_string(std::ostream& out, const std::string& value) {
+    out << '"';
+    for (unsigned char c : value) {
+        switch (c) {
+            case '"': out << "\\\""; break;
+            case '\\': out << "\\\\"; break;
+            case '\n': out << "\\n"; break;
+            case '\t': out << "\\t"; break;
+            case '\r': out << "\\r"; break;
+            default:
+                if (c < 0x20) {
+                    char buffer[8];
+                    std::snprintf(buffer, sizeof(buffer), "\\u%04x", c);
+                    out << buffer;
+                } else {
+                    out << c;
+                }
+        }
+    }
+    out << '"';
+}
+
+template <class T, class Enable = void>
+struct Convert;
+
+template <class T>
+struct Convert<T, std::enable_if_t<std::is_integral_v<T> && !std::is_same_v<T, bool> && !std::is_same_v<T, char>>> {
+    static T from(const Json& value) {
+        if (value.kind != Json::Number) throw std::runtime_error("Expected an integer argument");
+        if (value.text.find_first_of(".eE") != std::string::npos) return static_cast<T>(std::stod(value.text));
+        return static_cast<T>(std::stoll(value.text));
+    }
+    static void dump(std::ostream& out, T value) { out << +value; }
+};
+
+template <class T>
+struct Convert<T, std::enable_if_t<std::is_floating_point_v<T>>> {
+    static T from(const Json& value) {
+        if (value.kind != Json::Number) throw std::runtime_error("Expected a numeric argument");
+        return static_cast<T>(std::stod(value.text));
+    }
+    static void dump(std::ostream& out, T value) {
+        if (!std::isfinite(value)) { dump_string(out, std::to_string(value)); return; }
+        char buffer[32];
+        std::snprintf(buffer, sizeof(buffer), "%.15g", static_cast<double>(value));
+        out << buffer;
+    }
+};
+
+template <>
+struct Convert<bool> {
+    static bool from(const Json& value) {
+        if (value.kind != Json::Bool) throw std::runtime_error("Expected a boolean argument");
+        return value.boolean;
+    }
+    static void dump(std::ostream& out, bool value) { out << (value ? "true" : "false"); }
+};
+
+template <>
+struct Convert<char> {
+    static char from(const Json& value) {
+        if (value.kind != Json::String || value.text.size() != 1) throw std::runtime_error("Expected a single character argument");
+        return value.text[0];
+    }
+    static void dump(std::ostream& out, char value) { dump_string(out, std::string(1, value)); }
+};
+
+template <>
+struct Convert<std::string> {
+    static std::string from(const Json& value) {
+        if (value.kind != Json::String) throw std::runtime_error("Expected a string argument");
+        return value.text;
+    }
+    static void dump(std::ostream& out, const std::string& value) { dump_string(out, value); }
+};
+
+template <class T>
+struct Convert<std::vector<T>> {
+    static std::vector<T> from(const Json& value) {
+        if (value.kind != Json::Array) throw std::runtime_error("Expected an array argument");
+        std::vector<T> items;
+        items.reserve(value.items.size());
+        for (const Json& item : value.items) items.push_back(Convert<T>::from(item));
+        return items;
+    }
+    static void dump(std::ostream& out, const std::vector<T>& value) {
+        out << '[';
+        for (std::size_t i = 0; i < value.size(); i++) {
+            if (i) out << ',';
+            Convert<T>::dump(out, value[i]);
+        }
+        out << ']';
+    }
+};
+
+template <class A, class B>
+struct Convert<std::pair<A, B>> {
+    static std::pair<A, B> from(const Json& value) {
+        if (value.kind != Json::Array || value.items.size() != 2) throw std::runtime_error("Expected a pair argument");
+        return {Convert<A>::from(value.items[0]), Convert<B>::from(value.items[1])};
+    }
+    static void dump(std::ostream& out, const std::pair<A, B>& value) {
+        out << '[';
+        Convert<A>::dump(out, value.first);
+        out << ',';
+        Convert<B>::dump(out, value.second);
+        out << ']';
+    }
+};
+
+template <class T>
+struct Convert<std::map<std::string, T>> {
+    static std::map<std::string, T> from(const Json& value) {
+        if (value.kind != Json::Object) throw std::runtime_error("Expected an object argument");
+        std::map<std::string, T> items;
+        for (const auto& field : value.fields) items[field.first] = Convert<T>::from(field.second);
+        return items;
+    }
+    static void dump(std::ostream& out, const std::map<std::string, T>& value) {
+        out << '{';
+        bool first = true;
+        for (const auto& field : value) {
+            if (!first) out << ',';
+            first = false;
+            dump_string(out, field.first);
+            out << ':';
+            Convert<T>::dump(out, field.second);
+        }
+        out << '}';
+    }
+};
+
+template <class R, class... A, std::size_t... I>
+std::string invoke(R (*function)(A...), const Json& args, std::index_sequence<I...>) {
+    std::tuple<std::decay_t<A>...> values{Convert<std::decay_t<A>>::from(args.items[I])...};
+    std::ostringstream out;
+    if constexpr (std::is_void_v<R>) {
+        std::apply(function, values);
+        out << "null";
+    } else {
+        auto result = std::apply(function, values);
+        Convert<std::decay_t<R>>::dump(out, result);
+    }
+    return out.str();
+}
+
+// VmHWM: this process's peak resident memory so far, in KB (0 if unavailable)
+long peak_rss_kb() {
+    std::ifstream status("/proc/self/status");
+    std::string field;
+    while (status >> field) {
+        if (field == "VmHWM:") {
+            long kb = 0;
+            status >> kb;
+            return kb;
+        }
+    }
+    return 0;
+}
+
+template <class R, class... A>
+void run_case(R (*function)(A...), const std::string& line, const std::string& token) {
+    std::ostringstream record;
+    auto started = std::chrono::steady_clock::now();
+    std::clock_t cpu_started = std::clock();
+    try {
+        Json args = Parser(line).parse();
+        if (args.kind != Json::Array || args.items.size() != sizeof...(A)) {
+            throw std::runtime_error("Expected " + std::to_string(sizeof...(A)) + " argument(s)");
+        }
+        started = std::chrono::steady_clock::now();
+        cpu_started = std::clock();
+        std::string actual = invoke(function, args, std::index_sequence_for<A...>{});
+        double wall_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - started).count();
+        double cpu_ms = 1000.0 * (std::clock() - cpu_started) / CLOCKS_PER_SEC;
+        record << "{\"ok\":true,\"wall_ms\":" << wall_ms << ",\"cpu_ms\":" << cpu_ms << ",\"actual\":" << actual << '}';
+    } catch (const std::exception& e) {
+        double wall_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - started).count();
+        double cpu_ms = 1000.0 * (std::clock() - cpu_started) / CLOCKS_PER_SEC;
+        record << "{\"ok\":false,\"wall_ms\":" << wall_ms << ",\"cpu_ms\":" << cpu_ms << ",\"error\":";
+        dump_string(record, e.what());
+        record << '}';
+    } catch (...) {
+        record << "{\"ok\":false,\"error\":\"Unknown exception\"}";
+    }
+    std::string text = record.str();
+    text.insert(text.size() - 1, ",\"rss_kb\":" + std::to_string(peak_rss_kb()));
+    std::cout << std::flush;
+    std::cout << "\n\x1e" << token << text << std::endl;
+}
+
+}  // namespace hireed_harness
+
+int main() {
+    std::vector<std::string> lines;
+    std::string line;
+    while (std::getline(std::cin, line)) {
+        if (!line.empty()) lines.push_back(line);
+    }
+    if (lines.empty()) return 0;
+    for (size_t i = 1; i < lines.size(); ++i) {
+        hireed_harness::run_case(__ENTRYPOINT__, lines[i], lines[0]);
+    }
+    return 0;
+}
@@ -0,0 +1,115 @@
+// ---------------- HireED batch harness (built alongside the submission) ----------------
+// Reads the run's record token and then one JSON argument array per line from stdin,
+// decodes each argument into the entrypoint's parameter type via reflection, and writes
+// one token-prefixed result record per case. Sticks to Go 1.15 APIs (Debian bullseye).
+package main
+
+import (
+	"bufio"
+	"encoding/json"
+	"fmt"
+	"io/ioutil"
+	"os"
+	"reflect"
+	"strconv"
+	"strings"
+	"syscall"
+	"time"
+)
+
+// hireedCPUTime is the process's user plus system CPU time so far
+func hireedCPUTime() time.Duration {
+	var usage syscall.Rusage
+	if err := syscall.Getrusage(syscall.RUSAGE_SELF, &usage); err != nil {
+		return 0
+	}
+	return time.Duration(usage.Utime.Nano() + usage.Stime.Nano())
+}
+
+// hireedPeakRSS is VmHWM, the process's peak resident memory so far in KB (0 if unavailable)
+func hireedPeakRSS() int64 {
+	status, err := ioutil.ReadFile("/proc/self/status")
+	if err != nil {
+		return 0
+	}
+	for _, line := range strings.Split(string(status), "\n") {
+		if strings.HasPrefix(line, "VmHWM:") {
+			kb, _ := strconv.ParseInt(strings.Fields(line)[1], 10, 64)
+			return kb
+		}
+	}
+	return 0
+}
+
+func hireedRunCase(function reflect.Value, line string) (record map[string]interface{}) {
+	record = map[string]interface{}{"ok": false}
+	functionType := function.Type()
+
+	var raw []json.RawMessage
+	if err := json.Unmarshal([]byte(line), &raw); err != nil {
+		record["error"] = "Malformed test input: " + err.Error()
+		return
+	}
+	if len(raw) != functionType.NumIn() {
+		record["error"] = fmt.Sprintf("Expected %d argument(s), got %d", functionType.NumIn(), len(raw))
+		return
+	}
+	args := make([]reflect.Value, len(raw))
+	for i, value := range raw {
+		target := reflect.New(functionType.In(i))
+		if err := json.Unmarshal(value, target.Interface()); err != nil {
+			record["error"] = fmt.Sprintf("Cannot convert argument %d: %s", i+1, err.Error())
+			return
+		}
+		args[i] = target.Elem()
+	}
+
+	started, cpuStarted := time.Now(), hireedCPUTime()
+	defer func() {
+		record["wall_ms"] = float64(time.Since(started).Microseconds()) / 1000
+		record["cpu_ms"] = float64((hireedCPUTime() - cpuStarted).Microseconds()) / 1000
+		if recovered := recover(); recovered != nil {
+			record["ok"] = false
+			record["error"] = fmt.Sprintf("panic: %v", recovered)
+		}
+	}()
+	results := function.Call(args)
+	var actual interface{}
+	if len(results) == 1 {
+		actual = results[0].Interface()
+	} else if len(results) > 1 {
+		values := make([]interface{}, len(results))
+		for i, result := range results {
+			values[i] = result.Interface()
+		}
+		actual = values
+	}
+	record["ok"] = true
+	record["actual"] = actual
+	return
+}
+
+func main() {
+	function := reflect.ValueOf(__ENTRYPOINT__)
+	scanner := bufio.NewScanner(os.Stdin)
+	scanner.Buffer(make([]byte, 1024*1024), 64*1024*1024)
+	var lines []string
+	for scanner.Scan() {
+		if len(scanner.Bytes()) > 0 {
+			lines = append(lines, scanner.Text())
+		}
+	}
+	if len(lines) == 0 {
+		return
+	}
+	prefix := []byte("\n\x1e" + lines[0])
+	for _, line := range lines[1:] {
+		record := hireedRunCase(function, line)
+		record["rss_kb"] = hireedPeakRSS()
+		encoded, err := json.Marshal(record)
+		if err != nil {
+			encoded, _ = json.Marshal(map[string]interface{}{"ok": false, "error": "Cannot encode result: " + err.Error()})
+		}
+		os.Stdout.Write(append(append(append([]byte{}, prefix...), encoded...), '\n'))
+	}
+}
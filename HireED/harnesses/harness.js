@@ -0,0 +1,58 @@
+
+// ---------------- HireED batch harness (appended after the submission) ----------------
+// Reads the run's record token and then one JSON argument array per line from stdin,
+// calls the entrypoint and writes one token-prefixed result record per case.
+;(function hireedHarness() {
+    const entry = (function () {
+        if (typeof __ENTRYPOINT__ === 'function') return __ENTRYPOINT__;
+        if (typeof module.exports === 'function') return module.exports;
+        return module.exports && module.exports.__ENTRYPOINT__;
+    })();
+    const fs = require('fs');
+    const lines = fs.readFileSync(0, 'utf8').split('\n').filter((line) => line.trim());
+    const token = lines.shift() || '';
+    // VmHWM: the process's peak resident memory so far, in KB
+    const peakRssKb = () => {
+        try {
+            const match = /VmHWM:\s*(\d+)/.exec(fs.readFileSync('/proc/self/status', 'utf8'));
+            return match ? Number(match[1]) : 0;
+        } catch (e) {
+            return 0;
+        }
+    };
+    const write = (record) => {
+        record.rss_kb = peakRssKb();
+        let encoded;
+        try {
+            encoded = JSON.stringify(record, (key, value) => {
+                if (typeof value === 'bigint') return Number(value);
+                if (value instanceof Set) return Array.from(value);
+                if (value instanceof Map) return Object.fromEntries(value);
+                return value;
+            });
+        } catch (e) {
+            encoded = JSON.stringify({ ok: false, error: 'Cannot encode result: ' + e.message });
+        }
+        process.stdout.write('\n\x1e' + token + encoded + '\n');
+    };
+
+    for (const line of lines) {
+        if (typeof entry !== 'function') {
+            write({ ok: false, error: "Your code must define a '__ENTRYPOINT__' function" });
+            continue;
+        }
+        const started = process.hrtime.bigint();
+        const cpuStarted = process.cpuUsage();
+        const elapsed = () => Number(process.hrtime.bigint() - started) / 1e6;
+        const cpu = () => {
+            const { user, system } = process.cpuUsage(cpuStarted);
+            return (user + system) / 1000;
+        };
+        try {
+            const actual = entry(...JSON.parse(line));
+            write({ ok: true, wall_ms: elapsed(), cpu_ms: cpu(), actual: actual === undefined ? null : actual });
+        } catch (e) {
+            write({ ok: false, wall_ms: elapsed(), cpu_ms: cpu(), error: e instanceof Error ? `${e.name}: ${e.message}` : String(e) });
+        }
+    }
+})();
@@ -0,0 +1,111 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+
+class InterviewSessionStore:
+    """
+    Server-side interview conversations keyed by session id.
+
+    Sessions live in an LRU map and expire after idle_ttl_seconds without a turn.
+    When a Mongo collection is attached every change is written through, so a
+    session evicted from memory (or created by another worker) can be reloaded.
+    """
+
+    def __init__(self, max_sessions=1000, idle_ttl_seconds=2 * 3600):
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._sessions = OrderedDict()  # session_id -> session dict
+        self._collection = None
+        self._lock = threading.Lock()
+
+    def attach_collection(self, collection):
+        self._collection = collection
+        if collection is None:
+            return
+        try:
+            collection.create_index('updatedAt', expireAfterSeconds=int(self.idle_ttl_seconds))
+        except Exception as e:
+            print(f"Interview session persistence error: {e}")
+
+    def create(self, job_type, messages):
+        session_id = uuid.uuid4().hex
+        session = {'job_type': job_type, 'messages': list(messages), 'touched_at': time.monotonic()}
+        with self._lock:
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._persist(session_id, {'$set': {
+            'job_type': job_type,
+            'messages': session['messages'],
+            'updatedAt': datetime.utcnow()
+        }}, upsert=True)
+        return session_id
+
+    def get(self, session_id):
+        """Return the session dict, reloading it from Mongo if it was evicted, or None"""
+        if not session_id:
+            return None
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                if time.monotonic() - session['touched_at'] > self.idle_ttl_seconds:
+                    del self._sessions[session_id]
+                    return None
+                self._sessions.move_to_end(session_id)
+                return session
+        session = self._load(session_id)
+        if session is not None:
+            with self._lock:
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+        return session
+
+    def append(self, session_id, *messages):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            # Evicted since get(): Mongo still holds the session, so the turn is only written there
+            if session is not None:
+                session['messages'].extend(messages)
+                session['touched_at'] = time.monotonic()
+                self._sessions.move_to_end(session_id)
+        self._persist(session_id, {
+            '$push': {'messages': {'$each': list(messages)}},
+            '$set': {'updatedAt': datetime.utcnow()}
+        })
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        if self._collection is not None:
+            try:
+                self._collection.delete_one({'_id': session_id})
+            except Exception as e:
+                print(f"Interview session persistence error: {e}")
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _persist(self, session_id, update, upsert=False):
+        if self._collection is None:
+            return
+        try:
+            self._collection.update_one({'_id': session_id}, update, upsert=upsert)
+        except Exception as e:
+            print(f"Interview session persistence error: {e}")
+
+    def _load(self, session_id):
+        if self._collection is None:
+            return None
+        try:
+            doc = self._collection.find_one({'_id': session_id})
+        except Exception as e:
+            print(f"Interview session persistence error: {e}")
+            return None
+        if doc is None:
+            return None
+        return {'job_type': doc.get('job_type', ''), 'messages': doc.get('messages', []),
+                'touched_at': time.monotonic()}
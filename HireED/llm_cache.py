@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+def cache_key(model, messages, **params):
+    """Content address of a chat completion: sha256 over (model, messages, parameters)"""
+    payload = json.dumps({'model': model, 'messages': messages, 'params': params},
+                         sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries=5000, ttl_seconds=86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SqliteBackend:
+    """On-disk LRU cache with per-entry TTL, shareable between worker processes"""
+
+    PRUNE_EVERY = 100  # Writes between LRU trims
+
+    def __init__(self, path, max_entries=50000, ttl_seconds=86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+
+    def _connect(self):
+        # sqlite connections can't be shared across threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute("SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, stored_at = row
+        now = time.time()
+        if now - stored_at > self.ttl_seconds:
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return value
+
+    def set(self, key, value):
+        conn = self._connect()
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO llm_cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                     (key, value, now, now))
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune(conn, now)
+
+    def _prune(self, conn, now):
+        conn.execute("DELETE FROM llm_cache WHERE stored_at < ?", (now - self.ttl_seconds,))
+        conn.execute("""
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class LLMCache:
+    """Caches chat completion text by content address in front of a Groq client"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(**kwargs):
+        return cache_key(kwargs.get('model'), kwargs.get('messages'),
+                         **{k: v for k, v in kwargs.items() if k not in ('model', 'messages')})
+
+    def get(self, **kwargs):
+        """Cached completion text for the request kwargs, or None (counts a hit or miss)"""
+        try:
+            cached = self.backend.get(self.key_for(**kwargs))
+        except Exception as e:
+            print(f"LLM cache read error: {e}")
+            cached = None
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    def put(self, content, **kwargs):
+        try:
+            self.backend.set(self.key_for(**kwargs), content)
+        except Exception as e:
+            print(f"LLM cache write error: {e}")
+
+    def completion(self, client, validate=None, **kwargs):
+        """
+        Return the completion text for kwargs, calling client only on a miss.
+
+        validate, if given, is called with the fresh text and must raise for
+        responses that shouldn't be cached (e.g. malformed JSON).
+        """
+        cached = self.get(**kwargs)
+        if cached is not None:
+            return cached
+
+        response = client.chat.completions.create(**kwargs)
+        return self._store(response, validate, kwargs)
+
+    async def acompletion(self, client, validate=None, **kwargs):
+        """completion() for an async client such as AsyncLLMGateway"""
+        cached = self.get(**kwargs)
+        if cached is not None:
+            return cached
+
+        response = await client.chat.completions.create(**kwargs)
+        return self._store(response, validate, kwargs)
+
+    def _store(self, response, validate, kwargs):
+        content = response.choices[0].message.content.strip()
+        if validate is not None:
+            validate(content)
+        self.put(content, **kwargs)
+        return content
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0
+        }
+
+
+def create_cache_from_env():
+    """Build the cache selected by LLM_CACHE_BACKEND (memory or sqlite)"""
+    backend_name = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    ttl_seconds = int(os.getenv("LLM_CACHE_TTL", "86400"))
+    max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+    if backend_name == "sqlite":
+        path = os.getenv("LLM_CACHE_PATH") or os.path.join(tempfile.gettempdir(), "hireed_llm_cache.sqlite3")
+        return LLMCache(SqliteBackend(path, max_entries=max_entries, ttl_seconds=ttl_seconds))
+    return LLMCache(MemoryBackend(max_entries=max_entries, ttl_seconds=ttl_seconds))
+
+
+# Shared by every module in the process so identical prompts hit the same entries
+response_cache = create_cache_from_env()
@@ -0,0 +1,603 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from types import SimpleNamespace
+
+import httpx
+from dotenv import load_dotenv
+from groq import APIConnectionError, APIStatusError, APITimeoutError, AsyncGroq, Groq
+
+from llm_cache import LLMCache
+from llm_scheduler import FairScheduler, LLMOverloaded, current_context, llm_context
+from model_router import ModelRouter, create_router_from_env
+from single_flight import SingleFlight
+
+load_dotenv()
+
+DEFAULT_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+
+
+class LLMUnavailable(Exception):
+    """Raised instead of calling Groq when the circuit is open or the call's deadline has passed"""
+
+
+def is_retryable(error):
+    """429s, 5xxs, timeouts and dropped connections are worth another try; 4xx request errors are not"""
+    if isinstance(error, (APITimeoutError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and (error.status_code == 429 or error.status_code >= 500)
+
+
+def chunk_usage(chunk):
+    """Token usage Groq attaches to the last chunk of a stream"""
+    x_groq = getattr(chunk, 'x_groq', None)
+    return getattr(x_groq, 'usage', None) if x_groq is not None else None
+
+
+def retry_after_seconds(error):
+    """The server's Retry-After hint in seconds, if it sent one"""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold upstream failures in a row the circuit opens and calls
+    fail fast for reset_seconds. Then a single probe call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half_open' if time.monotonic() - self.opened_at >= self.reset_seconds else 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self.probing:
+                    print(f"LLM circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class LLMMetrics:
+    """Per-model call counts, latency percentiles and token usage"""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, model):
+        entry = self._models.get(model)
+        if entry is None:
+            entry = self._models[model] = {
+                'calls': 0, 'failures': 0, 'retries': 0, 'fast_failures': 0,
+                'prompt_tokens': 0, 'completion_tokens': 0, 'latencies': deque(maxlen=self.window)
+            }
+        return entry
+
+    def record(self, model, latency_ms=None, usage=None, failed=False, retries=0, fast_failed=False):
+        with self._lock:
+            entry = self._entry(model)
+            entry['calls'] += 1
+            entry['retries'] += retries
+            entry['failures'] += failed
+            entry['fast_failures'] += fast_failed
+            if latency_ms is not None and not failed:
+                entry['latencies'].append(latency_ms)
+            if usage is not None:
+                entry['prompt_tokens'] += getattr(usage, 'prompt_tokens', 0) or 0
+                entry['completion_tokens'] += getattr(usage, 'completion_tokens', 0) or 0
+
+    def percentile(self, model, fraction, min_samples=20):
+        """Latency (ms) under which `fraction` of the model's recent successful calls finished, or None"""
+        with self._lock:
+            latencies = sorted(self._entry(model)['latencies'])
+        if len(latencies) < min_samples:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+    def stats(self):
+        with self._lock:
+            models = {}
+            for model, entry in self._models.items():
+                latencies = sorted(entry['latencies'])
+                summary = {key: value for key, value in entry.items() if key != 'latencies'}
+                if latencies:
+                    summary['latency_ms'] = {
+                        'p50': round(latencies[len(latencies) // 2], 1),
+                        'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+                        'max': round(latencies[-1], 1),
+                        'avg': round(sum(latencies) / len(latencies), 1)
+                    }
+                models[model] = summary
+            return models
+
+
+class LLMGateway:
+    """
+    The one Groq client for the whole process.
+
+    Owns a keep-alive connection pool and wraps every chat completion with a
+    per-attempt timeout and an overall deadline, jittered exponential retry on
+    429/5xx/timeouts (honouring Retry-After), a circuit breaker that fails fast
+    with LLMUnavailable while Groq is degraded, and latency/token metrics.
+
+    gateway.chat.completions.create(**kwargs) mirrors the Groq SDK, so existing
+    call sites (and LLMCache.completion) work unchanged; pass deadline=seconds
+    to bound a call including its retries. Every attempt first takes a token from
+    the scheduler under the caller's llm_context priority and student.
+
+    Pass task='hint' (etc.) instead of a model to let the router pick the model
+    tier for that task and feed it the call's latency.
+
+    Pass hedge=True on latency-sensitive calls: if the call hasn't answered by
+    the model's hedge_percentile latency, an identical second call is fired and
+    whichever answers first wins. At most hedge_ratio of hedge-eligible calls
+    are hedged, so a slow Groq doesn't get twice the traffic.
+
+    Identical non-streaming calls (same model, messages and parameters) made
+    while one is already in flight wait for and share its response instead of
+    going to Groq again. Tasks in coalesce_exclude, such as question generation
+    whose callers send the same prompt several times on purpose to get different
+    answers, never do; pass
+    coalesce=True/False to decide for a single call.
+    """
+
+    def __init__(self, api_key=None, timeout=30.0, connect_timeout=5.0, deadline=60.0, max_retries=2,
+                 backoff_base=0.5, backoff_max=8.0, pool_size=20, breaker=None, scheduler=None, router=None,
+                 coalesce=True, coalesce_exclude=(), hedge_percentile=0.95, hedge_ratio=0.1):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker()
+        self.scheduler = scheduler or FairScheduler(rate_per_minute=0)
+        self.router = router or ModelRouter({'fast': DEFAULT_MODEL, 'standard': DEFAULT_MODEL})
+        self.metrics = LLMMetrics()
+        self.coalesce = coalesce
+        self.coalesce_exclude = set(coalesce_exclude)
+        self.flights = SingleFlight()
+        self.hedge_percentile = hedge_percentile
+        self.hedge_ratio = hedge_ratio
+        self._hedges = {'eligible': 0, 'hedged': 0, 'hedge_won': 0}
+        self._hedge_lock = threading.Lock()
+        self._hedge_executor = None
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @property
+    def client(self):
+        """The underlying Groq client, created on first use so importing never needs the API key"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    http_client = httpx.Client(
+                        timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                        limits=httpx.Limits(max_connections=self.pool_size,
+                                            max_keepalive_connections=self.pool_size,
+                                            keepalive_expiry=60.0)
+                    )
+                    # Retries are ours (with the breaker in the loop), so the SDK's own are off
+                    self._client = Groq(api_key=self.api_key, max_retries=0, http_client=http_client)
+        return self._client
+
+    def _backoff(self, attempt, error):
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        hinted = retry_after_seconds(error)
+        if hinted is not None:
+            return min(self.backoff_max, hinted)
+        return random.uniform(delay / 2, delay)
+
+    def _deadline_check(self, model, ends_at, attempt):
+        """Seconds left before the call's deadline; raises LLMUnavailable once it has passed"""
+        remaining = ends_at - time.monotonic()
+        if remaining <= 0:
+            self.metrics.record(model, failed=True, retries=attempt)
+            raise LLMUnavailable("LLM call deadline exceeded")
+        return remaining
+
+    def _queue_timeout(self, remaining):
+        """How long to queue for a rate-limit token, or None to skip queueing for an open circuit"""
+        if self.breaker.state == 'open':
+            return None
+        priority, _ = current_context()
+        return min(remaining, self.scheduler.budgets[priority])
+
+    def _allow(self, model, attempt):
+        if not self.breaker.allow():
+            self.metrics.record(model, failed=True, retries=attempt, fast_failed=True)
+            raise LLMUnavailable("LLM service is temporarily unavailable")
+
+    def _retry_delay(self, error, model, task, attempt, started, ends_at):
+        """Book-keeping for a failed attempt: the delay before retrying, or None to give up and re-raise"""
+        if not is_retryable(error):
+            # Groq answered; a bad request is our problem, not a sign it's degraded
+            self.breaker.record_success()
+            self.metrics.record(model, failed=True, retries=attempt)
+            return None
+        self.breaker.record_failure()
+        if task:
+            # A timed-out or overloaded attempt counts as slow for routing
+            self.router.observe(task, model, (time.monotonic() - started) * 1000)
+        delay = self._backoff(attempt, error)
+        if attempt >= self.max_retries or time.monotonic() + delay >= ends_at:
+            self.metrics.record(model, failed=True, retries=attempt)
+            return None
+        print(f"LLM call failed ({type(error).__name__}), retrying in {delay:.1f}s")
+        return delay
+
+    def _succeeded(self, response, model, task, attempt, started):
+        latency_ms = (time.monotonic() - started) * 1000
+        self.breaker.record_success()
+        self.metrics.record(model, latency_ms, getattr(response, 'usage', None), retries=attempt)
+        if task:
+            self.router.observe(task, model, latency_ms)
+        return response
+
+    def _stream_finished(self, model, task, started, retries, usage, failed):
+        latency_ms = (time.monotonic() - started) * 1000
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        self.metrics.record(model, latency_ms, usage, failed=failed, retries=retries)
+        if task:
+            self.router.observe(task, model, latency_ms)
+
+    def _hedge_delay(self, model):
+        """Seconds to wait before hedging a call to model, or None if it shouldn't be hedged"""
+        if self.hedge_ratio <= 0 or self.breaker.state != 'closed':
+            return None
+        threshold_ms = self.metrics.percentile(model, self.hedge_percentile)
+        return threshold_ms / 1000 if threshold_ms is not None else None
+
+    def _take_hedge(self, hedged=False):
+        """Count a hedge-eligible call; with hedged=True, claim a hedge if the ratio allows it"""
+        with self._hedge_lock:
+            if not hedged:
+                self._hedges['eligible'] += 1
+                return False
+            if self._hedges['hedged'] + 1 > self.hedge_ratio * self._hedges['eligible']:
+                return False
+            self._hedges['hedged'] += 1
+            return True
+
+    def _hedge_won(self):
+        with self._hedge_lock:
+            self._hedges['hedge_won'] += 1
+
+    def _coalesces(self, task, kwargs, coalesce):
+        if kwargs.get('stream'):
+            return False
+        if coalesce is not None:
+            return coalesce
+        return self.coalesce and task not in self.coalesce_exclude
+
+    def create(self, deadline=None, task=None, coalesce=None, hedge=False, **kwargs):
+        """chat.completions.create with retries, deadline and circuit breaker; streams are retried until they open"""
+        kwargs.setdefault('model', self.router.model_for(task) if task else DEFAULT_MODEL)
+        if kwargs.get('stream'):
+            hedge = False
+        call = self._hedged if hedge else self._create
+        if not self._coalesces(task, kwargs, coalesce):
+            return call(deadline, task, **kwargs)
+        try:
+            return self.flights.do(LLMCache.key_for(**kwargs), lambda: call(deadline, task, **kwargs),
+                                   timeout=deadline or self.deadline, label=task or kwargs['model'])
+        except FutureTimeout:  # not the builtin TimeoutError before Python 3.11
+            raise LLMUnavailable("LLM call deadline exceeded")
+
+    def _hedged(self, deadline, task, **kwargs):
+        """_create, plus a second identical call if the first is slower than the hedge percentile"""
+        delay = self._hedge_delay(kwargs['model'])
+        self._take_hedge()
+        budget = deadline or self.deadline
+        if delay is None or delay >= budget:
+            return self._create(deadline, task, **kwargs)
+        if self._hedge_executor is None:
+            with self._client_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(max_workers=self.pool_size * 2,
+                                                              thread_name_prefix='llm-hedge')
+        context = current_context()
+
+        def run(seconds):
+            with llm_context(*context):
+                return self._create(seconds, task, **kwargs)
+
+        first = self._hedge_executor.submit(run, budget)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        if not self._take_hedge(hedged=True):
+            return first.result()
+        # The loser is left to finish (or time out) on its own; a blocking HTTP call can't be interrupted
+        hedge = self._hedge_executor.submit(run, budget - delay)
+        pending, error = {first, hedge}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._hedge_won()
+                    return future.result()
+                if future is first or error is None:
+                    error = future.exception()
+        raise error
+
+    def _create(self, deadline, task, **kwargs):
+        model = kwargs['model']
+        ends_at = time.monotonic() + (deadline or self.deadline)
+        attempt = 0
+        while True:
+            remaining = self._deadline_check(model, ends_at, attempt)
+            # Don't queue for a rate-limit token only to be refused by an open circuit
+            queue_timeout = self._queue_timeout(remaining)
+            if queue_timeout is not None:
+                try:
+                    self.scheduler.acquire(*current_context(), timeout=queue_timeout)
+                except LLMOverloaded:
+                    self.metrics.record(model, failed=True, retries=attempt, fast_failed=True)
+                    raise
+            self._allow(model, attempt)
+            started = time.monotonic()
+            try:
+                response = self.client.chat.completions.create(timeout=min(self.timeout, ends_at - started), **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, model, task, attempt, started, ends_at)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            if kwargs.get('stream'):
+                return self._measure_stream(response, model, started, attempt, task)
+            return self._succeeded(response, model, task, attempt, started)
+
+    def _measure_stream(self, stream, model, started, retries, task=None):
+        """Pass a stream through, recording it once it finishes (usage arrives on the last chunk)"""
+        usage, failed = None, False
+        try:
+            for chunk in stream:
+                usage = chunk_usage(chunk) or usage
+                yield chunk
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._stream_finished(model, task, started, retries, usage, failed)
+
+    def stats(self):
+        return {'circuit': self.breaker.state, 'consecutive_failures': self.breaker.failures,
+                'models': self.metrics.stats(), 'scheduler': self.scheduler.stats(), 'routing': self.router.stats(),
+                'coalescing': self.flights.stats(), 'hedging': dict(self._hedges)}
+
+
+class AsyncLLMGateway:
+    """
+    LLMGateway for coroutines, used by the ASGI app (asgi.py).
+
+    Shares the wrapped gateway's breaker, scheduler, router and metrics, so both
+    serving modes see one rate limit and one circuit, but awaits Groq through
+    AsyncGroq clients on their own connections: a request waiting on the LLM
+    costs a suspended coroutine rather than a thread.
+
+    The pool_size connections are split over several clients of shard_size,
+    used in turn. httpcore re-checks every connection in a pool on each request,
+    and in async mode that check is costly enough that one pool of hundreds
+    would spend more CPU on bookkeeping than on the calls.
+    """
+
+    def __init__(self, gateway, pool_size=200, shard_size=16):
+        self.gateway = gateway
+        self.pool_size = pool_size
+        self.shard_size = max(1, min(shard_size, pool_size))
+        self.scheduler = gateway.scheduler
+        self._clients = None
+        self._turn = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @property
+    def client(self):
+        # Created on first use, inside the running event loop their connections belong to
+        if self._clients is None:
+            gateway = self.gateway
+            shards = -(-self.pool_size // self.shard_size)
+            self._clients = [
+                AsyncGroq(api_key=gateway.api_key, max_retries=0, http_client=httpx.AsyncClient(
+                    timeout=httpx.Timeout(gateway.timeout, connect=gateway.connect_timeout),
+                    limits=httpx.Limits(max_connections=self.shard_size,
+                                        max_keepalive_connections=self.shard_size,
+                                        keepalive_expiry=60.0)
+                ))
+                for _ in range(shards)
+            ]
+        # Only ever touched from the event loop thread, so no lock
+        self._turn = (self._turn + 1) % len(self._clients)
+        return self._clients[self._turn]
+
+    async def create(self, deadline=None, task=None, coalesce=None, hedge=False, **kwargs):
+        """await-able LLMGateway.create; coalesces with the wrapped gateway's in-flight calls too"""
+        gateway = self.gateway
+        kwargs.setdefault('model', gateway.router.model_for(task) if task else DEFAULT_MODEL)
+        if kwargs.get('stream'):
+            hedge = False
+        call = self._hedged if hedge else self._create
+        if not gateway._coalesces(task, kwargs, coalesce):
+            return await call(deadline, task, **kwargs)
+        try:
+            return await gateway.flights.ado(LLMCache.key_for(**kwargs), lambda: call(deadline, task, **kwargs),
+                                             timeout=deadline or gateway.deadline, label=task or kwargs['model'])
+        except asyncio.TimeoutError:
+            raise LLMUnavailable("LLM call deadline exceeded")
+
+    async def _hedged(self, deadline, task, **kwargs):
+        """LLMGateway._hedged for coroutines; here the losing call is cancelled"""
+        gateway = self.gateway
+        delay = gateway._hedge_delay(kwargs['model'])
+        gateway._take_hedge()
+        budget = deadline or gateway.deadline
+        if delay is None or delay >= budget:
+            return await self._create(deadline, task, **kwargs)
+        first = asyncio.ensure_future(self._create(budget, task, **kwargs))
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+            if not gateway._take_hedge(hedged=True):
+                return await first
+            hedge = asyncio.ensure_future(self._create(budget - delay, task, **kwargs))
+            pending.add(hedge)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task_done in done:
+                    if task_done.exception() is None:
+                        if task_done is hedge:
+                            gateway._hedge_won()
+                        return task_done.result()
+                    if task_done is first or error is None:
+                        error = task_done.exception()
+            raise error
+        finally:
+            for leftover in pending:
+                leftover.cancel()
+
+    async def _create(self, deadline, task, **kwargs):
+        gateway = self.gateway
+        model = kwargs['model']
+        ends_at = time.monotonic() + (deadline or gateway.deadline)
+        attempt = 0
+        while True:
+            remaining = gateway._deadline_check(model, ends_at, attempt)
+            queue_timeout = gateway._queue_timeout(remaining)
+            if queue_timeout is not None:
+                try:
+                    await gateway.scheduler.acquire_async(*current_context(), timeout=queue_timeout)
+                except LLMOverloaded:
+                    gateway.metrics.record(model, failed=True, retries=attempt, fast_failed=True)
+                    raise
+            gateway._allow(model, attempt)
+            started = time.monotonic()
+            try:
+                response = await self.client.chat.completions.create(
+                    timeout=min(gateway.timeout, ends_at - started), **kwargs)
+            except Exception as e:
+                delay = gateway._retry_delay(e, model, task, attempt, started, ends_at)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            if kwargs.get('stream'):
+                return self._measure_stream(response, model, started, attempt, task)
+            return gateway._succeeded(response, model, task, attempt, started)
+
+    async def _measure_stream(self, stream, model, started, retries, task=None):
+        usage, failed = None, False
+        try:
+            async for chunk in stream:
+                usage = chunk_usage(chunk) or usage
+                yield chunk
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.gateway._stream_finished(model, task, started, retries, usage, failed)
+
+    async def aclose(self):
+        clients, self._clients = self._clients or [], None
+        for client in clients:
+            await client.close()
+
+    def stats(self):
+        return self.gateway.stats()
+
+
+def create_gateway_from_env():
+    return LLMGateway(
+        api_key=os.getenv("GROQ_API_KEY"),
+        timeout=float(os.getenv("LLM_TIMEOUT", "30")),
+        connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT", "5")),
+        deadline=float(os.getenv("LLM_DEADLINE", "60")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+        pool_size=int(os.getenv("LLM_POOL_SIZE", "20")),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+            reset_seconds=float(os.getenv("LLM_BREAKER_RESET", "30"))
+        ),
+        # LLM_RATE_PER_MINUTE=0 turns scheduling off
+        scheduler=FairScheduler(
+            rate_per_minute=float(os.getenv("LLM_RATE_PER_MINUTE", "60")),
+            burst=int(os.getenv("LLM_RATE_BURST", "10")),
+            reserve=int(os.getenv("LLM_INTERACTIVE_RESERVE", "2")),
+            budgets={
+                'interactive': float(os.getenv("LLM_QUEUE_BUDGET_INTERACTIVE", "10")),
+                'grading': float(os.getenv("LLM_QUEUE_BUDGET_GRADING", "20")),
+                'bulk': float(os.getenv("LLM_QUEUE_BUDGET_BULK", "30"))
+            }
+        ),
+        router=create_router_from_env(DEFAULT_MODEL),
+        # Question generation sends the same prompt again on purpose (aptitude slots, pool refills,
+        # regenerated challenges) and needs a different question back each time
+        coalesce=os.getenv("LLM_COALESCE", "1") != "0",
+        coalesce_exclude=[task.strip() for task in
+                          os.getenv("LLM_COALESCE_EXCLUDE", "aptitude_question,challenge,mcq").split(",")
+                          if task.strip()],
+        hedge_percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95")),
+        # LLM_HEDGE_RATIO=0 turns hedging off
+        hedge_ratio=float(os.getenv("LLM_HEDGE_RATIO", "0.1"))
+    )
+
+
+# Shared by every module in the process: one connection pool, one breaker, one set of metrics
+gateway = create_gateway_from_env()
+# The ASGI app's handlers await this one; its pool is sized for many concurrent in-flight calls
+async_gateway = AsyncLLMGateway(gateway, pool_size=int(os.getenv("LLM_ASYNC_POOL_SIZE", "200")))
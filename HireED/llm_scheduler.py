@@ -0,0 +1,249 @@
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Highest priority first: live interview turns, then grading a submission, then question generation
+PRIORITIES = ('interactive', 'grading', 'bulk')
+
+# (priority, student id) of the LLM calls made by the current request; background work is bulk
+_request_context = ContextVar('llm_request_context', default=('bulk', ''))
+
+
+class LLMOverloaded(RuntimeError):
+    """The LLM queue is too long for this priority; retry_after is a hint in whole seconds"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.retry_after = max(1, int(math.ceil(retry_after)))
+
+
+class _Waiter:
+    __slots__ = ('granted',)  # Compared by identity, so a timed-out waiter removes only itself
+
+    def __init__(self):
+        self.granted = False
+
+
+@contextmanager
+def llm_context(priority, student_id=''):
+    """Make LLM calls in this block queue under priority, fair-shared per student_id"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority {priority!r}")
+    token = _request_context.set((priority, student_id or ''))
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+def current_context():
+    """(priority, student id) to re-enter with llm_context in worker threads"""
+    return _request_context.get()
+
+
+def iterate_in_context(iterable):
+    """
+    Iterate under the caller's llm_context later on, e.g. for a streaming response
+    body that only runs after the view (and its llm_context block) has returned.
+    """
+    priority, student_id = current_context()
+
+    def run():
+        with llm_context(priority, student_id):
+            yield from iterable
+    return run()
+
+
+def aiterate_in_context(iterable):
+    """iterate_in_context for async iterables"""
+    priority, student_id = current_context()
+
+    async def run():
+        with llm_context(priority, student_id):
+            async for item in iterable:
+                yield item
+    return run()
+
+
+class FairScheduler:
+    """
+    Token bucket in front of every LLM call, with priority classes and per-student fair queuing.
+
+    Tokens refill at rate_per_minute up to burst. A waiting call is granted a token
+    in strict priority order and, within a priority, round-robin across students,
+    so one student's 50-question batch can't starve everyone else's. Lower
+    priorities never take the last `reserve` tokens, leaving headroom for an
+    interview turn that arrives mid-spike.
+
+    admit() is the admission check done up front by a request: it estimates the
+    wait from the queue ahead of it and raises LLMOverloaded when that exceeds
+    the priority's budget. acquire() waits for a token, giving up at its timeout;
+    acquire_async() is the same for coroutines and shares the same queues.
+    """
+
+    def __init__(self, rate_per_minute=60.0, burst=10, reserve=2, budgets=None):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.reserve = min(reserve, max(0, burst - 1))
+        self.budgets = dict({'interactive': 10.0, 'grading': 20.0, 'bulk': 30.0}, **(budgets or {}))
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queues = {priority: OrderedDict() for priority in PRIORITIES}  # student -> deque of waiters
+        self._condition = threading.Condition()
+        self._stats = {priority: {'granted': 0, 'rejected': 0, 'timed_out': 0, 'waits': deque(maxlen=1000)}
+                       for priority in PRIORITIES}
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _queued(self, up_to_priority):
+        """Waiters at up_to_priority or above, i.e. everyone served before a new arrival"""
+        total = 0
+        for priority in PRIORITIES[:PRIORITIES.index(up_to_priority) + 1]:
+            total += sum(len(waiters) for waiters in self._queues[priority].values())
+        return total
+
+    def _next_waiter(self):
+        """Pop the waiter to serve next, or None if nobody may take a token yet"""
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            if not queue:
+                continue
+            if priority != 'interactive' and self.tokens < 1 + self.reserve:
+                return None
+            student, waiters = next(iter(queue.items()))
+            waiter = waiters.popleft()
+            # Round robin: this student goes to the back of the line for their next call
+            if waiters:
+                queue.move_to_end(student)
+            else:
+                del queue[student]
+            return waiter
+        return None
+
+    def _dispatch(self):
+        """Hand out available tokens; call with the condition held"""
+        self._refill()
+        granted = False
+        while self.tokens >= 1:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            waiter.granted = True
+            self.tokens -= 1
+            granted = True
+        if granted:
+            self._condition.notify_all()
+
+    def estimate_wait(self, priority, calls=1):
+        """Seconds until `calls` more calls at priority would all have a token"""
+        if not self.enabled:
+            return 0.0
+        with self._condition:
+            self._refill()
+            headroom = 0 if priority == 'interactive' else self.reserve
+            needed = self._queued(priority) + calls + headroom - self.tokens
+            return max(0.0, needed) / self.rate
+
+    def admit(self, priority, calls=1):
+        wait = self.estimate_wait(priority, calls)
+        if wait > self.budgets[priority]:
+            with self._condition:
+                self._stats[priority]['rejected'] += 1
+            raise LLMOverloaded(f"LLM queue is full ({wait:.0f}s estimated wait)",
+                                retry_after=wait - self.budgets[priority])
+
+    def _poll(self, priority, student_id, waiter, started, timeout):
+        """
+        Hand out tokens and report on one waiter; call with the condition held.
+        Returns the seconds to wait before polling again, or None once granted.
+        """
+        self._dispatch()
+        if waiter.granted:
+            waited = time.monotonic() - started
+            self._stats[priority]['granted'] += 1
+            self._stats[priority]['waits'].append(waited * 1000)
+            return None
+        remaining = started + timeout - time.monotonic()
+        if remaining <= 0:
+            self._remove(priority, student_id, waiter)
+            self._stats[priority]['timed_out'] += 1
+            raise LLMOverloaded("Timed out waiting for the LLM queue",
+                                retry_after=self.estimate_wait(priority))
+        needed = (1 if priority == 'interactive' else 1 + self.reserve) - self.tokens
+        next_token = max(0.005, needed / self.rate) if needed > 0 else 0.05
+        return min(remaining, next_token)
+
+    def _remove(self, priority, student_id, waiter):
+        waiters = self._queues[priority].get(student_id)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._queues[priority][student_id]
+
+    def acquire(self, priority, student_id='', timeout=None):
+        """Block until this call may go to the LLM; returns the seconds waited"""
+        if not self.enabled:
+            return 0.0
+        timeout = self.budgets[priority] if timeout is None else timeout
+        started = time.monotonic()
+        waiter = _Waiter()
+        with self._condition:
+            self._queues[priority].setdefault(student_id, deque()).append(waiter)
+            while True:
+                delay = self._poll(priority, student_id, waiter, started, timeout)
+                if delay is None:
+                    return time.monotonic() - started
+                self._condition.wait(delay)
+
+    async def acquire_async(self, priority, student_id='', timeout=None):
+        """acquire() for coroutines: polls with asyncio.sleep, so a queued request holds no thread"""
+        if not self.enabled:
+            return 0.0
+        timeout = self.budgets[priority] if timeout is None else timeout
+        started = time.monotonic()
+        waiter = _Waiter()
+        with self._condition:
+            self._queues[priority].setdefault(student_id, deque()).append(waiter)
+        try:
+            while True:
+                with self._condition:
+                    delay = self._poll(priority, student_id, waiter, started, timeout)
+                if delay is None:
+                    return time.monotonic() - started
+                # Another caller's dispatch may grant us in the meantime, so don't sleep long
+                await asyncio.sleep(min(delay, 0.25))
+        except asyncio.CancelledError:
+            with self._condition:
+                if waiter.granted:
+                    self.tokens = min(self.burst, self.tokens + 1)
+                else:
+                    self._remove(priority, student_id, waiter)
+            raise
+
+    def stats(self):
+        with self._condition:
+            self._refill()
+            summary = {'tokens': round(self.tokens, 2), 'rate_per_minute': self.rate * 60, 'classes': {}}
+            for priority in PRIORITIES:
+                entry = self._stats[priority]
+                waits = sorted(entry['waits'])
+                summary['classes'][priority] = {
+                    'queued': sum(len(waiters) for waiters in self._queues[priority].values()),
+                    'granted': entry['granted'],
+                    'rejected': entry['rejected'],
+                    'timed_out': entry['timed_out'],
+                    'wait_ms_p50': round(waits[len(waits) // 2], 1) if waits else None,
+                    'wait_ms_p99': round(waits[min(len(waits) - 1, int(len(waits) * 0.99))], 1) if waits else None
+                }
+            return summary
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+# Fastest first; a task over its latency budget drops one tier down this list
+TIER_ORDER = ('fast', 'standard')
+
+DEFAULT_TASK_TIERS = {
+    'hint': 'fast',
+    'mcq': 'fast',
+    'aptitude_question': 'fast',
+    'interview': 'standard',
+    'resume': 'standard',
+    'code_judgement': 'standard',
+    'challenge': 'standard',
+}
+
+# Milliseconds for a whole response (streams included), averaged over recent calls
+DEFAULT_LATENCY_BUDGETS = {
+    'hint': 3000,
+    'mcq': 8000,
+    'aptitude_question': 4000,
+    'interview': 6000,
+    'resume': 12000,
+    'code_judgement': 10000,
+    'challenge': 15000,
+}
+
+
+def parse_mapping(value, convert=str):
+    """'hint=fast, mcq=standard' -> {'hint': 'fast', 'mcq': 'standard'}"""
+    mapping = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            key, setting = item.split('=', 1)
+            mapping[key.strip()] = convert(setting.strip())
+    return mapping
+
+
+class ModelRouter:
+    """
+    Picks the Groq model for each kind of LLM task.
+
+    Every task maps to a tier (fast or standard) and a latency budget. The router
+    keeps a moving average of each task's latency on each model; when the task's
+    own tier averages over budget, the task is downgraded to the next faster tier
+    for cooldown_seconds. After that the primary tier gets calls again, starting
+    from a fresh average, so one slow call re-downgrades and a fast one sticks.
+    """
+
+    def __init__(self, tiers, task_tiers=None, budgets=None, cooldown_seconds=60.0, smoothing=0.3):
+        self.tiers = tiers
+        self.task_tiers = dict(DEFAULT_TASK_TIERS, **(task_tiers or {}))
+        self.budgets = dict(DEFAULT_LATENCY_BUDGETS, **(budgets or {}))
+        self.cooldown_seconds = cooldown_seconds
+        self.smoothing = smoothing
+        self._latency = {}  # (task, model) -> moving average ms
+        self._downgraded_until = {}
+        self._downgrades = {}
+        self._lock = threading.Lock()
+
+    def primary_model(self, task):
+        return self.tiers[self.task_tiers.get(task, 'standard')]
+
+    def fallback_model(self, task):
+        """The next faster tier's model, or None if the task is already on the fastest"""
+        index = TIER_ORDER.index(self.task_tiers.get(task, 'standard'))
+        return self.tiers[TIER_ORDER[index - 1]] if index > 0 else None
+
+    def model_for(self, task):
+        with self._lock:
+            downgraded = time.monotonic() < self._downgraded_until.get(task, 0)
+        return (downgraded and self.fallback_model(task)) or self.primary_model(task)
+
+    def observe(self, task, model, latency_ms):
+        """Record how long one call for task took on model, downgrading the task if its primary is too slow"""
+        with self._lock:
+            key = (task, model)
+            previous = self._latency.get(key)
+            average = latency_ms if previous is None else previous + self.smoothing * (latency_ms - previous)
+            self._latency[key] = average
+            budget = self.budgets.get(task)
+            if (model != self.primary_model(task) or budget is None or average <= budget
+                    or self.fallback_model(task) is None):
+                return
+            print(f"LLM task '{task}' averaging {average:.0f}ms on {model} (budget {budget}ms), "
+                  f"downgrading for {self.cooldown_seconds:.0f}s")
+            self._downgraded_until[task] = time.monotonic() + self.cooldown_seconds
+            self._downgrades[task] = self._downgrades.get(task, 0) + 1
+            # The probe after the cooldown is judged on its own, not on the slow history
+            del self._latency[key]
+
+    def stats(self):
+        tasks = {}
+        for task in sorted(set(self.task_tiers) | set(self.budgets)):
+            with self._lock:
+                latency = {model: round(ms, 1) for (name, model), ms in self._latency.items() if name == task}
+                downgrades = self._downgrades.get(task, 0)
+            tasks[task] = {
+                'tier': self.task_tiers.get(task, 'standard'),
+                'model': self.model_for(task),
+                'budget_ms': self.budgets.get(task),
+                'latency_ms': latency,
+                'downgrades': downgrades,
+            }
+        return {'tiers': dict(self.tiers), 'tasks': tasks}
+
+
+def create_router_from_env(standard_model):
+    return ModelRouter(
+        tiers={'fast': os.getenv("LLM_FAST_MODEL", "llama-3.1-8b-instant"), 'standard': standard_model},
+        # e.g. LLM_TASK_TIERS="hint=standard,interview=fast", LLM_LATENCY_BUDGETS="interview=4000"
+        task_tiers=parse_mapping(os.getenv("LLM_TASK_TIERS")),
+        budgets=parse_mapping(os.getenv("LLM_LATENCY_BUDGETS"), float),
+        cooldown_seconds=float(os.getenv("LLM_DOWNGRADE_COOLDOWN", "60"))
+    )
@@ -0,0 +1,77 @@
+import hashlib
+import random
+import re
+
+# Largest 61-bit Mersenne prime, used as the modulus for the MinHash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_text(text):
+    """Lowercase, drop punctuation and collapse whitespace so trivial edits don't matter"""
+    text = re.sub(r"[^a-z0-9\s]", " ", (text or "").lower())
+    return " ".join(text.split())
+
+
+def shingles(text, size=5):
+    """Return the set of character shingles of the normalized text"""
+    text = normalize_text(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH index for spotting paraphrased duplicates among generated questions.
+
+    Each text is reduced to a MinHash signature over its character shingles; the
+    signature is split into bands so that only texts sharing a band bucket are
+    compared, keeping lookups close to O(1) regardless of how many texts are stored.
+    """
+
+    def __init__(self, threshold=0.6, num_perm=64, bands=16, shingle_size=5, seed=1337):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._perms = [(rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+                       for _ in range(num_perm)]
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = []
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def signature(self, text):
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+                  for s in shingles(text, self.shingle_size)]
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+                     for a, b in self._perms)
+
+    def _band_keys(self, sig):
+        return [sig[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def add(self, text):
+        """Insert text unless a near-duplicate is already indexed; return True if inserted"""
+        sig = self.signature(text)
+        for band, key in enumerate(self._band_keys(sig)):
+            for candidate in self._buckets[band].get(key, ()):
+                if self.similarity(sig, self._signatures[candidate]) >= self.threshold:
+                    return False
+        position = len(self._signatures)
+        self._signatures.append(sig)
+        for band, key in enumerate(self._band_keys(sig)):
+            self._buckets[band].setdefault(key, []).append(position)
+        return True
@@ -0,0 +1,164 @@
+"""
+Curated questions with known-good answers, served when the LLM can't produce one in time.
+
+    python question_bank.py     # check every coding/DSA reference solution against its test cases
+
+question_bank.json holds aptitude questions per category, and coding questions
+and DSA problems per language and difficulty, in the same shape the LLM is asked
+to return, so the front end can't tell the difference. A coding question is only
+ever served in the language it was written for.
+"""
+import json
+import os
+import random
+import threading
+
+from question_pool import fingerprint
+
+OPTION_KEYS = ('a', 'b', 'c', 'd')
+# Kinds whose questions carry code, so the bank nests them by language
+CODE_KINDS = ('coding', 'dsa')
+LANGUAGE_ALIASES = {'py': 'python', 'python3': 'python'}
+
+
+def bank_language(language):
+    language = (language or 'python').strip().lower()
+    return LANGUAGE_ALIASES.get(language, language)
+
+
+def valid_item(kind, item):
+    """Whether a bank entry has everything its endpoint serves"""
+    if kind == 'aptitude':
+        options = item.get('options') or {}
+        return (bool(item.get('question')) and sorted(options) == list(OPTION_KEYS)
+                and item.get('answer') in options and bool(item.get('explanation')))
+    if kind == 'coding':
+        return bool(item.get('question')) and bool(item.get('test_cases')) and 'def solution' in item.get('solution', '')
+    if kind == 'dsa':
+        return (bool(item.get('title')) and bool(item.get('test_cases'))
+                and 'def solution' in item.get('reference_solution', ''))
+    return False
+
+
+class QuestionBank:
+    """
+    Questions indexed by (kind, category) for aptitude and (kind, language,
+    difficulty) for coding and DSA.
+
+    pick() hands out a key's questions in a shuffled rotation, so concurrent
+    fallbacks in one request get different questions, and skips the ones the
+    caller says the student has already seen while it has others. A key the
+    bank doesn't have (an unusual category or difficulty) is served from its
+    group's other keys rather than with a placeholder, but never across
+    languages: a language the bank has nothing for gets nothing.
+    """
+
+    def __init__(self, entries):
+        self._items = {}  # (kind, key) or (kind, language, key) -> list of (fingerprint, payload)
+        self._groups = {}  # the same index without its key -> list of (fingerprint, payload)
+        self._cursors = {}
+        self._served = {}
+        self._lock = threading.Lock()
+        for kind, groups in entries.items():
+            if kind in CODE_KINDS:
+                keyed = [((kind, bank_language(language), key), items)
+                         for language, by_key in groups.items() for key, items in by_key.items()]
+            else:
+                keyed = [((kind, key), items) for key, items in groups.items()]
+            for index, items in keyed:
+                usable = []
+                for item in items:
+                    if valid_item(kind, item):
+                        usable.append((fingerprint(item), item))
+                    else:
+                        print(f"Question bank: skipping malformed {'/'.join(index)} entry")
+                random.shuffle(usable)
+                self._items[index] = usable
+                self._groups.setdefault(index[:-1], []).extend(usable)
+
+    def pick(self, kind, key, count=1, seen=None, language=None):
+        """Up to count questions for (kind, [language,] key); seen(payload) -> True marks ones to avoid"""
+        index = (kind, bank_language(language), key) if kind in CODE_KINDS else (kind, key)
+        items = self._items.get(index) or self._groups.get(index[:-1]) or []
+        if not items:
+            return []
+        if index not in self._items:
+            index = index[:-1] + (None,)
+        with self._lock:
+            start = self._cursors.get(index, 0)
+            rotation = [items[(start + i) % len(items)] for i in range(len(items))]
+            fresh = [entry for entry in rotation if seen is None or not seen(entry[1])]
+            # Everything seen: repeat a question rather than serve nothing
+            chosen = (fresh + [entry for entry in rotation if entry not in fresh])[:count]
+            last = max(rotation.index(entry) for entry in chosen)
+            self._cursors[index] = (start + last + 1) % len(items)
+            self._served[kind] = self._served.get(kind, 0) + len(chosen)
+        return [dict(payload) for _, payload in chosen]
+
+    def pick_one(self, kind, key, seen=None, language=None):
+        picked = self.pick(kind, key, 1, seen, language)
+        return picked[0] if picked else None
+
+    def languages(self, kind):
+        return sorted({index[1] for index in self._items if index[0] == kind and kind in CODE_KINDS})
+
+    def stats(self):
+        with self._lock:
+            served = dict(self._served)
+        questions = {}
+        for index, items in self._items.items():
+            questions[index[0]] = questions.get(index[0], 0) + len(items)
+        return {
+            'questions': questions,
+            'keys': sorted('/'.join(key) for key in self._items),
+            'served': served
+        }
+
+
+def load_question_bank(path):
+    try:
+        with open(path, encoding='utf-8') as bank_file:
+            entries = json.load(bank_file)
+    except (OSError, ValueError) as e:
+        print(f"Question bank not loaded from {path}: {e}")
+        entries = {}
+    return QuestionBank(entries)
+
+
+def create_question_bank_from_env():
+    default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'question_bank.json')
+    return load_question_bank(os.getenv("QUESTION_BANK_PATH", default_path))
+
+
+question_bank = create_question_bank_from_env()
+
+
+def check_bank(bank):
+    """Run each Python coding/DSA reference solution on its own test cases; returns the failures"""
+    from dsa_tests import parse_arguments, parse_expected, values_match
+
+    failures = []
+    for index, items in bank._items.items():
+        kind = index[0]
+        if kind not in CODE_KINDS or index[1] != 'python':
+            continue
+        key = '/'.join(index[1:])
+        for _, item in items:
+            namespace = {}
+            exec(item['solution'] if kind == 'coding' else item['reference_solution'], namespace)
+            for case in item['test_cases']:
+                if kind == 'coding':
+                    args, expected = case
+                else:
+                    args, expected = parse_arguments(case['input']), parse_expected(case['expected_output'])
+                actual = namespace['solution'](*args)
+                if not values_match(actual, expected):
+                    failures.append(f"{kind}/{key} {item.get('title') or item['question'][:40]!r}: "
+                                    f"{args} -> {actual!r}, expected {expected!r}")
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_bank(question_bank)
+    print(json.dumps(question_bank.stats(), indent=2))
+    print("\n".join(failures) if failures else "All reference solutions pass their test cases")
@@ -0,0 +1,243 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+
+
+def fingerprint(payload):
+    """Stable identity for a pooled item, used for 'already seen' filtering"""
+    text = payload
+    if isinstance(payload, dict):
+        text = payload.get('question') or payload.get('title') or payload
+    if not isinstance(text, str):
+        text = json.dumps(text, sort_keys=True, default=str)
+    return hashlib.sha1(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+class QuestionPool:
+    """
+    In-memory pools of pre-generated content keyed by (endpoint, ...) tuples.
+
+    Requests take ready items from a deque in O(1); a background worker tops up
+    every recently requested pool that has fallen below its low-water mark.
+    Items expire after ttl_seconds, and each student's served fingerprints are
+    remembered so the same item is never handed to them twice.
+
+    Keys come from request bodies, so only ones the endpoint's accepts(key)
+    allows are kept stocked, and at most max_keys_per_endpoint at a time; any
+    other key is simply a miss.
+    """
+
+    def __init__(self, ttl_seconds=6 * 3600, refill_interval=2.0, key_idle_seconds=1800,
+                 max_students=5000, max_seen_per_student=2000, max_keys_per_endpoint=50):
+        self.ttl_seconds = ttl_seconds
+        self.refill_interval = refill_interval
+        self.key_idle_seconds = key_idle_seconds
+        self.max_students = max_students
+        self.max_seen_per_student = max_seen_per_student
+        self.max_keys_per_endpoint = max_keys_per_endpoint
+
+        self._pools = {}  # key -> deque of (created_at, fingerprint, payload)
+        self._last_requested = {}  # key -> monotonic time of the last take/warm
+        self._producers = {}  # endpoint -> (producer, target_size, low_water)
+        self._accepts = {}  # endpoint -> accepts(key) -> bool
+        self._seen = OrderedDict()  # student_id -> OrderedDict of fingerprints
+        self._served = []  # fingerprints waiting to be removed from the persistent store
+        self._collection = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+
+    # ---------------- Configuration ----------------
+    def register(self, endpoint, producer, target_size=20, low_water=None, accepts=None):
+        """producer(key) returns a list of fresh payloads for key, raising on failure; accepts(key) vets keys"""
+        if low_water is None:
+            low_water = max(1, target_size // 2)
+        self._producers[endpoint] = (producer, target_size, low_water)
+        self._accepts[endpoint] = accepts or (lambda key: True)
+
+    def attach_collection(self, collection):
+        """Persist pooled items to Mongo and reload the unexpired ones"""
+        self._collection = collection
+        if collection is None:
+            return
+        try:
+            collection.create_index('createdAt', expireAfterSeconds=int(self.ttl_seconds))
+            cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+            loaded = 0
+            with self._lock:
+                for doc in collection.find({'createdAt': {'$gte': cutoff}}):
+                    key = tuple(doc.get('key') or ())
+                    if key and key[0] in self._producers:
+                        age = (datetime.utcnow() - doc['createdAt']).total_seconds()
+                        self._pools.setdefault(key, deque()).append(
+                            (time.time() - age, doc['fingerprint'], doc['payload']))
+                        loaded += 1
+            print(f"Question pool loaded {loaded} persisted items")
+        except Exception as e:
+            print(f"Question pool persistence error: {e}")
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="question-pool-refill", daemon=True)
+            self._thread.start()
+
+    # ---------------- Request path ----------------
+    def warm(self, key):
+        """Mark key as wanted so the refill worker keeps it stocked; False if it isn't a key the pool will keep"""
+        self.start()
+        with self._lock:
+            if key not in self._last_requested and not self._can_track(key):
+                return False
+            self._last_requested[key] = time.monotonic()
+            self._pools.setdefault(key, deque())
+        self._wake.set()
+        return True
+
+    def _can_track(self, key):
+        endpoint = key[0] if key else None
+        if endpoint not in self._producers or not self._accepts[endpoint](key):
+            return False
+        tracked = sum(1 for other in self._last_requested if other[0] == endpoint)
+        return tracked < self.max_keys_per_endpoint
+
+    def take(self, key, count=1, student_id=None):
+        """Pop up to count fresh items for key that student_id has not seen yet"""
+        if not self.warm(key):
+            with self._lock:
+                self.misses += count
+            return []
+        now = time.time()
+        taken = []
+        with self._lock:
+            pool = self._pools[key]
+            seen = self._seen.get(student_id) if student_id else None
+            skipped = []
+            while pool and len(taken) < count:
+                created_at, fp, payload = pool.popleft()
+                if now - created_at > self.ttl_seconds:
+                    self._served.append(fp)
+                    continue
+                if seen is not None and fp in seen:
+                    skipped.append((created_at, fp, payload))
+                    continue
+                taken.append((fp, payload))
+            # Items this student already saw are still fresh for everyone else
+            pool.extend(skipped)
+            self.hits += len(taken)
+            self.misses += count - len(taken)
+            self._served.extend(fp for fp, _ in taken)
+            _, _, low_water = self._producers[key[0]]
+            if len(pool) < low_water:
+                self._wake.set()
+        payloads = [payload for _, payload in taken]
+        self.mark_seen(student_id, payloads)
+        return payloads
+
+    def mark_seen(self, student_id, payloads):
+        """Remember payloads served to student_id outside the pool (e.g. generated on demand)"""
+        if not student_id or not payloads:
+            return
+        with self._lock:
+            seen = self._seen.pop(student_id, None) or OrderedDict()
+            for payload in payloads:
+                seen[fingerprint(payload)] = True
+            while len(seen) > self.max_seen_per_student:
+                seen.popitem(last=False)
+            self._seen[student_id] = seen
+            while len(self._seen) > self.max_students:
+                self._seen.popitem(last=False)
+
+    def has_seen(self, student_id, payload):
+        with self._lock:
+            seen = self._seen.get(student_id)
+            return seen is not None and fingerprint(payload) in seen
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'pools': {'/'.join(str(part) for part in key): len(pool) for key, pool in self._pools.items()}
+            }
+
+    # ---------------- Background refill ----------------
+    def _keys_needing_refill(self):
+        now = time.monotonic()
+        needing = []
+        with self._lock:
+            for key, requested_at in list(self._last_requested.items()):
+                if now - requested_at > self.key_idle_seconds:
+                    # Nobody asked for this key lately; stop spending tokens on it
+                    del self._last_requested[key]
+                    self._pools.pop(key, None)
+                    continue
+                _, target_size, low_water = self._producers[key[0]]
+                if len(self._pools.get(key, ())) < low_water:
+                    needing.append(key)
+        return needing
+
+    def _refill(self, key):
+        producer, target_size, _ = self._producers[key[0]]
+        while True:
+            with self._lock:
+                pool = self._pools.setdefault(key, deque())
+                if len(pool) >= target_size:
+                    return
+                known = {fp for _, fp, _ in pool}
+            try:
+                payloads = producer(key)
+            except Exception as e:
+                print(f"Question pool refill error for {key}: {e}")
+                return
+            if not payloads:
+                return
+            now = time.time()
+            fresh = []
+            for payload in payloads:
+                fp = fingerprint(payload)
+                if fp not in known:
+                    known.add(fp)
+                    fresh.append((now, fp, payload))
+            if not fresh:
+                return
+            with self._lock:
+                self._pools[key].extend(fresh)
+            self._persist(key, fresh)
+
+    def _persist(self, key, items):
+        if self._collection is None or not items:
+            return
+        try:
+            self._collection.insert_many([{
+                'key': list(key),
+                'fingerprint': fp,
+                'payload': payload,
+                'createdAt': datetime.utcfromtimestamp(created_at)
+            } for created_at, fp, payload in items], ordered=False)
+        except Exception as e:
+            print(f"Question pool persistence error: {e}")
+
+    def _flush_served(self):
+        with self._lock:
+            served, self._served = self._served, []
+        if self._collection is None or not served:
+            return
+        try:
+            self._collection.delete_many({'fingerprint': {'$in': served}})
+        except Exception as e:
+            print(f"Question pool persistence error: {e}")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.refill_interval)
+            self._wake.clear()
+            self._flush_served()
+            for key in self._keys_needing_refill():
+                self._refill(key)
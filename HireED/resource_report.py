@@ -0,0 +1,90 @@
+"""
+Per-submission resource reports: CPU time, wall time and peak memory per test case
+plus, for Python, the hottest functions of the student's own code.
+
+Timings come from the plain run of the test cases. Memory tracing and profiling both
+slow code down, so those numbers come from a second run of extra copies of the cases
+(see resource_cases), never from the timed calls. Only cases that finished in the
+timed run are copied: one that hung or crashed there would only do it again. Both
+are opt-in per request, so a plain submission costs one run.
+"""
+
+MAX_HOT_FUNCTIONS = 20
+FINISHED_STATUSES = ('passed', 'failed', 'ok')
+
+
+def parse_hot_functions(value):
+    """hot_functions from a request as a count between 0 and MAX_HOT_FUNCTIONS; ValueError if it isn't one"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError("hot_functions must be a whole number")
+    try:
+        count = int(value)
+    except ValueError:
+        raise ValueError("hot_functions must be a whole number")
+    if count < 0:
+        raise ValueError("hot_functions can't be negative")
+    return min(count, MAX_HOT_FUNCTIONS)
+
+
+def finished_indexes(results):
+    return [index for index, result in enumerate(results) if result.get('status') in FINISHED_STATUSES]
+
+
+def resource_cases(cases, results, hot_functions=0, trace_memory=False):
+    """Cases for the follow-up Python run: a memory-traced and/or profiled copy of each finished case, as asked"""
+    finished = [cases[index] for index in finished_indexes(results)]
+    extra = []
+    if trace_memory:
+        extra += [{'args': case.get('args'), 'trace_memory': True} for case in finished]
+    if hot_functions:
+        extra += [{'args': case.get('args'), 'profile_top': hot_functions} for case in finished]
+    return extra
+
+
+def merge_hot_functions(results, top):
+    """Add up per-case cProfile rows by function and keep the top few by self time"""
+    merged = {}
+    for result in results:
+        for row in result.get('hot_functions') or []:
+            key = (row['function'], row['line'])
+            total = merged.setdefault(key, {'function': row['function'], 'line': row['line'],
+                                            'calls': 0, 'self_ms': 0.0, 'cumulative_ms': 0.0})
+            total['calls'] += row['calls']
+            total['self_ms'] = round(total['self_ms'] + row['self_ms'], 3)
+            total['cumulative_ms'] = round(total['cumulative_ms'] + row['cumulative_ms'], 3)
+    return sorted(merged.values(), key=lambda row: row['self_ms'], reverse=True)[:top]
+
+
+def attach_resource_report(run, extra_results=(), hot_functions=0, trace_memory=False):
+    """
+    Fold the peak memory from a follow-up run of resource_cases into the
+    matching test case results and attach run['resources']. Works without
+    extra results too (compiled languages).
+    """
+    results = run['results']
+    finished = finished_indexes(results)
+    traced_count = len(finished) if trace_memory else 0
+    traced, profiled = extra_results[:traced_count], extra_results[traced_count:]
+    for index, traced_result in zip(finished, traced):
+        if traced_result.get('peak_kb') is not None:
+            results[index]['peak_kb'] = traced_result['peak_kb']
+
+    cases = []
+    for index, result in enumerate(results):
+        cases.append({field: result.get(field) for field in ('wall_ms', 'cpu_ms', 'peak_kb')})
+        cases[-1]['case'] = index + 1
+    timed = [case for case in cases if case['wall_ms'] is not None]
+    peaks = [case['peak_kb'] for case in cases if case['peak_kb'] is not None]
+    report = {
+        'cases': cases,
+        'total_wall_ms': round(sum(case['wall_ms'] for case in timed), 3),
+        'total_cpu_ms': round(sum(case['cpu_ms'] or 0 for case in timed), 3),
+        'peak_kb': max(peaks) if peaks else None,
+        'slowest_case': max(timed, key=lambda case: case['wall_ms'])['case'] if timed else None
+    }
+    if run.get('process_peak_kb') is not None:
+        report['process_peak_kb'] = run['process_peak_kb']
+    if hot_functions and profiled:
+        report['hot_functions'] = merge_hot_functions(profiled, hot_functions)
+    run['resources'] = report
+    return run
@@ -0,0 +1,227 @@
+"""
+Sandbox worker process for ExecutionPool (execution_pool.py).
+
+Runs as a separate, isolated interpreter and speaks newline-delimited JSON over
+private duplicates of stdin/stdout; the real fds 0 and 1 are pointed at
+/dev/null so print() and stray writes don't land in the protocol.
+
+Before any submission is loaded the worker caps its resources and, when the
+parent runs as root, drops to the unprivileged sandbox uid, which is what keeps
+student code away from the app's files, secrets and processes.
+
+Student code runs in this process, so it can find and write to the protocol fd,
+and can dig the current request's nonce out of memory. The nonce only catches
+stray or naive writes; what makes a forged reply worthless is that the worker is
+never sent expected values and the parent decides pass/fail itself.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import sys
+import time
+import tracemalloc
+import traceback
+
+# Pre-warm the modules submissions commonly import
+import bisect  # noqa: F401
+import collections  # noqa: F401
+import functools  # noqa: F401
+import heapq  # noqa: F401
+import itertools  # noqa: F401
+import math  # noqa: F401
+import re  # noqa: F401
+import string  # noqa: F401
+
+MAX_STDOUT_CHARS = 4000
+SUBMISSION_FILENAME = "<submission>"
+
+
+def to_jsonable(value, depth=0):
+    """Convert a result into plain JSON types (tuples become lists, unknown objects their repr)"""
+    if depth > 50:
+        return repr(value)
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return value if value == value and value not in (float('inf'), float('-inf')) else repr(value)
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v, depth + 1) for v in value]
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v, depth + 1) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        try:
+            return sorted(to_jsonable(v, depth + 1) for v in value)
+        except TypeError:
+            return [to_jsonable(v, depth + 1) for v in value]
+    return repr(value)
+
+
+def apply_limits(memory_mb, file_size_mb):
+    """Cap address space (on top of the interpreter baseline) and file writes"""
+    if memory_mb:
+        with open('/proc/self/statm') as statm:
+            baseline = int(statm.read().split()[0]) * resource.getpagesize()
+        limit = baseline + memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if file_size_mb is not None:
+        limit = file_size_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_FSIZE, (limit, limit))
+
+
+def drop_privileges(uid, gid, max_processes):
+    """Cap processes and switch to the sandbox uid; no way back once it's done"""
+    if max_processes:
+        resource.setrlimit(resource.RLIMIT_NPROC, (max_processes, max_processes))
+    if uid is None:
+        return
+    os.setgroups([])
+    os.setgid(gid)
+    os.setuid(uid)
+
+
+def set_cpu_budget(seconds):
+    """Let the next call use at most `seconds` more CPU time; SIGXCPU ends the worker after that"""
+    if not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + int(seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def hot_functions(profiler, top):
+    """
+    The submission's own functions from a cProfile run, by self time. Time in
+    builtins and library calls (sorted, heapq, ...) counts towards the submission
+    function that made the call, since that is the line the student can change.
+    """
+    stats = pstats.Stats(profiler).stats
+    own = {key: value[2] for key, value in stats.items() if key[0] == SUBMISSION_FILENAME}
+    for key, (_, _, _, _, callers) in stats.items():
+        if key[0] == SUBMISSION_FILENAME:
+            continue
+        for caller, caller_stats in callers.items():
+            if caller in own:
+                own[caller] += caller_stats[3]
+    rows = [{'function': name, 'line': line, 'calls': stats[(filename, line, name)][1],
+             'self_ms': round(own[(filename, line, name)] * 1000, 3),
+             'cumulative_ms': round(stats[(filename, line, name)][3] * 1000, 3)}
+            for filename, line, name in own]
+    rows.sort(key=lambda row: row['self_ms'], reverse=True)
+    return rows[:top]
+
+
+def format_error(exc):
+    message = str(exc)
+    return f"{type(exc).__name__}: {message}" if message else type(exc).__name__
+
+
+class Worker:
+    def __init__(self):
+        self.function = None
+
+    def load(self, message):
+        self.function = None
+        namespace = {'__name__': '__submission__'}
+        set_cpu_budget(message.get('cpu_limit'))
+        try:
+            exec(compile(message['code'], SUBMISSION_FILENAME, 'exec'), namespace)
+        except SyntaxError as e:
+            return {'ok': False, 'kind': 'syntax', 'error': format_error(e)}
+        except BaseException as e:  # noqa: B902 - student code may raise anything, even SystemExit
+            return {'ok': False, 'kind': 'runtime', 'error': format_error(e)}
+        entrypoint = message.get('entrypoint') or 'solution'
+        function = namespace.get(entrypoint)
+        if not callable(function):
+            return {'ok': False, 'kind': 'missing_entrypoint', 'error': f"Your code must define a '{entrypoint}' function"}
+        self.function = function
+        return {'ok': True}
+
+    def call(self, message):
+        args = message.get('args') or []
+        captured = io.StringIO()
+        result = {}
+        set_cpu_budget(message.get('cpu_limit'))
+        trace_memory = message.get('trace_memory')
+        profile_top = message.get('profile_top')
+        if trace_memory:
+            tracemalloc.start()
+        profiler = cProfile.Profile() if profile_top else None
+        sys.stdout = captured
+        started, cpu_started = time.perf_counter(), time.process_time()
+        try:
+            value = self.function(*args) if profiler is None else profiler.runcall(self.function, *args)
+            result['wall_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            result['cpu_ms'] = round((time.process_time() - cpu_started) * 1000, 3)
+            result['actual'] = to_jsonable(value)
+            result['passed'] = True
+            result['status'] = 'ok'
+        except BaseException as e:  # noqa: B902
+            result['wall_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            result['cpu_ms'] = round((time.process_time() - cpu_started) * 1000, 3)
+            result['passed'] = False
+            result['status'] = 'error'
+            result['error'] = format_error(e)
+            if isinstance(e, RecursionError):
+                result['error'] = "RecursionError: maximum recursion depth exceeded"
+        finally:
+            sys.stdout = sys.__stdout__
+            if trace_memory:
+                # Peak allocation during the call only; the arguments were allocated beforehand
+                result['peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                tracemalloc.stop()
+            if profiler is not None:
+                result['hot_functions'] = hot_functions(profiler, int(profile_top))
+        output = captured.getvalue()
+        if output:
+            result['stdout'] = output[:MAX_STDOUT_CHARS]
+        return result
+
+
+def main():
+    proto_in = os.fdopen(os.dup(0), 'r', encoding='utf-8')
+    proto_out = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    sys.stdin = io.StringIO('')
+    sys.stdout = sys.__stdout__ = io.StringIO()
+
+    config = json.loads(proto_in.readline() or '{}')
+    apply_limits(config.get('memory_mb'), config.get('file_size_mb'))
+    drop_privileges(config.get('uid'), config.get('gid'), config.get('max_processes'))
+    worker = Worker()
+    proto_out.write(json.dumps({'ready': True}) + '\n')
+    proto_out.flush()
+
+    for line in proto_in:
+        nonce = None
+        try:
+            message = json.loads(line)
+            nonce = message.pop('nonce', None)
+            if message.get('op') == 'load':
+                reply = worker.load(message)
+            elif message.get('op') == 'call':
+                reply = worker.call(message)
+            else:
+                reply = {'ok': False, 'error': f"Unknown op {message.get('op')!r}"}
+        except BaseException:  # noqa: B902 - keep the worker alive for the parent to recycle
+            reply = {'ok': False, 'status': 'error', 'error': traceback.format_exc(limit=2)}
+        reply['nonce'] = nonce
+        try:
+            payload = json.dumps(reply)
+        except (TypeError, ValueError) as e:
+            payload = json.dumps({'ok': False, 'status': 'error', 'passed': False, 'error': format_error(e),
+                                  'nonce': nonce})
+        proto_out.write(payload + '\n')
+        proto_out.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -31,7 +31,7 @@ const nextQuestionText = document.getElementById('next-question-text');
 let isInterviewActive = false;
 let codingChallengeActive = false;
 let aptitudeTestActive = false;
-let conversationHistory = [];
+let interviewSessionId = null;
 let codingTimer;
 let aptitudeTimer;
 let timeLeft;
@@ -103,8 +103,10 @@ function displayInterviewResponse(response) {
         nextQuestionText.textContent = 'Awaiting next step...'; 
     }
     
-    // 3. Update conversation history
-    conversationHistory = response.conversation_history || [];
+    // 3. Keep the server-side session id (the conversation itself stays on the server)
+    if (response.session_id) {
+        interviewSessionId = response.session_id;
+    }
 
     // ===== CAPTURE INTERVIEW SCORE =====
 let match = response.feedback?.match(/Score:\s*(\d+)/i);
@@ -157,7 +159,7 @@ startInterviewBtn.addEventListener('click', async () => {
 
     addMessage('bot', `Starting interview preparation for <strong>${jobType}</strong>. Please wait...`);
 
-    conversationHistory = [];
+    interviewSessionId = null;
 
     const response = await callBackendAPI('start-interview', { job_type: jobType });
 
@@ -177,7 +179,10 @@ endInterviewBtn.addEventListener('click', () => {
     startInterviewBtn.disabled = false;
 
     addMessage('bot', 'Interview session ended. You can start a new session anytime.');
-    conversationHistory = [];
+    if (interviewSessionId) {
+        callBackendAPI('end-interview', { session_id: interviewSessionId });
+    }
+    interviewSessionId = null;
     // ===== SAVE TIME SPENT ON INTERVIEW =====
 trackTime("interview");
 
@@ -212,12 +217,9 @@ async function sendMessage() {
             return;
         }
 
-        // Add the user message to conversation history
-        conversationHistory.push({ role: 'user', content: message });
-
         const response = await callBackendAPI('interview-chatbot', {
             job_type: jobType,
-            conversation_history: conversationHistory,
+            session_id: interviewSessionId,
             user_message: message
         });
         
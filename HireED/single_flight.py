@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class _LeaderGone(Exception):
+    """The call being waited on was abandoned (e.g. its request disconnected); waiters retry it themselves"""
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls into one.
+
+    The first caller for a key (the leader) runs the call; anyone asking for the
+    same key before it finishes waits for and shares its result, or its
+    exception, instead of making their own. Nothing is kept once the call
+    lands, so this only merges calls that overlap in time; caching finished
+    results is LLMCache's job.
+
+    Flights are concurrent.futures Futures, so thread callers (do) and
+    coroutines (ado) share one table and can wait on each other's calls. If a
+    leader is cancelled rather than failing, its waiters don't inherit the
+    cancellation: one of them runs the call instead.
+    """
+
+    def __init__(self):
+        self._flights = {}  # key -> Future
+        self._lock = threading.Lock()
+        self._stats = {}  # label -> {'leaders': n, 'collapsed': n}
+
+    def _join(self, key, label):
+        """(future, True) for the caller that should make the call, (future, False) for one that should wait"""
+        with self._lock:
+            counts = self._stats.setdefault(label, {'leaders': 0, 'collapsed': 0})
+            future = self._flights.get(key)
+            if future is None:
+                future = self._flights[key] = Future()
+                counts['leaders'] += 1
+                return future, True
+            counts['collapsed'] += 1
+            return future, False
+
+    def _land(self, key, future, result=None, error=None):
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, func, timeout=None, label=''):
+        """func() or, if an identical call is already in flight, its result; raises concurrent.futures.TimeoutError after timeout"""
+        while True:
+            future, leader = self._join(key, label)
+            if not leader:
+                try:
+                    return future.result(timeout)
+                except _LeaderGone:
+                    continue
+            try:
+                result = func()
+            except Exception as e:
+                self._land(key, future, error=e)
+                raise
+            except BaseException:
+                self._land(key, future, error=_LeaderGone())
+                raise
+            self._land(key, future, result)
+            return result
+
+    async def ado(self, key, func, timeout=None, label=''):
+        """do() for coroutines: func is an async function, and waiting holds no thread"""
+        while True:
+            future, leader = self._join(key, label)
+            if not leader:
+                try:
+                    # shield: one waiter timing out mustn't cancel the flight for everyone else
+                    return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+                except _LeaderGone:
+                    continue
+            try:
+                result = await func()
+            except Exception as e:
+                self._land(key, future, error=e)
+                raise
+            except BaseException:
+                self._land(key, future, error=_LeaderGone())
+                raise
+            self._land(key, future, result)
+            return result
+
+    def stats(self):
+        with self._lock:
+            in_flight = len(self._flights)
+            labels = {label: dict(counts) for label, counts in self._stats.items()}
+        leaders = sum(counts['leaders'] for counts in labels.values())
+        collapsed = sum(counts['collapsed'] for counts in labels.values())
+        total = leaders + collapsed
+        return {
+            'in_flight': in_flight,
+            'calls': leaders,
+            'collapsed': collapsed,
+            'collapse_rate': round(collapsed / total, 4) if total else 0.0,
+            'by_task': labels
+        }
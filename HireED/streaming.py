@@ -0,0 +1,121 @@
+import json
+
+_SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_text(completion_stream):
+    """Yield the text deltas of a Groq stream=True completion"""
+    for chunk in completion_stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+async def astream_text(completion_stream):
+    """stream_text for an AsyncGroq stream"""
+    async for chunk in completion_stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+class JsonFieldStreamer:
+    """
+    Incrementally extracts top-level string fields from a JSON object as it arrives.
+
+    feed() accepts arbitrary chunks of the raw model output and returns the newly
+    decoded text of each wanted field, so e.g. "feedback" can be shown while the
+    model is still writing it. Anything before the opening brace is ignored.
+    """
+
+    def __init__(self, fields):
+        self.fields = set(fields)
+        self._depth = 0
+        self._expect = 'key'  # What comes next at depth 1: key, colon, value or comma
+        self._in_string = False
+        self._role = None  # Role of the current string: key, value or other
+        self._escape = None  # Pending escape sequence after a backslash
+        self._key_chars = []
+        self._key = None
+
+    def feed(self, chunk):
+        out = []
+        for ch in chunk:
+            if self._in_string:
+                self._string_char(ch, out)
+            else:
+                self._structural_char(ch)
+        merged = []
+        for field, text in out:
+            if merged and merged[-1][0] == field:
+                merged[-1] = (field, merged[-1][1] + text)
+            else:
+                merged.append((field, text))
+        return merged
+
+    def _emit(self, text, out):
+        if self._role == 'key':
+            self._key_chars.append(text)
+        elif self._role == 'value' and self._key in self.fields:
+            out.append((self._key, text))
+
+    def _string_char(self, ch, out):
+        if self._escape is not None:
+            self._escape += ch
+            if self._escape[0] == 'u':
+                if len(self._escape) == 5:
+                    try:
+                        self._emit(chr(int(self._escape[1:], 16)), out)
+                    except ValueError:
+                        pass
+                    self._escape = None
+            else:
+                self._emit(_SIMPLE_ESCAPES.get(ch, ch), out)
+                self._escape = None
+        elif ch == '\\':
+            self._escape = ''
+        elif ch == '"':
+            self._in_string = False
+            if self._role == 'key':
+                self._key = ''.join(self._key_chars)
+                self._expect = 'colon'
+            elif self._role == 'value':
+                self._expect = 'comma'
+        else:
+            self._emit(ch, out)
+
+    def _structural_char(self, ch):
+        if ch == '"':
+            if self._depth != 1:
+                self._role = 'other'
+            elif self._expect == 'key':
+                self._role = 'key'
+                self._key_chars = []
+            elif self._expect == 'value':
+                self._role = 'value'
+            else:
+                self._role = 'other'
+            self._in_string = self._depth > 0
+        elif ch in '{[':
+            if self._depth == 1 and self._expect == 'value':
+                self._expect = 'comma'
+            self._depth += 1
+        elif ch in '}]':
+            self._depth = max(0, self._depth - 1)
+        elif self._depth == 1:
+            if ch == ':':
+                self._expect = 'value'
+            elif ch == ',':
+                self._expect = 'key'
+            elif not ch.isspace() and self._expect == 'value':
+                # Number, boolean or null value
+                self._expect = 'comma'
@@ -0,0 +1,345 @@
+import ast
+import json
+import random
+import re
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dsa_tests import values_match
+
+NUMBER = r'-?\d+(?:\.\d+)?(?:\s*(?:\*|x|×)\s*10\s*\^\s*-?\d+|\s*\^\s*-?\d+|e\d+)?'
+BOUND_PATTERN = re.compile(
+    rf'(?:({NUMBER})\s*(<=|<)\s*)?([A-Za-z_][\w.\[\]()]*?)\s*(<=|<)\s*({NUMBER})|({NUMBER})\s*(<=|<)\s*([A-Za-z_][\w.\[\]()]*)\s*$'
+)
+LENGTH_PATTERN = re.compile(r'^(?:len\((\w+)\)|(\w+)\.(?:length|size)(?:\(\))?)$')
+INNER_LENGTH_PATTERN = re.compile(r'^(\w+)\[\w+\]\.(?:length|size)(?:\(\))?$')
+ELEMENT_PATTERN = re.compile(r'^(\w+)(?:\[\w+\])+$')
+DEFAULT_SMALL_LENGTH = 8
+MAX_SUMMARY_CHARS = 300
+
+
+def _to_number(text):
+    text = text.replace(' ', '').replace('×', '*').replace('x', '*')
+    match = re.match(r'^(-?\d+(?:\.\d+)?)(?:\*10\^(-?\d+)|\^(-?\d+)|e(\d+))?$', text)
+    if not match:
+        return None
+    base = float(match.group(1))
+    if match.group(2):
+        value = base * 10 ** int(match.group(2))
+    elif match.group(3):
+        value = base ** int(match.group(3))
+    elif match.group(4):
+        value = base * 10 ** int(match.group(4))
+    else:
+        value = base
+    return int(value) if value == int(value) else value
+
+
+def parse_constraints(constraints):
+    """
+    Pull numeric bounds out of LeetCode-style constraint strings.
+
+    Returns {'lengths': {name: (lo, hi)}, 'inner_lengths': {...}, 'values': {...},
+    'scalars': {...}, 'alphabet': str or None}. Bounds on a bare name that is
+    not a parameter (typically n) are treated as a length by the caller.
+    """
+    parsed = {'lengths': {}, 'inner_lengths': {}, 'values': {}, 'scalars': {}, 'alphabet': None}
+    if isinstance(constraints, str):
+        constraints = [constraints]
+    for constraint in constraints or []:
+        if not isinstance(constraint, str):
+            continue
+        text = (constraint.replace('≤', '<=').replace('≥', '>=').replace('−', '-')
+                .replace('`', '').replace('$', '').strip().rstrip('.'))
+        lowered = text.lower()
+        if 'lowercase' in lowered:
+            parsed['alphabet'] = string.ascii_lowercase
+        elif 'uppercase' in lowered:
+            parsed['alphabet'] = string.ascii_uppercase
+        elif 'digit' in lowered and 'letter' not in lowered:
+            parsed['alphabet'] = string.digits
+        elif 'letter' in lowered:
+            parsed['alphabet'] = string.ascii_letters
+        # "a, b <= 10" style: bounds apply to every listed name
+        for part in re.split(r'[;]|,(?![^\[(]*[\])])', text):
+            match = BOUND_PATTERN.search(part.strip())
+            if not match:
+                continue
+            if match.group(3):
+                lo = _to_number(match.group(1)) if match.group(1) else None
+                if lo is not None and match.group(2) == '<':
+                    lo += 1
+                hi = _to_number(match.group(5))
+                if hi is not None and match.group(4) == '<':
+                    hi -= 1
+                subject = match.group(3)
+            else:
+                lo, hi = _to_number(match.group(6)), None
+                if lo is not None and match.group(7) == '<':
+                    lo += 1
+                subject = match.group(8)
+            _record_bound(parsed, subject, lo, hi)
+    return parsed
+
+
+def _record_bound(parsed, subject, lo, hi):
+    length = LENGTH_PATTERN.match(subject)
+    inner = INNER_LENGTH_PATTERN.match(subject)
+    element = ELEMENT_PATTERN.match(subject)
+    if length:
+        key, name = 'lengths', length.group(1) or length.group(2)
+    elif inner:
+        key, name = 'inner_lengths', inner.group(1)
+    elif element:
+        key, name = 'values', element.group(1)
+    elif re.match(r'^\w+$', subject):
+        key, name = 'scalars', subject
+    else:
+        return
+    old_lo, old_hi = parsed[key].get(name, (None, None))
+    parsed[key][name] = (lo if lo is not None else old_lo, hi if hi is not None else old_hi)
+
+
+def parameter_names(code, language, entrypoint):
+    """Parameter names of the entrypoint, or [] if they can't be found"""
+    if language == 'python':
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return []
+        functions = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        # A Solution-class submission is called through a *args wrapper; use the method it wraps
+        matches = ([node for node in functions if node.name == entrypoint]
+                   or [node for node in functions if not node.name.startswith('_')])
+        return [arg.arg for arg in matches[0].args.args if arg.arg != 'self'] if matches else []
+    match = re.search(r'\b' + re.escape(entrypoint) + r'\s*(?:=\s*(?:function\s*)?)?\(([^)]*)\)', code)
+    if not match:
+        return []
+    names = []
+    for param in match.group(1).split(','):
+        words = re.findall(r'[A-Za-z_]\w*', param)
+        if not words:
+            continue
+        # Go puts the name first ("nums []int"); C-family languages put it last
+        names.append(words[0] if language == 'go' else words[-1])
+    return names
+
+
+def describe(value):
+    """Short description of a (possibly huge) argument for reports"""
+    encoded = json.dumps(value)
+    if len(encoded) <= MAX_SUMMARY_CHARS:
+        return value
+    if isinstance(value, list):
+        return f"list of {len(value)} items: {encoded[:MAX_SUMMARY_CHARS // 2]}..."
+    if isinstance(value, str):
+        return f"string of length {len(value)}: {value[:MAX_SUMMARY_CHARS // 2]}..."
+    return encoded[:MAX_SUMMARY_CHARS] + "..."
+
+
+class StressInputGenerator:
+    """Random arguments shaped like a sample test case and bounded by the problem's constraints"""
+
+    def __init__(self, sample_args, names=(), constraints=None, max_length=100_000, seed=0):
+        self.sample_args = list(sample_args)
+        self.names = list(names) if len(names) == len(self.sample_args) else [None] * len(self.sample_args)
+        self.bounds = parse_constraints(constraints)
+        self.max_length = max_length
+        self.rng = random.Random(seed)
+        # Bare names that aren't parameters (n, m) usually bound the input length
+        generic = [bound for name, bound in self.bounds['scalars'].items() if name not in self.names]
+        self.generic_length = generic[0] if generic else None
+
+    def _length_bounds(self, index, sample):
+        name = self.names[index]
+        lo, hi = self.bounds['lengths'].get(name) or self.generic_length or (None, None)
+        lo = min(1, len(sample)) if lo is None else max(0, int(lo))
+        hi = max(lo, len(sample), 1) * 4 if hi is None else int(hi)
+        return lo, max(lo, min(hi, self.max_length))
+
+    def _value_bounds(self, index, sample_values):
+        lo, hi = self.bounds['values'].get(self.names[index], (None, None))
+        numbers = [v for v in sample_values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        if lo is None:
+            lo = min(numbers + [0]) if numbers else 0
+            lo = min(lo, -10) if lo < 0 else lo
+        if hi is None:
+            hi = max(numbers + [10]) if numbers else 10
+            hi = max(hi, lo + 10)
+        return lo, max(lo, hi)
+
+    def _number(self, lo, hi, integer):
+        return self.rng.randint(int(lo), int(hi)) if integer else self.rng.uniform(lo, hi)
+
+    def _string(self, length, sample):
+        alphabet = self.bounds['alphabet'] or (''.join(sorted(set(sample))) if len(set(sample)) > 1 else string.ascii_lowercase)
+        if self.rng.random() < 0.3:
+            alphabet = alphabet[:2] or alphabet  # Few distinct characters to hit repeats
+        return ''.join(self.rng.choice(alphabet) for _ in range(length))
+
+    def _list(self, index, sample, length):
+        if not sample:
+            lo, hi = self._value_bounds(index, [])
+            return [self._number(lo, hi, True) for _ in range(length)]
+        first = sample[0]
+        if all(isinstance(v, bool) for v in sample):
+            return [self.rng.random() < 0.5 for _ in range(length)]
+        if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in sample):
+            integer = all(isinstance(v, int) for v in sample)
+            lo, hi = self._value_bounds(index, sample)
+            if self.rng.random() < 0.3:
+                hi = min(hi, lo + max(1, length // 2))  # Narrow range forces duplicates
+            values = [self._number(lo, hi, integer) for _ in range(length)]
+            if len(sample) > 2 and sample == sorted(sample):
+                values.sort()
+            return values
+        if all(isinstance(v, str) for v in sample):
+            lengths = [len(v) for v in sample]
+            return [self._string(self.rng.randint(min(lengths), max(lengths)), ''.join(sample)) for _ in range(length)]
+        if all(isinstance(v, list) for v in sample):
+            inner_lo, inner_hi = self.bounds['inner_lengths'].get(self.names[index], (None, None))
+            widths = [len(row) for row in sample]
+            if all(w == widths[0] for w in widths):
+                width = widths[0] if inner_hi is None else self.rng.randint(max(1, inner_lo or 1), max(1, min(int(inner_hi), 50)))
+                if widths[0] == len(sample):
+                    width = length  # Square input stays square
+                return [self._list(index, first, width) for _ in range(length)]
+            return [self._list(index, first, self.rng.randint(min(widths), max(widths))) for _ in range(length)]
+        return [self.rng.choice(sample) for _ in range(length)]
+
+    def _scalar(self, index, sample, lengths):
+        name = self.names[index]
+        if isinstance(sample, bool):
+            return self.rng.random() < 0.5
+        if isinstance(sample, (int, float)):
+            lo, hi = self.bounds['scalars'].get(name, (None, None))
+            if lo is None or hi is None:
+                size = max(lengths) if lengths else 10
+                if 0 <= sample <= max(size, 1) and isinstance(sample, int):
+                    # Probably an index or count into the collection
+                    lo, hi = (0 if lo is None else lo), (size if hi is None else hi)
+                else:
+                    spread = abs(sample) + 10
+                    lo, hi = (sample - spread if lo is None else lo), (sample + spread if hi is None else hi)
+            return self._number(lo, hi, isinstance(sample, int))
+        if isinstance(sample, str) and len(sample) <= 1:
+            return self._string(len(sample), sample or 'a')
+        return sample
+
+    def generate(self, large=False):
+        """One random argument list; large=True picks lengths near the upper bound"""
+        args, lengths = [None] * len(self.sample_args), []
+        for index, sample in enumerate(self.sample_args):
+            if isinstance(sample, list) or (isinstance(sample, str) and len(sample) > 1):
+                lo, hi = self._length_bounds(index, sample)
+                if large:
+                    length = self.rng.randint(max(lo, hi - hi // 10), hi)
+                else:
+                    length = self.rng.randint(lo, max(lo, min(hi, DEFAULT_SMALL_LENGTH + len(lengths) * 4)))
+                if isinstance(sample, list) and sample and all(isinstance(row, list) for row in sample) \
+                        and all(len(row) == len(sample) for row in sample):
+                    length = max(lo, min(length, int(hi ** 0.5) if large else length))
+                args[index] = self._list(index, sample, length) if isinstance(sample, list) else self._string(length, sample)
+                lengths.append(length)
+        for index, sample in enumerate(self.sample_args):
+            if args[index] is None:
+                args[index] = self._scalar(index, sample, lengths)
+        return args
+
+
+class StressTester:
+    """
+    Differential testing of a submission against the reference solution.
+
+    Generates random inputs (mostly small, plus a few at the constraint limits),
+    runs submission and reference in parallel chunks across the sandbox pool and
+    reports the first input where they disagree and any case where the submission
+    blows through its time budget (a multiple of the reference's time).
+
+    Outputs are compared exactly, so the reference must return a canonical answer
+    when a problem allows several.
+    """
+
+    def __init__(self, cases=200, large_cases=5, chunk_size=25, max_workers=4, slow_factor=10.0,
+                 min_budget_ms=50.0, max_length=100_000, seed=12345):
+        self.cases = cases
+        self.large_cases = large_cases
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.slow_factor = slow_factor
+        self.min_budget_ms = min_budget_ms
+        self.max_length = max_length
+        self.seed = seed
+
+    def _chunks(self, inputs):
+        small = inputs[:self.cases]
+        # Large inputs get a chunk each, so one slow solution times out on them in parallel
+        chunks = [small[i:i + self.chunk_size] for i in range(0, len(small), self.chunk_size)]
+        return chunks + [[args] for args in inputs[self.cases:]]
+
+    @staticmethod
+    def _collect(chunks, futures):
+        results = []
+        for chunk, future in zip(chunks, futures):
+            outcome = future.result()
+            if not outcome['ok']:
+                results.extend({'status': 'error', 'error': outcome['error']} for _ in chunk)
+            else:
+                results.extend(outcome['results'])
+        return results
+
+    def run(self, run_submission, run_reference, sample_args, names=(), constraints=None):
+        """
+        run_submission / run_reference take a list of cases and return an
+        ExecutionPool.run-shaped dict. Returns the stress report.
+        """
+        started = time.monotonic()
+        generator = StressInputGenerator(sample_args, names, constraints, self.max_length, self.seed)
+        small = sorted((generator.generate() for _ in range(self.cases)), key=lambda args: len(json.dumps(args)))
+        inputs = small + [generator.generate(large=True) for _ in range(self.large_cases)]
+
+        chunks = self._chunks(inputs)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Every chunk is submitted from here; a pool thread that waited on others could deadlock a small pool
+            submission_futures, reference_futures = [], []
+            for chunk in chunks:
+                cases = [{'args': args} for args in chunk]
+                submission_futures.append(executor.submit(run_submission, cases))
+                reference_futures.append(executor.submit(run_reference, cases))
+            submission_results = self._collect(chunks, submission_futures)
+            reference_results = self._collect(chunks, reference_futures)
+
+        report = {'cases_run': 0, 'skipped': 0, 'divergence': None, 'slow_cases': []}
+        for args, mine, theirs in zip(inputs, submission_results, reference_results):
+            if theirs.get('status') != 'ok':
+                # The reference rejects it, so the input is probably outside the real constraints
+                report['skipped'] += 1
+                continue
+            report['cases_run'] += 1
+            budget_ms = max(self.min_budget_ms, self.slow_factor * theirs.get('wall_ms', 0))
+            if mine.get('status') == 'timeout' or mine.get('wall_ms', 0) > budget_ms:
+                report['slow_cases'].append({
+                    'input': [describe(arg) for arg in args],
+                    'wall_ms': mine.get('wall_ms'),
+                    'reference_ms': theirs.get('wall_ms'),
+                    'budget_ms': round(budget_ms, 1),
+                    'status': mine.get('status')
+                })
+                continue
+            if report['divergence'] is None:
+                if mine.get('status') != 'ok':
+                    got = mine.get('error', mine.get('status'))
+                elif not values_match(mine.get('actual'), theirs.get('actual')):
+                    got = mine.get('actual')
+                else:
+                    continue
+                report['divergence'] = {'input': [describe(arg) for arg in args],
+                                        'expected': theirs.get('actual'), 'got': got}
+        if not report['cases_run'] and report['skipped']:
+            failure = next(r for r in reference_results if r.get('status') != 'ok')
+            report['error'] = f"The reference solution failed on every generated input: {failure.get('error', failure.get('status'))}"
+        report['slow_cases'] = report['slow_cases'][:3]
+        report['passed'] = report['divergence'] is None and not report['slow_cases']
+        report['seconds'] = round(time.monotonic() - started, 2)
+        return report